@@ -4,6 +4,7 @@ from import_export.admin import ImportExportModelAdmin
 from .models import (
     Game,
     GameMetadata,
+    GamePeriodLine,
     GamePlayerLine,
     GameTeamLine,
     Player,
@@ -61,6 +62,14 @@ class GameTeamLineAdmin(ImportExportModelAdmin):
     raw_id_fields = ("game", "team")
 
 
+@admin.register(GamePeriodLine)
+class GamePeriodLineAdmin(ImportExportModelAdmin):
+    list_display = ("game", "team", "date", "home_away", "q1", "q2", "q3", "q4", "ot", "final")
+    list_filter = ("home_away",)
+    search_fields = ("team__name", "game__game_id")
+    raw_id_fields = ("game", "team")
+
+
 @admin.register(WinProbabilitySnapshot)
 class WinProbabilitySnapshotAdmin(ImportExportModelAdmin):
     list_display = ("game", "period", "time_remaining", "home_score", "away_score", "win_pct")
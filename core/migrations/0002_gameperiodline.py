@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GamePeriodLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(blank=True, null=True, verbose_name='Fecha del partido')),
+                ('home_away', models.CharField(blank=True, max_length=10, verbose_name='Home/Away')),
+                ('q1', models.IntegerField(default=0, verbose_name='Q1')),
+                ('q2', models.IntegerField(default=0, verbose_name='Q2')),
+                ('q3', models.IntegerField(default=0, verbose_name='Q3')),
+                ('q4', models.IntegerField(default=0, verbose_name='Q4')),
+                ('ot1', models.IntegerField(default=0, verbose_name='OT1')),
+                ('ot2', models.IntegerField(default=0, verbose_name='OT2')),
+                ('ot3', models.IntegerField(default=0, verbose_name='OT3')),
+                ('ot4', models.IntegerField(default=0, verbose_name='OT4')),
+                ('ot', models.IntegerField(default=0, verbose_name='Prórrogas (total)')),
+                ('h1', models.IntegerField(default=0, verbose_name='1ª mitad')),
+                ('h2', models.IntegerField(default=0, verbose_name='2ª mitad')),
+                ('final', models.IntegerField(default=0, verbose_name='Final')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_lines', to='core.game')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_period_lines', to='core.team')),
+            ],
+            options={
+                'verbose_name': 'Puntos por período equipo-partido',
+                'verbose_name_plural': 'Puntos por período equipos-partidos',
+                'ordering': ['game', 'team'],
+                'indexes': [models.Index(fields=['team', 'date'], name='core_gamepe_team_id_f6ad2a_idx')],
+                'unique_together': {('game', 'team')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_gameperiodline'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='gameplayerline',
+            constraint=models.UniqueConstraint(fields=('game', 'player', 'team', 'period'), name='unique_game_player_team_period', nulls_distinct=False),
+        ),
+    ]
@@ -178,6 +178,14 @@ class GamePlayerLine(models.Model):
             models.Index(fields=["player", "game"]),
             models.Index(fields=["team", "game"]),
         ]
+        # Clave natural del bulk upsert de sync_normalized (player/team pueden ser NULL)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "player", "team", "period"],
+                name="unique_game_player_team_period",
+                nulls_distinct=False,
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -239,6 +247,51 @@ class GameTeamLine(models.Model):
         )
 
 
+class GamePeriodLine(models.Model):
+    """
+    Puntos por período de un equipo en un partido, en una sola fila ancha
+    (cuartos, prórrogas, mitades y final). Se rellena en bloque desde GameSummary
+    al sincronizar; la fecha se desnormaliza para leer la serie de un equipo con
+    el índice (team, date) sin join a Game.
+    """
+
+    game = models.ForeignKey(
+        Game,
+        on_delete=models.CASCADE,
+        related_name="period_lines",
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name="game_period_lines",
+    )
+    date = models.DateField("Fecha del partido", null=True, blank=True)
+    home_away = models.CharField("Home/Away", max_length=10, blank=True)
+
+    q1 = models.IntegerField("Q1", default=0)
+    q2 = models.IntegerField("Q2", default=0)
+    q3 = models.IntegerField("Q3", default=0)
+    q4 = models.IntegerField("Q4", default=0)
+    ot1 = models.IntegerField("OT1", default=0)
+    ot2 = models.IntegerField("OT2", default=0)
+    ot3 = models.IntegerField("OT3", default=0)
+    ot4 = models.IntegerField("OT4", default=0)
+    ot = models.IntegerField("Prórrogas (total)", default=0)
+    h1 = models.IntegerField("1ª mitad", default=0)
+    h2 = models.IntegerField("2ª mitad", default=0)
+    final = models.IntegerField("Final", default=0)
+
+    class Meta:
+        verbose_name = "Puntos por período equipo-partido"
+        verbose_name_plural = "Puntos por período equipos-partidos"
+        ordering = ["game", "team"]
+        unique_together = [["game", "team"]]
+        indexes = [models.Index(fields=["team", "date"])]
+
+    def __str__(self):
+        return f"{self.game_id} {self.team_id} ({self.final}pts)"
+
+
 class WinProbabilitySnapshot(models.Model):
     """Snapshot de probabilidad de victoria en un momento del partido."""
 
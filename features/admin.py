@@ -1,7 +1,7 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 
-from .models import GameFeatureSet, PlayerFeatureSet
+from .models import FeatureWatermark, GameFeatureSet, PlayerFeatureSet, TeamDailyState, TeamRating
 
 
 @admin.register(GameFeatureSet)
@@ -18,3 +18,29 @@ class PlayerFeatureSetAdmin(ImportExportModelAdmin):
     list_filter = ("context", "season")
     search_fields = ("player_id",)
     readonly_fields = ("computed_at",)
+
+
+@admin.register(TeamDailyState)
+class TeamDailyStateAdmin(admin.ModelAdmin):
+    list_display = ("team_id", "date", "season", "updated_at")
+    list_filter = ("season",)
+    search_fields = ("team_id",)
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(TeamRating)
+class TeamRatingAdmin(admin.ModelAdmin):
+    list_display = (
+        "system", "team_id", "date", "game_id",
+        "rating_pre", "rating_post", "deviation_post", "win_prob",
+    )
+    list_filter = ("system", "season")
+    search_fields = ("team_id", "game_id")
+
+
+@admin.register(FeatureWatermark)
+class FeatureWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("market", "season_type", "last_game_date", "line_count", "updated_at")
+    list_filter = ("market", "season_type")
+    exclude = ("game_digests",)
+    readonly_fields = ("last_game_date", "line_max_pk", "line_count", "updated_at")
@@ -1,12 +1,19 @@
 """
 Funciones base para acceso a features desde Redis o DB.
+
+En Redis cada partido es un hash `{prefix}:{game_id}` con un campo por mercado;
+los valores van codificados en binario (features.engine.codec).
 """
 
+import hashlib
 import json
 import logging
 
 from django.conf import settings
 
+from features.engine.codec import decode_features, encode_features
+from features.engine.redis_client import record
+
 logger = logging.getLogger(__name__)
 
 CACHE_PREFIX = getattr(settings, "FEATURES_CACHE_PREFIX", "nba_features")
@@ -14,17 +21,29 @@ CACHE_TTL = getattr(settings, "FEATURES_CACHE_TTL", 86400 * 7)
 
 
 def _redis_client():
-    """Devuelve un cliente Redis o None si no está disponible."""
-    try:
-        import redis
-        url = getattr(settings, "CELERY_BROKER_URL", "redis://redis:6379/0")
-        return redis.Redis.from_url(url, decode_responses=True)
-    except Exception:
-        return None
+    """
+    Devuelve el cliente Redis compartido (pool + circuit breaker) o None si no
+    está disponible o el circuito está abierto.
+    """
+    from features.engine.redis_client import get_redis
+    return get_redis()
+
+
+def _redis_key(game_id: str) -> str:
+    return f"{CACHE_PREFIX}:{game_id}"
 
 
-def _redis_key(game_id: str, market: str) -> str:
-    return f"{CACHE_PREFIX}:{game_id}:{market}"
+def _cache_set(pipe, r, game_id: str, market: str, features: dict) -> None:
+    """Encola en `pipe` la escritura del mercado en el hash del partido (y su TTL)."""
+    key = _redis_key(game_id)
+    pipe.hset(key, market, encode_features(r, market, features))
+    pipe.expire(key, CACHE_TTL)
+
+
+def features_hash(features: dict) -> str:
+    """Hash estable del contenido de un dict de features (orden de claves indiferente)."""
+    payload = json.dumps(features, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.md5(payload.encode()).hexdigest()
 
 
 def get_game_features(game_id: str, market: str = "base") -> dict:
@@ -33,10 +52,13 @@ def get_game_features(game_id: str, market: str = "base") -> dict:
     r = _redis_client()
     if r:
         try:
-            raw = r.get(_redis_key(game_id, market))
-            if raw:
-                return json.loads(raw)
+            raw = r.hget(_redis_key(game_id), market)
+            features = decode_features(r, market, raw) if raw else None
+            record("hit" if features is not None else "miss")
+            if features is not None:
+                return features
         except Exception as exc:
+            record("error")
             logger.debug("Redis get error: %s", exc)
 
     # Fallback a DB
@@ -49,6 +71,62 @@ def get_game_features(game_id: str, market: str = "base") -> dict:
         return {}
 
 
+def get_game_features_many(game_ids, market: str = "base") -> dict:
+    """
+    Carga features de varios partidos: un pipeline de HGET en Redis (un solo
+    viaje), una sola consulta IN a GameFeatureSet para los que falten y relleno
+    de Redis con esos.
+    Devuelve {game_id: features}; los partidos sin features no aparecen.
+    """
+    game_ids = list(dict.fromkeys(str(g) for g in game_ids))
+    if not game_ids:
+        return {}
+
+    result = {}
+    r = _redis_client()
+    if r:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for gid in game_ids:
+                pipe.hget(_redis_key(gid), market)
+            for gid, raw in zip(game_ids, pipe.execute()):
+                features = decode_features(r, market, raw) if raw else None
+                if features is not None:
+                    result[gid] = features
+            record("hit", len(result))
+            record("miss", len(game_ids) - len(result))
+        except Exception as exc:
+            record("error")
+            logger.debug("Redis mget error: %s", exc)
+
+    missing = [gid for gid in game_ids if gid not in result]
+    if not missing:
+        return result
+
+    found = {}
+    try:
+        from features.models import GameFeatureSet
+        found = dict(
+            GameFeatureSet.objects.filter(market=market, game_id__in=missing)
+            .values_list("game_id", "features")
+        )
+        result.update(found)
+    except Exception as exc:
+        logger.warning("DB features error: %s", exc)
+
+    if r and found:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for gid, features in found.items():
+                _cache_set(pipe, r, gid, market, features)
+            pipe.execute()
+            record("write", len(found))
+        except Exception as exc:
+            record("error")
+            logger.debug("Redis backfill error: %s", exc)
+    return result
+
+
 def save_game_features(game_id: str, market: str, features: dict,
                        season: str = "", season_type: str = "",
                        to_redis: bool = False) -> None:
@@ -60,6 +138,7 @@ def save_game_features(game_id: str, market: str, features: dict,
             market=market,
             defaults={
                 "features": features,
+                "content_hash": features_hash(features),
                 "season": season,
                 "season_type": season_type,
             },
@@ -71,6 +150,114 @@ def save_game_features(game_id: str, market: str, features: dict,
         r = _redis_client()
         if r:
             try:
-                r.setex(_redis_key(game_id, market), CACHE_TTL, json.dumps(features))
+                pipe = r.pipeline(transaction=False)
+                _cache_set(pipe, r, game_id, market, features)
+                pipe.execute()
+                record("write")
             except Exception as exc:
+                record("error")
                 logger.warning("Redis set error: %s", exc)
+
+
+class GameFeatureWriter:
+    """
+    Escritor en bloque de GameFeatureSet: acumula filas y, cada `batch_size`,
+    hace un único INSERT ... ON CONFLICT (game_id, market) DO UPDATE.
+    Las filas cuyo hash de contenido coincide con el guardado no se reescriben.
+    Con `to_redis`, las escrituras a Redis del lote van en un solo pipeline.
+
+        with GameFeatureWriter(to_redis=True) as writer:
+            writer.add(game_id, market, features, season, season_type)
+    """
+
+    def __init__(self, to_redis: bool = False, batch_size: int = 1000):
+        self.to_redis = to_redis
+        self.batch_size = batch_size
+        self.written = 0
+        self.skipped = 0
+        self._buffer: dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def add(self, game_id: str, market: str, features: dict,
+            season: str = "", season_type: str = "") -> None:
+        self._buffer[(game_id, market)] = {
+            "game_id": game_id,
+            "market": market,
+            "features": features,
+            "content_hash": features_hash(features),
+            "season": season or "",
+            "season_type": season_type or "",
+        }
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Escribe el lote pendiente. Devuelve el número de filas escritas en DB."""
+        from django.db.models import Q
+        from features.models import GameFeatureSet
+
+        rows = list(self._buffer.values())
+        self._buffer = {}
+        if not rows:
+            return 0
+
+        # Hash guardado de las filas del lote: una consulta por mercado
+        by_market = {}
+        for row in rows:
+            by_market.setdefault(row["market"], []).append(row["game_id"])
+        lookup = Q()
+        for market, game_ids in by_market.items():
+            lookup |= Q(market=market, game_id__in=game_ids)
+        stored = {
+            (gid, market): (digest, season, season_type)
+            for gid, market, digest, season, season_type in GameFeatureSet.objects.filter(
+                lookup
+            ).values_list("game_id", "market", "content_hash", "season", "season_type")
+        }
+        changed = [
+            row for row in rows
+            if stored.get((row["game_id"], row["market"]))
+            != (row["content_hash"], row["season"], row["season_type"])
+        ]
+
+        if changed:
+            GameFeatureSet.objects.bulk_create(
+                [GameFeatureSet(**row) for row in changed],
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=["game_id", "market"],
+                update_fields=["features", "content_hash", "season", "season_type", "computed_at"],
+            )
+        self.written += len(changed)
+        self.skipped += len(rows) - len(changed)
+
+        if self.to_redis:
+            r = _redis_client()
+            if r:
+                try:
+                    pipe = r.pipeline(transaction=False)
+                    for row in rows:
+                        _cache_set(pipe, r, row["game_id"], row["market"], row["features"])
+                    pipe.execute()
+                    record("write", len(rows))
+                except Exception as exc:
+                    record("error")
+                    logger.warning("Redis pipeline set error: %s", exc)
+        return len(changed)
+
+
+def save_game_features_bulk(rows, to_redis: bool = False, batch_size: int = 1000) -> int:
+    """
+    Guarda en bloque filas dict(game_id, market, features, season, season_type)
+    con GameFeatureWriter. Devuelve el número de filas escritas (no omitidas).
+    """
+    with GameFeatureWriter(to_redis=to_redis, batch_size=batch_size) as writer:
+        for row in rows:
+            writer.add(**row)
+    return writer.written
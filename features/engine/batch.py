@@ -0,0 +1,119 @@
+"""
+Cálculo de features por lotes de partidos.
+
+Lo comparten `compute_features` (en serie o con --workers) y las tareas Celery
+de features/tasks.py: un lote es una lista de game_id que se calcula para
+varios mercados y se escribe en bloque con GameFeatureWriter.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Claves que add_targets añade a los partidos con resultado (no son features)
+TARGET_KEYS = ("home_win", "total_pts", "home_pts", "away_pts")
+
+
+def add_targets(features: dict, game) -> None:
+    """Añade el target si el partido tiene resultado."""
+    if game.home_score is not None and game.away_score is not None:
+        features["home_win"] = 1 if game.home_score > game.away_score else 0
+        features["total_pts"] = game.home_score + game.away_score
+        features["home_pts"] = game.home_score
+        features["away_pts"] = game.away_score
+
+
+def compute_games(games, markets, plan, store, writer, stdout=None, stderr=None):
+    """
+    Calcula y encola en `writer` las features de `games` para `markets`.
+    Devuelve (game_id calculados, [(game_id, error)]).
+    """
+    from features.engine.market import compute_market_features
+    from features.engine.matchup import compute_features_for_matchup_markets
+
+    done = set()
+    errors = []
+    for game in games:
+        game_markets = plan.markets_for(game.game_id, markets) if plan else markets
+        try:
+            by_market = compute_features_for_matchup_markets(
+                home_team_id=game.home_team.team_id,
+                away_team_id=game.away_team.team_id,
+                as_of_date=game.date,
+                markets=game_markets,
+                season=game.season or None,
+                season_type=game.season_type or "Regular Season",
+                store=store,
+            )
+
+            for market, features in by_market.items():
+                # Añadir features específicas del mercado
+                market_extras = compute_market_features(features, market)
+                features.update(market_extras)
+
+                add_targets(features, game)
+
+                writer.add(
+                    game_id=game.game_id,
+                    market=market,
+                    features=features,
+                    season=game.season,
+                    season_type=game.season_type,
+                )
+            done.add(game.game_id)
+
+            if stdout is not None and len(done) % 100 == 0:
+                stdout.write(f"  {len(done)} partidos procesados...")
+
+        except Exception as exc:
+            errors.append((game.game_id, str(exc)))
+            if stderr is not None:
+                stderr.write(f"Error en {game.game_id}: {exc}")
+    return done, errors
+
+
+def compute_game_ids(game_ids, markets, plan=None, store=None, to_redis=False) -> dict:
+    """
+    Calcula un lote de partidos por game_id y lo escribe en bloque.
+    Devuelve un resumen serializable (done, errors, written, skipped).
+    """
+    from core.models import Game
+    from features.engine.base import GameFeatureWriter
+
+    games = Game.objects.filter(game_id__in=list(game_ids)).select_related("home_team", "away_team")
+    with GameFeatureWriter(to_redis=to_redis) as writer:
+        done, errors = compute_games(games.iterator(chunk_size=500), markets, plan, store, writer)
+    return {
+        "done": sorted(done),
+        "errors": errors,
+        "written": writer.written,
+        "skipped": writer.skipped,
+    }
+
+
+def partition_game_ids(qs, n_chunks: int) -> list:
+    """
+    Reparte los partidos de `qs` en hasta `n_chunks` tramos contiguos por fecha
+    (listas de game_id de tamaño similar).
+    """
+    rows = sorted(qs.values_list("date", "game_id"), key=lambda r: (r[0] is None, r[0] or 0, r[1]))
+    ids = [gid for _, gid in rows]
+    n_chunks = min(len(ids), n_chunks)
+    if not n_chunks:
+        return []
+    size = -(-len(ids) // n_chunks)
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+def merge_results(results) -> dict:
+    """Une los resúmenes de varios lotes en uno solo."""
+    merged = {"done": [], "errors": [], "written": 0, "skipped": 0}
+    for result in results:
+        if not result:
+            continue
+        merged["done"].extend(result["done"])
+        merged["errors"].extend(result["errors"])
+        merged["written"] += result["written"]
+        merged["skipped"] += result["skipped"]
+    return merged
@@ -0,0 +1,149 @@
+"""
+Codificación binaria compacta de vectores de features para Redis.
+
+Cada mercado tiene un registro versionado de nombres de features ordenados
+(hash Redis `{prefix}:schema:{market}`, campo = versión, valor = lista JSON).
+Un vector se guarda como cabecera (formato + versión de esquema + CRC32 de la
+lista de nombres) seguida de un array float32 (o float64, formato "D", si hace
+falta la precisión completa) en el orden del esquema, con NaN para las
+features ausentes.
+Si aparece un nombre nuevo, se publica una versión nueva del esquema que
+extiende la anterior, de modo que los valores ya guardados siguen decodificando.
+Los dicts con valores no numéricos se guardan como JSON (formato "J").
+
+El registro no se da por bueno para siempre: si se pierde (flush, evicción) y
+otro proceso publica la misma versión con otro orden, el CRC de la cabecera no
+cuadra y el valor se trata como fallo de caché en lugar de decodificarse con
+los nombres equivocados. Cada proceso vuelve a contrastar su esquema actual
+con Redis cada FEATURES_SCHEMA_CHECK_SECONDS.
+"""
+
+import json
+import logging
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = getattr(settings, "FEATURES_CACHE_PREFIX", "nba_features")
+SCHEMA_CHECK_SECONDS = getattr(settings, "FEATURES_SCHEMA_CHECK_SECONDS", 60)
+
+FORMAT_FLOAT32 = b"F"
+FORMAT_FLOAT64 = b"D"
+FORMAT_JSON = b"J"
+_DTYPES = {FORMAT_FLOAT32: "<f4", FORMAT_FLOAT64: "<f8"}
+_HEADER = struct.Struct("<cHI")  # formato, versión de esquema, CRC32 de los nombres
+
+_lock = threading.Lock()
+_schemas: dict = {}   # (market, version) → (tuple de nombres, crc)
+_current: dict = {}   # market → (version, {nombre: posición}, crc)
+_loaded_at: dict = {}  # market → time.monotonic() de la última lectura del registro
+
+
+def _schema_key(market: str) -> str:
+    return f"{CACHE_PREFIX}:schema:{market}"
+
+
+def _crc(names) -> int:
+    return zlib.crc32(json.dumps(list(names)).encode())
+
+
+def _load_schemas(r, market: str) -> None:
+    """
+    Lee todas las versiones del esquema de `market` y fija la actual (la mayor).
+    Sustituye lo que hubiera en memoria: si el registro desapareció, no queda esquema.
+    """
+    raw = r.hgetall(_schema_key(market))
+    versions = {int(k): tuple(json.loads(v)) for k, v in raw.items()}
+    with _lock:
+        for key in [k for k in _schemas if k[0] == market]:
+            del _schemas[key]
+        for version, names in versions.items():
+            _schemas[(market, version)] = (names, _crc(names))
+        _current.pop(market, None)
+        if versions:
+            latest = max(versions)
+            names = versions[latest]
+            _current[market] = (latest, {n: i for i, n in enumerate(names)}, _crc(names))
+        _loaded_at[market] = time.monotonic()
+
+
+def _schema_for(r, market: str, names) -> tuple[int, dict, int]:
+    """
+    Versión, índice y CRC de un esquema que contiene todos `names`, publicando
+    una versión nueva (HSETNX, sin pisar a otro proceso) si hace falta.
+    """
+    current = _current.get(market)
+    fresh = time.monotonic() - _loaded_at.get(market, 0.0) < SCHEMA_CHECK_SECONDS
+    if current is not None and fresh and all(n in current[1] for n in names):
+        return current
+    for _ in range(5):
+        _load_schemas(r, market)
+        version, index, _ = _current.get(market, (0, {}, 0))
+        missing = [n for n in names if n not in index]
+        if not missing:
+            return _current[market]
+        extended = [*sorted(index, key=index.get), *missing]
+        if r.hsetnx(_schema_key(market), str(version + 1), json.dumps(extended)):
+            crc = _crc(extended)
+            with _lock:
+                _schemas[(market, version + 1)] = (tuple(extended), crc)
+                _current[market] = (version + 1, {n: i for i, n in enumerate(extended)}, crc)
+            return _current[market]
+    raise RuntimeError(f"no se pudo publicar el esquema de features de {market}")
+
+
+def encode_features(r, market: str, features: dict, fmt: bytes = FORMAT_FLOAT32) -> bytes:
+    """
+    Codifica un dict de features de `market` para guardarlo en Redis; con
+    fmt=FORMAT_FLOAT64 los valores se decodifican exactamente iguales.
+    """
+    try:
+        values = {k: float(v) for k, v in features.items()}
+    except (TypeError, ValueError):
+        return FORMAT_JSON + json.dumps(features).encode()
+    version, index, crc = _schema_for(r, market, list(values))
+    arr = np.full(len(index), np.nan, dtype=_DTYPES[fmt])
+    for name, value in values.items():
+        arr[index[name]] = value
+    return _HEADER.pack(fmt, version, crc) + arr.tobytes()
+
+
+def _names_for(r, market: str, version: int, crc: int):
+    """Nombres de la versión `version` si su CRC es `crc` (releyendo el registro una vez)."""
+    schema = _schemas.get((market, version))
+    if schema is None or schema[1] != crc:
+        _load_schemas(r, market)
+        schema = _schemas.get((market, version))
+    if schema is None or schema[1] != crc:
+        return None
+    return schema[0]
+
+
+def decode_features(r, market: str, blob: bytes):
+    """
+    Decodifica un valor guardado por encode_features (o JSON heredado) a dict.
+    None si el esquema del valor no existe o no coincide con el registro (el
+    llamador lo trata como fallo de caché).
+    """
+    if isinstance(blob, str):
+        blob = blob.encode()
+    if blob[:1] == FORMAT_JSON:
+        return json.loads(blob[1:])
+    if blob[:1] not in _DTYPES:
+        return json.loads(blob)
+    if len(blob) < _HEADER.size:
+        return None
+    fmt, version, crc = _HEADER.unpack_from(blob)
+    names = _names_for(r, market, version, crc)
+    dtype = np.dtype(_DTYPES[fmt])
+    if names is None or len(blob) - _HEADER.size != len(names) * dtype.itemsize:
+        logger.debug("Esquema de features %s v%s desconocido o distinto, fallo de caché", market, version)
+        return None
+    values = np.frombuffer(blob, dtype=dtype, offset=_HEADER.size).tolist()
+    return {name: v for name, v in zip(names, values) if v == v}  # v != v ⇔ NaN
@@ -0,0 +1,174 @@
+"""
+Almacén columnar denso de features para entrenamiento y backtesting.
+
+Por cada (feature_market, tipo de temporada) se guarda una matriz float32
+`{market}__{season_type}.npy` (filas = partidos ordenados por fecha, columnas =
+features ordenadas, NaN si falta) y un esquema JSON al lado con los nombres de
+features, game_id, fechas y temporadas de cada fila. Se regenera desde
+GameFeatureSet de forma explícita (`compute_features --export-columnar`, que
+usa full_pipeline, o el callback del chord de Celery); la lectura es un único
+`np.load` con mmap, sin trabajo por fila en Python. Si hay filas de
+GameFeatureSet calculadas después de la exportación, el dataset se ignora.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+COLUMNAR_PATH = Path(getattr(
+    settings, "FEATURES_COLUMNAR_PATH",
+    Path(getattr(settings, "MODEL_STORAGE_PATH", "models")) / "features",
+))
+
+
+@dataclass
+class FeatureMatrix:
+    """Dataset de un mercado: X (memmap de solo lectura) y metadatos por fila/columna."""
+
+    X: np.ndarray
+    columns: list
+    game_ids: np.ndarray
+    dates: np.ndarray
+    seasons: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def column(self, name: str) -> np.ndarray:
+        """Columna `name` como vector (todo NaN si el dataset no la tiene)."""
+        try:
+            return self.X[:, self.columns.index(name)]
+        except ValueError:
+            return np.full(len(self), np.nan, dtype=self.X.dtype)
+
+    def select(self, names, fillna=None) -> np.ndarray:
+        """Submatriz con las columnas `names` en ese orden (las ausentes a NaN o `fillna`)."""
+        index = {c: i for i, c in enumerate(self.columns)}
+        out = np.full((len(self), len(names)), np.nan, dtype=np.float64)
+        present = [(j, index[n]) for j, n in enumerate(names) if n in index]
+        if present:
+            dst, src = zip(*present)
+            out[:, list(dst)] = self.X[:, list(src)]
+        if fillna is not None:
+            out[np.isnan(out)] = fillna
+        return out
+
+
+def _slug(season_type: str) -> str:
+    return (season_type or "all").replace(" ", "_")
+
+
+def dataset_paths(market: str, season_type: str) -> tuple[Path, Path]:
+    """Rutas (matriz .npy, esquema .json) del dataset de (market, season_type)."""
+    stem = f"{market}__{_slug(season_type)}"
+    return COLUMNAR_PATH / f"{stem}.npy", COLUMNAR_PATH / f"{stem}.json"
+
+
+def _feature_sets(market: str, season_type: str):
+    from features.models import GameFeatureSet
+
+    qs = GameFeatureSet.objects.filter(market=market).exclude(features={})
+    if season_type:
+        # Sin tipo de temporada (compute_features --season-type ""): todos
+        qs = qs.filter(season_type__icontains=_slug(season_type).split("_")[0])
+    return qs
+
+
+def _last_computed(market: str, season_type: str):
+    """Último computed_at de las filas del dataset (None si no hay)."""
+    from django.db.models import Max
+
+    return _feature_sets(market, season_type).aggregate(last=Max("computed_at"))["last"]
+
+
+def export_market(market: str, season_type: str) -> int:
+    """
+    Reescribe el dataset columnar de (market, season_type) desde GameFeatureSet.
+    Escritura atómica (fichero temporal + rename). Devuelve el número de filas.
+    """
+    import pandas as pd
+    from core.models import Game
+
+    last_computed = _last_computed(market, season_type)
+    rows = list(_feature_sets(market, season_type).values_list("game_id", "features", "season"))
+    dates = dict(
+        Game.objects.filter(game_id__in=[r[0] for r in rows]).values_list("game_id", "date")
+    )
+    rows.sort(key=lambda r: (dates.get(r[0]) is None, dates.get(r[0]) or "", r[0]))
+
+    frame = pd.DataFrame.from_records([r[1] for r in rows])
+    frame = frame.reindex(columns=sorted(frame.columns))
+    try:
+        X = frame.to_numpy(dtype=np.float32, na_value=np.nan)
+    except (TypeError, ValueError):
+        # Valores no numéricos: a NaN en lugar de tumbar la exportación
+        X = frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    X = X.reshape(len(rows), len(frame.columns))
+
+    schema = {
+        "version": SCHEMA_VERSION,
+        "market": market,
+        "season_type": season_type,
+        "shape": list(X.shape),
+        "dtype": X.dtype.str,
+        "columns": list(frame.columns),
+        "game_ids": [r[0] for r in rows],
+        "dates": [d.isoformat() if (d := dates.get(r[0])) else "" for r in rows],
+        "seasons": [r[2] or "" for r in rows],
+        "last_computed": last_computed.isoformat() if last_computed else "",
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    npy_path, schema_path = dataset_paths(market, season_type)
+    COLUMNAR_PATH.mkdir(parents=True, exist_ok=True)
+    tmp_npy = npy_path.with_name(npy_path.name + ".tmp")
+    tmp_schema = schema_path.with_name(schema_path.name + ".tmp")
+    with open(tmp_npy, "wb") as fh:
+        np.save(fh, X)
+    tmp_schema.write_text(json.dumps(schema))
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_schema, schema_path)
+    return len(rows)
+
+
+def load_market(market: str, season_type: str, mmap: bool = True) -> FeatureMatrix | None:
+    """
+    Dataset columnar de (market, season_type), o None si no existe, no cuadra
+    con su esquema o hay filas de GameFeatureSet más nuevas que la exportación
+    (el llamador debe ir a GameFeatureSet).
+    """
+    npy_path, schema_path = dataset_paths(market, season_type)
+    if not npy_path.exists() or not schema_path.exists():
+        return None
+    try:
+        schema = json.loads(schema_path.read_text())
+        X = np.load(npy_path, mmap_mode="r" if mmap else None)
+        if schema.get("version") != SCHEMA_VERSION or list(X.shape) != schema["shape"]:
+            logger.warning("Dataset columnar %s desactualizado, se ignora", npy_path.name)
+            return None
+        last_computed = _last_computed(market, season_type)
+        exported = schema["last_computed"]
+        if last_computed and (not exported or last_computed > datetime.fromisoformat(exported)):
+            logger.warning(
+                "Dataset columnar %s anterior a las últimas features, se ignora", npy_path.name
+            )
+            return None
+        return FeatureMatrix(
+            X=X,
+            columns=schema["columns"],
+            game_ids=np.asarray(schema["game_ids"], dtype=object),
+            dates=np.asarray(schema["dates"], dtype="datetime64[D]"),
+            seasons=np.asarray(schema["seasons"], dtype=object),
+        )
+    except Exception as exc:
+        logger.warning("Error leyendo dataset columnar %s: %s", npy_path.name, exc)
+        return None
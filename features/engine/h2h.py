@@ -1,41 +1,212 @@
 """
 Features de historial head-to-head (H2H) entre dos equipos NBA.
+
+H2HIndex: índice en memoria por pareja no ordenada de equipos con sus
+enfrentamientos con resultado ordenados por fecha y sumas acumuladas, de modo que
+los últimos N antes de una fecha son una búsqueda binaria. También indexa por
+(local, visitante) para la variante "en esta pista" y admite "solo esta temporada".
+Se carga con una consulta a Game y se refresca tras sync_normalized.
 """
 
 import logging
+import threading
+import time
+from collections import defaultdict
 from datetime import date
 from typing import Optional
 
+import numpy as np
+from django.conf import settings
+
 logger = logging.getLogger(__name__)
 
+REFRESH_SECONDS = getattr(settings, "FEATURES_STORE_REFRESH_SECONDS", 300)
+
+
+def _h2h_features(n: int, home_wins: int, home_pts: int, away_pts: int,
+                  prefix: str = "h2h") -> dict:
+    """Features H2H a partir de los totales de los `n` enfrentamientos (vista del local)."""
+    return {
+        f"{prefix}_games": n,
+        f"{prefix}_home_win_pct": round(home_wins / n, 4),
+        f"{prefix}_home_pts_avg": round(home_pts / n, 2),
+        f"{prefix}_away_pts_avg": round(away_pts / n, 2),
+        f"{prefix}_margin_avg": round((home_pts - away_pts) / n, 2),
+        f"{prefix}_total_pts_avg": round((home_pts + away_pts) / n, 2),
+    }
+
+
+class _MeetingBlock:
+    """
+    Enfrentamientos de una pareja (o de un local/visitante concreto): fechas
+    ordinales ascendentes y sumas acumuladas de puntos y victorias de cada lado.
+    """
+
+    __slots__ = ("dates", "csum")
+
+    def __init__(self, dates, cols: dict):
+        order = np.argsort(dates, kind="stable")
+        self.dates = np.asarray(dates, dtype=np.int64)[order]
+        self.csum = {
+            k: np.concatenate(([0], np.cumsum(np.asarray(v, dtype=np.int64)[order])))
+            for k, v in cols.items()
+        }
+
+    def sums(self, as_of_date: date, last_n: int, season_only: bool = False) -> tuple[dict, int]:
+        from features.engine.season import _season_start
+
+        end = int(np.searchsorted(self.dates, as_of_date.toordinal(), side="left"))
+        start = max(0, end - last_n)
+        if season_only:
+            start = max(start, int(np.searchsorted(
+                self.dates, _season_start(as_of_date).toordinal(), side="left"
+            )))
+        return {k: int(c[end] - c[start]) for k, c in self.csum.items()}, end - start
+
+
+class H2HIndex:
+    """
+    Índice H2H del proceso: `pairs[(a, b)]` (a < b) con columnas a_pts, b_pts,
+    a_win, b_win y `venues[(home, away)]` con home_pts, away_pts, home_win.
+    Solo partidos con fecha y resultado.
+    """
+
+    def __init__(self):
+        self.pairs: dict = {}
+        self.venues: dict = {}
+        self.loaded_at = 0.0
+
+    def load(self):
+        from core.models import Game
+
+        pairs, venues = defaultdict(list), defaultdict(list)
+        rows = (
+            Game.objects.filter(
+                date__isnull=False, home_score__isnull=False, away_score__isnull=False,
+                home_team__isnull=False, away_team__isnull=False,
+            )
+            .values_list("date", "home_team_id", "away_team_id", "home_score", "away_score")
+            .iterator(chunk_size=5000)
+        )
+        for gdate, home, away, hs, as_ in rows:
+            if home == away:
+                continue
+            ordinal = gdate.toordinal()
+            hs, as_ = hs or 0, as_ or 0
+            if home < away:
+                pairs[(home, away)].append((ordinal, hs, as_))
+            else:
+                pairs[(away, home)].append((ordinal, as_, hs))
+            venues[(home, away)].append((ordinal, hs, as_))
+
+        def block(meetings, names):
+            arr = np.asarray(meetings, dtype=np.int64).reshape(-1, 3)
+            a_pts, b_pts = arr[:, 1], arr[:, 2]
+            cols = {names[0]: a_pts, names[1]: b_pts, names[2]: a_pts > b_pts}
+            if len(names) > 3:
+                cols[names[3]] = b_pts > a_pts
+            return _MeetingBlock(arr[:, 0], cols)
+
+        self.pairs = {k: block(v, ("a_pts", "b_pts", "a_win", "b_win")) for k, v in pairs.items()}
+        self.venues = {k: block(v, ("home_pts", "away_pts", "home_win")) for k, v in venues.items()}
+        self.loaded_at = time.time()
+        return self
+
+    def sums(self, home_team_id, away_team_id, as_of_date: date, last_n: int = 10,
+             venue_only: bool = False, season_only: bool = False) -> tuple[int, int, int, int]:
+        """
+        (n, victorias del local, puntos del local, puntos del visitante) de los
+        últimos `last_n` enfrentamientos antes de as_of_date, vistos desde el local.
+        """
+        home, away = str(home_team_id), str(away_team_id)
+        if venue_only:
+            block = self.venues.get((home, away))
+            if block is None:
+                return 0, 0, 0, 0
+            s, n = block.sums(as_of_date, last_n, season_only)
+            return n, s["home_win"], s["home_pts"], s["away_pts"]
+
+        flipped = home > away
+        block = self.pairs.get((away, home) if flipped else (home, away))
+        if block is None:
+            return 0, 0, 0, 0
+        s, n = block.sums(as_of_date, last_n, season_only)
+        if flipped:
+            return n, s["b_win"], s["b_pts"], s["a_pts"]
+        return n, s["a_win"], s["a_pts"], s["b_pts"]
+
+
+_index: Optional[H2HIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_h2h_index(max_age: float = None) -> H2HIndex:
+    """
+    Índice H2H del proceso, cargado la primera vez y recargado si tiene más de
+    `max_age` segundos (FEATURES_STORE_REFRESH_SECONDS).
+    """
+    global _index
+    if max_age is None:
+        max_age = REFRESH_SECONDS
+    with _index_lock:
+        if _index is None or time.time() - _index.loaded_at > max_age:
+            _index = H2HIndex().load()
+        return _index
+
+
+def refresh_h2h_index() -> None:
+    """Recarga el índice si ya está cargado en este proceso (p.ej. tras sync_normalized)."""
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index = H2HIndex().load()
+
 
 def compute_h2h_features(
     home_team_id: str,
     away_team_id: str,
     as_of_date: Optional[date] = None,
     last_n: int = 10,
+    index: Optional[H2HIndex] = None,
+    venue_only: bool = False,
+    season_only: bool = False,
+    prefix: str = "h2h",
 ) -> dict:
     """
     Devuelve estadísticas H2H entre local y visitante en los últimos `last_n` enfrentamientos.
+    Con `index` (H2HIndex) se sirven desde memoria. `venue_only`: solo con el local
+    actual en casa; `season_only`: solo de la temporada de as_of_date.
     """
     features = {}
     if as_of_date is None:
         as_of_date = date.today()
 
     try:
-        from django.db.models import Q, Avg
+        if index is not None:
+            n, home_wins, home_pts, away_pts = index.sums(
+                home_team_id, away_team_id, as_of_date, last_n,
+                venue_only=venue_only, season_only=season_only,
+            )
+            if n:
+                features.update(_h2h_features(n, home_wins, home_pts, away_pts, prefix))
+            return features
+
+        from django.db.models import Q
         from core.models import Game
+        from features.engine.season import _season_start
 
-        h2h_games = (
-            Game.objects.filter(
-                Q(home_team__team_id=home_team_id, away_team__team_id=away_team_id)
-                | Q(home_team__team_id=away_team_id, away_team__team_id=home_team_id),
-                date__lt=as_of_date,
-                home_score__isnull=False,
-                away_score__isnull=False,
-            )
-            .order_by("-date")[:last_n]
+        pair = Q(home_team__team_id=home_team_id, away_team__team_id=away_team_id)
+        if not venue_only:
+            pair |= Q(home_team__team_id=away_team_id, away_team__team_id=home_team_id)
+        h2h_games = Game.objects.filter(
+            pair,
+            date__lt=as_of_date,
+            home_score__isnull=False,
+            away_score__isnull=False,
         )
+        if season_only:
+            h2h_games = h2h_games.filter(date__gte=_season_start(as_of_date))
+        h2h_games = h2h_games.order_by("-date")[:last_n]
 
         games = list(h2h_games)
         n = len(games)
@@ -43,9 +214,8 @@ def compute_h2h_features(
             return features
 
         home_wins = 0
-        home_pts_list = []
-        away_pts_list = []
-        margins = []
+        home_pts = 0
+        away_pts = 0
 
         for g in games:
             if g.home_team_id == home_team_id:
@@ -54,20 +224,12 @@ def compute_h2h_features(
             else:
                 h = g.away_score or 0
                 a = g.home_score or 0
-            home_pts_list.append(h)
-            away_pts_list.append(a)
-            margins.append(h - a)
+            home_pts += h
+            away_pts += a
             if h > a:
                 home_wins += 1
 
-        features["h2h_games"] = n
-        features["h2h_home_win_pct"] = round(home_wins / n, 4)
-        features["h2h_home_pts_avg"] = round(sum(home_pts_list) / n, 2)
-        features["h2h_away_pts_avg"] = round(sum(away_pts_list) / n, 2)
-        features["h2h_margin_avg"] = round(sum(margins) / n, 2)
-        features["h2h_total_pts_avg"] = round(
-            (sum(home_pts_list) + sum(away_pts_list)) / n, 2
-        )
+        features.update(_h2h_features(n, home_wins, home_pts, away_pts, prefix))
 
     except Exception as exc:
         logger.warning("h2h features error: %s", exc)
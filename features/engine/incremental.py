@@ -0,0 +1,223 @@
+"""
+Recálculo incremental de features guiado por watermark.
+
+Por tipo de temporada se guarda en FeatureWatermark (fila de mercado "*") una
+huella por partido (fecha, equipos, marcador, sus GameTeamLine y el rating
+pre-partido de cada equipo en cada sistema de TeamRating); la fila de cada
+mercado guarda solo los partidos que le quedaron pendientes (huella ""). En la
+siguiente ejecución se comparan las huellas actuales con las guardadas y solo se
+recalculan:
+- los partidos nuevos o cambiados, y
+- los partidos cuyas ventanas rolling (últimos N de cada equipo) o cuyo H2H
+  (últimos N enfrentamientos de la pareja) incluyen un partido cambiado.
+Los ratings dependen de toda la historia del equipo: un resultado corregido
+re-rata todo lo posterior (build_ratings), y al entrar en la huella cambian
+todos los partidos cuyo rating pre-partido se movió, sin límite de ventana.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import date
+
+from features.engine.rolling import TEAM_STATS
+
+logger = logging.getLogger(__name__)
+
+# Ventana más larga que usan los rolling por defecto y el H2H (last_n)
+LOOKBACK_GAMES = 10
+
+# Mercado de la fila de FeatureWatermark con las huellas comunes del tipo de temporada
+SHARED_MARKET = "*"
+
+
+def _pre_game_ratings(indexes, home, away, gdate) -> tuple:
+    """Rating y desviación pre-partido de local y visitante en cada sistema."""
+    from features.engine.season import _season_from_date
+
+    if gdate is None:
+        return ()
+    season = _season_from_date(gdate)
+    return tuple(
+        (index.rating(home, gdate, season), index.rating(away, gdate, season))
+        for index in indexes
+    )
+
+
+def current_game_state() -> tuple[dict, dict]:
+    """
+    Huella de los datos de entrada de cada partido y su índice para la expansión.
+    Devuelve (digests {game_id: hash}, games {game_id: (ordinal, home, away, scored)}).
+    """
+    from core.models import Game, GameTeamLine
+    from features.engine.ratings import RATING_SYSTEMS, RatingIndex
+
+    lines = defaultdict(list)
+    for row in GameTeamLine.objects.values_list(
+        "game_id", "team_id", "period", *TEAM_STATS
+    ).iterator(chunk_size=5000):
+        lines[row[0]].append(row[1:])
+    # Índices recién cargados: los del proceso pueden ser anteriores a build_ratings
+    indexes = [RatingIndex(system).load() for system in RATING_SYSTEMS]
+
+    digests, games = {}, {}
+    for gid, gdate, home, away, hs, as_ in Game.objects.values_list(
+        "game_id", "date", "home_team_id", "away_team_id", "home_score", "away_score",
+    ).iterator(chunk_size=5000):
+        payload = repr((
+            gdate, home, away, hs, as_, sorted(lines.get(gid, ())),
+            _pre_game_ratings(indexes, home, away, gdate),
+        ))
+        digests[gid] = hashlib.md5(payload.encode()).hexdigest()[:16]
+        games[gid] = (
+            gdate.toordinal() if gdate else None, home, away,
+            hs is not None and as_ is not None,
+        )
+    return digests, games
+
+
+def affected_game_ids(changed: set, games: dict, lookback: int = LOOKBACK_GAMES) -> set:
+    """
+    Partidos cuyo vector de features depende de alguno de `changed`: el propio
+    partido y los siguientes de cada equipo (y de la pareja, para H2H) hasta que
+    `lookback` partidos con resultado lo dejan fuera de la ventana.
+    """
+    by_team, by_pair = defaultdict(list), defaultdict(list)
+    for gid, (ordinal, home, away, scored) in games.items():
+        if ordinal is None:
+            continue
+        for team in {home, away} - {None}:
+            by_team[team].append((ordinal, gid, scored))
+        if home and away:
+            by_pair[frozenset((home, away))].append((ordinal, gid, scored))
+    for seq in (*by_team.values(), *by_pair.values()):
+        seq.sort()
+
+    def following(seq, ordinal):
+        out, seen_scored = [], 0
+        for other_ordinal, gid, scored in seq:
+            if other_ordinal <= ordinal:
+                continue
+            if seen_scored >= lookback:
+                break
+            out.append(gid)
+            if scored:
+                seen_scored += 1
+        return out
+
+    affected = set(changed)
+    for gid in changed:
+        ordinal, home, away, _ = games.get(gid, (None, None, None, False))
+        if ordinal is None:
+            continue
+        for team in {home, away} - {None}:
+            affected.update(following(by_team[team], ordinal))
+        if home and away:
+            affected.update(following(by_pair[frozenset((home, away))], ordinal))
+    return affected
+
+
+class IncrementalPlan:
+    """
+    Partidos a recalcular por mercado para un tipo de temporada.
+    `targets[market]` es un set de game_id, o None si no hay watermark (todo);
+    `changed` son los partidos cuyos datos cambiaron desde el watermark.
+    """
+
+    def __init__(self, markets, season_type: str):
+        from core.models import GameTeamLine
+        from django.db.models import Count, Max
+        from features.models import FeatureWatermark
+
+        self.season_type = season_type
+        self.digests, self.games = current_game_state()
+        line_state = GameTeamLine.objects.aggregate(n=Count("pk"), max_pk=Max("pk"))
+        self.line_count = line_state["n"] or 0
+        self.line_max_pk = line_state["max_pk"] or 0
+
+        rows = {
+            w.market: w.game_digests
+            for w in FeatureWatermark.objects.filter(
+                market__in=[SHARED_MARKET, *markets], season_type=season_type
+            )
+        }
+        self.previous = rows.get(SHARED_MARKET)
+        self.targets = {}
+        self.changed = set()
+        for market in markets:
+            if self.previous is None or market not in rows:
+                self.targets[market] = None
+                continue
+            previous = {**self.previous, **rows[market]}
+            if set(previous) - set(self.digests):
+                logger.info(
+                    "watermark %s/%s: partidos borrados, recálculo completo", market, season_type
+                )
+                self.targets[market] = None
+                continue
+            changed = {
+                gid for gid, digest in self.digests.items() if previous.get(gid) != digest
+            }
+            self.changed |= changed
+            self.targets[market] = affected_game_ids(changed, self.games) if changed else set()
+
+    @property
+    def is_full(self) -> bool:
+        return any(t is None for t in self.targets.values())
+
+    def game_ids(self) -> set:
+        """Unión de partidos a recalcular (solo válida si no is_full)."""
+        return set().union(*(t for t in self.targets.values() if t is not None))
+
+    def markets_for(self, game_id: str, markets) -> list:
+        return [
+            m for m in markets
+            if self.targets.get(m) is None or game_id in self.targets[m]
+        ]
+
+    def save(self, pending=()) -> None:
+        """
+        Guarda las huellas actuales una vez (fila SHARED_MARKET) y, por mercado,
+        los partidos de `pending` (a recalcular pero fallidos o fuera del filtro de
+        esta ejecución) como cambiados para que la siguiente ejecución los incluya.
+        Los mercados con watermark que no entraron en esta ejecución acumulan como
+        pendientes los partidos cuya huella cambia ahora.
+        """
+        from features.models import FeatureWatermark
+
+        dates = [g[0] for g in self.games.values() if g[0] is not None and g[3]]
+        state = {
+            "last_game_date": date.fromordinal(max(dates)) if dates else None,
+            "line_max_pk": self.line_max_pk,
+            "line_count": self.line_count,
+        }
+        others = FeatureWatermark.objects.filter(season_type=self.season_type).exclude(
+            market__in=[SHARED_MARKET, *self.targets]
+        )
+        if self.previous is None:
+            # Sin huellas comunes previas no se sabe qué cambió para el resto
+            others.delete()
+        else:
+            moved = {
+                gid for gid in set(self.previous) | set(self.digests)
+                if self.previous.get(gid) != self.digests.get(gid)
+            }
+            if moved:
+                for watermark in others:
+                    watermark.game_digests = {
+                        **watermark.game_digests, **dict.fromkeys(moved, "")
+                    }
+                    watermark.save(update_fields=["game_digests", "updated_at"])
+
+        FeatureWatermark.objects.update_or_create(
+            market=SHARED_MARKET,
+            season_type=self.season_type,
+            defaults={**state, "game_digests": self.digests},
+        )
+        overrides = dict.fromkeys(pending, "")
+        for market in self.targets:
+            FeatureWatermark.objects.update_or_create(
+                market=market,
+                season_type=self.season_type,
+                defaults={**state, "game_digests": overrides},
+            )
@@ -9,6 +9,8 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+QUARTER_MARKETS = ("q1", "q2", "q3", "q4")
+
 
 def compute_features_for_matchup(
     home_team_id: str,
@@ -17,23 +19,48 @@ def compute_features_for_matchup(
     market: str = "base",
     season: Optional[str] = None,
     season_type: str = "Regular Season",
+    store=None,
+    team_states: bool = False,
 ) -> dict:
     """
     Genera el vector de features para un enfrentamiento NBA dado.
 
-    Incluye rolling stats, win%, H2H, season-level (off/def rating, pace)
-    y features específicas por mercado (cuartos, mitades, totales, spread).
+    Incluye rolling stats, win%, H2H, ratings (Elo, Glicko-2, TrueSkill),
+    season-level (off/def rating, pace) y features específicas por mercado
+    (cuartos, mitades, totales, spread).
+    Con `store` (TeamGameLogStore) los rolling se sirven desde memoria; con
+    `team_states` se leen de TeamDailyState (una fila por equipo).
+    """
+    return compute_features_for_matchup_markets(
+        home_team_id, away_team_id, as_of_date, [market],
+        season=season, season_type=season_type, store=store, team_states=team_states,
+    )[market]
+
+
+def compute_features_for_matchup_markets(
+    home_team_id: str,
+    away_team_id: str,
+    as_of_date: Optional[date] = None,
+    markets=("base",),
+    season: Optional[str] = None,
+    season_type: str = "Regular Season",
+    store=None,
+    team_states: bool = False,
+) -> dict:
+    """
+    Como compute_features_for_matchup para varios mercados a la vez: el bloque
+    común (rolling, win%, season-level, H2H, ratings) se calcula una sola vez y solo la
+    cola de cada mercado se añade por separado. Devuelve {market: features}.
     """
     if as_of_date is None:
         as_of_date = date.today()
 
-    features = {}
-
     from features.engine.rolling import (
         compute_rolling_team_features,
         compute_win_pct_features,
     )
-    from features.engine.h2h import compute_h2h_features
+    from features.engine.h2h import compute_h2h_features, get_h2h_index
+    from features.engine.ratings import compute_all_rating_features
     from features.engine.season import (
         compute_season_team_features,
         _season_from_date,
@@ -43,22 +70,86 @@ def compute_features_for_matchup(
     if season is None:
         season = _season_from_date(as_of_date)
 
+    # Estados materializados (TeamDailyState); si falta la fila, cálculo normal
+    states = {}
+    if team_states:
+        from features.engine.team_state import get_team_state
+        for prefix, team_id in (("home", home_team_id), ("away", away_team_id)):
+            state = get_team_state(team_id, as_of_date)
+            if state is not None:
+                states[prefix] = state
+
     # Rolling stats base (ALL periods)
+    team_parts = {}
     for prefix, team_id in (("home", home_team_id), ("away", away_team_id)):
-        for k, v in compute_rolling_team_features(team_id, as_of_date).items():
-            features[f"{prefix}_{k}"] = v
-        for k, v in compute_win_pct_features(team_id, as_of_date).items():
-            features[f"{prefix}_{k}"] = v
+        if prefix in states:
+            team_parts[prefix] = dict(states[prefix]["team"])
+            continue
+        part = compute_rolling_team_features(team_id, as_of_date, store=store)
+        part.update(compute_win_pct_features(team_id, as_of_date, store=store))
+        team_parts[prefix] = part
 
     # Season-level features (off_rating, def_rating, pace, efg%, ts%, etc.)
+    season_parts = {}
     for prefix, team_id in (("home", home_team_id), ("away", away_team_id)):
         team = Team.objects.filter(team_id=team_id).only("abbreviation").first()
         if team and team.abbreviation:
-            season_feats = compute_season_team_features(
+            season_parts[prefix] = compute_season_team_features(
                 team.abbreviation, season, season_type
             )
-            for k, v in season_feats.items():
-                features[f"{prefix}_{k}"] = v
+
+    # H2H
+    h2h = compute_h2h_features(home_team_id, away_team_id, as_of_date, index=get_h2h_index())
+
+    # Ratings (Elo, Glicko-2, TrueSkill) pre-partido
+    ratings = compute_all_rating_features(home_team_id, away_team_id, as_of_date)
+
+    result = {}
+    for market in markets:
+        # Features de periodo (mitades/cuartos) para mercados que las usan
+        period_features = {}
+        if market == "first_half":
+            period_features = _half_features(
+                home_team_id, away_team_id, as_of_date, half=1, store=store, states=states
+            )
+        elif market == "second_half":
+            period_features = _half_features(
+                home_team_id, away_team_id, as_of_date, half=2, store=store, states=states
+            )
+        elif market in QUARTER_MARKETS:
+            period_features = _quarter_features(
+                home_team_id, away_team_id, as_of_date, quarter=market.upper(),
+                store=store, states=states,
+            )
+
+        result[market] = assemble_matchup_features(
+            market, team_parts, season_parts, h2h, period_features, ratings
+        )
+    return result
+
+
+def assemble_matchup_features(
+    market: str,
+    team_parts: dict,
+    season_parts: dict,
+    h2h: dict,
+    period_features: Optional[dict] = None,
+    ratings: Optional[dict] = None,
+) -> dict:
+    """
+    Ensambla el vector final a partir de sus bloques ya calculados:
+    `team_parts`/`season_parts` por lado ("home"/"away", sin prefijo),
+    `h2h`, `ratings` (Elo, Glicko-2, TrueSkill) y, para mitades/cuartos,
+    `period_features` (ya con prefijo).
+    Compartido por el cálculo por partido y el motor vectorizado.
+    """
+    features = {}
+    for prefix in ("home", "away"):
+        for k, v in team_parts.get(prefix, {}).items():
+            features[f"{prefix}_{k}"] = v
+    for prefix in ("home", "away"):
+        for k, v in season_parts.get(prefix, {}).items():
+            features[f"{prefix}_{k}"] = v
 
     # Diferenciales derivados
     for w in (5, 10):
@@ -69,30 +160,17 @@ def compute_features_for_matchup(
         features[f"pts_diff_{w}"] = round(h_pts - a_pts, 2)
         features[f"def_diff_{w}"] = round(h_def - a_def, 2)
 
-    # H2H
-    features.update(
-        compute_h2h_features(home_team_id, away_team_id, as_of_date)
-    )
+    features.update(h2h)
+    if ratings:
+        features.update(ratings)
 
     # Features específicas de mercado
     if market == "totals":
-        features.update(_totals_features(home_team_id, away_team_id, features))
+        features.update(_totals_features(None, None, features))
     elif market == "spread":
         features.update(_spread_features(features))
-    elif market == "first_half":
-        features.update(
-            _half_features(home_team_id, away_team_id, as_of_date, half=1)
-        )
-    elif market == "second_half":
-        features.update(
-            _half_features(home_team_id, away_team_id, as_of_date, half=2)
-        )
-    elif market in ("q1", "q2", "q3", "q4"):
-        features.update(
-            _quarter_features(
-                home_team_id, away_team_id, as_of_date, quarter=market.upper()
-            )
-        )
+    elif period_features:
+        features.update(period_features)
 
     return features
 
@@ -122,25 +200,31 @@ def _spread_features(base_features) -> dict:
     return f
 
 
-def _half_features(home_team_id, away_team_id, as_of_date, half=1) -> dict:
+def _half_features(
+    home_team_id, away_team_id, as_of_date, half=1, store=None, states=None
+) -> dict:
     from features.engine.rolling import compute_rolling_half_features
     f = {}
     for prefix, team_id in (("home", home_team_id), ("away", away_team_id)):
-        for k, v in compute_rolling_half_features(
-            team_id, as_of_date, half=half
-        ).items():
+        state = (states or {}).get(prefix, {})
+        part = state[f"H{half}"] if f"H{half}" in state else compute_rolling_half_features(
+            team_id, as_of_date, half=half, store=store
+        )
+        for k, v in part.items():
             f[f"{prefix}_{k}"] = v
     return f
 
 
 def _quarter_features(
-    home_team_id, away_team_id, as_of_date, quarter="Q1"
+    home_team_id, away_team_id, as_of_date, quarter="Q1", store=None, states=None
 ) -> dict:
     from features.engine.rolling import compute_rolling_quarter_features
     f = {}
     for prefix, team_id in (("home", home_team_id), ("away", away_team_id)):
-        for k, v in compute_rolling_quarter_features(
-            team_id, as_of_date, quarter=quarter
-        ).items():
+        state = (states or {}).get(prefix, {})
+        part = state[quarter] if quarter in state else compute_rolling_quarter_features(
+            team_id, as_of_date, quarter=quarter, store=store
+        )
+        for k, v in part.items():
             f[f"{prefix}_{k}"] = v
     return f
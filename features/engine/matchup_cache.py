@@ -0,0 +1,154 @@
+"""
+Caché de features por matchup para predicciones ad-hoc (sin partido en BD).
+
+Clave lógica: (local, visitante, as_of_date, mercado, versión de esquema).
+Dos niveles:
+- LRU en memoria del proceso (FEATURES_MATCHUP_LRU_SIZE entradas), válida
+  FEATURES_MATCHUP_LOCAL_TTL segundos antes de revalidar contra Redis.
+- Redis (`{prefix}:matchup:...`, TTL FEATURES_MATCHUP_CACHE_TTL), con el vector
+  codificado por features.engine.codec en float64, para que un acierto en Redis
+  devuelva los mismos valores que el cálculo y la LRU.
+
+Invalidación: cada equipo tiene un contador de generación en Redis
+(`{prefix}:team_gen:{team_id}`) que forma parte de la clave Redis. Al
+sincronizar partidos de un equipo se incrementa (invalidate_teams) y sus
+matchups dejan de encontrarse; las claves viejas caducan por TTL.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+
+from features.engine import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Subir al cambiar el cálculo de features de matchup (invalida toda la caché)
+SCHEMA_VERSION = 4
+
+CACHE_PREFIX = getattr(settings, "FEATURES_CACHE_PREFIX", "nba_features")
+REDIS_TTL = getattr(settings, "FEATURES_MATCHUP_CACHE_TTL", 6 * 3600)
+LOCAL_TTL = getattr(settings, "FEATURES_MATCHUP_LOCAL_TTL", 30)
+LRU_SIZE = getattr(settings, "FEATURES_MATCHUP_LRU_SIZE", 2048)
+
+_lock = threading.Lock()
+_local: OrderedDict = OrderedDict()  # clave → (caduca_en, features)
+
+
+def _gen_key(team_id) -> str:
+    return f"{CACHE_PREFIX}:team_gen:{team_id}"
+
+
+def _redis_key(key: tuple, gens) -> str:
+    home, away, as_of, market, version = key
+    return f"{CACHE_PREFIX}:matchup:v{version}:{home}:{away}:{as_of}:{market}:{gens[0]}:{gens[1]}"
+
+
+def _local_get(key: tuple):
+    with _lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return entry[1]
+
+
+def _local_set(key: tuple, features: dict) -> None:
+    with _lock:
+        _local[key] = (time.monotonic() + LOCAL_TTL, features)
+        _local.move_to_end(key)
+        while len(_local) > LRU_SIZE:
+            _local.popitem(last=False)
+
+
+def get_matchup_features(home_team_id, away_team_id, as_of_date=None, market="base") -> dict:
+    """
+    Features del matchup desde la LRU, Redis o, si no están, calculadas con
+    compute_features_for_matchup (estados TeamDailyState) y guardadas en ambas.
+    Devuelve una copia: el llamador puede modificarla.
+    """
+    from features.engine.codec import FORMAT_FLOAT64, decode_features, encode_features
+    from features.engine.matchup import compute_features_for_matchup
+
+    if as_of_date is None:
+        as_of_date = date.today()
+    key = (str(home_team_id), str(away_team_id), as_of_date.isoformat(), market, SCHEMA_VERSION)
+
+    features = _local_get(key)
+    if features is not None:
+        return dict(features)
+
+    r = redis_client.get_redis()
+    redis_key = None
+    if r is not None:
+        try:
+            gens = [int(g or 0) for g in r.mget(_gen_key(key[0]), _gen_key(key[1]))]
+            redis_key = _redis_key(key, gens)
+            raw = r.get(redis_key)
+            features = decode_features(r, market, raw) if raw else None
+            redis_client.record("hit" if features is not None else "miss")
+        except Exception as exc:
+            redis_client.record("error")
+            logger.debug("Redis matchup cache read error: %s", exc)
+            redis_key = None
+
+    if features is None:
+        features = compute_features_for_matchup(
+            home_team_id=home_team_id,
+            away_team_id=away_team_id,
+            as_of_date=as_of_date,
+            market=market,
+            team_states=True,
+        )
+        if redis_key is not None and features:
+            try:
+                r.set(
+                    redis_key, encode_features(r, market, features, FORMAT_FLOAT64),
+                    ex=REDIS_TTL,
+                )
+                redis_client.record("write")
+            except Exception as exc:
+                redis_client.record("error")
+                logger.debug("Redis matchup cache write error: %s", exc)
+
+    _local_set(key, features)
+    return dict(features)
+
+
+def invalidate_teams(team_ids) -> None:
+    """
+    Invalida los matchups de `team_ids`: sube su generación en Redis (todos los
+    procesos) y borra sus entradas de la LRU de este proceso. Los demás procesos
+    las descartan como tarde a los LOCAL_TTL segundos.
+    """
+    team_ids = {str(t) for t in team_ids}
+    if not team_ids:
+        return
+    with _lock:
+        for key in [k for k in _local if k[0] in team_ids or k[1] in team_ids]:
+            del _local[key]
+    r = redis_client.get_redis()
+    if r is None:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for team_id in team_ids:
+            pipe.incr(_gen_key(team_id))
+        pipe.execute()
+        redis_client.record("write", len(team_ids))
+    except Exception as exc:
+        redis_client.record("error")
+        logger.warning("Redis matchup cache invalidation error: %s", exc)
+
+
+def clear_local() -> None:
+    """Vacía la LRU del proceso."""
+    with _lock:
+        _local.clear()
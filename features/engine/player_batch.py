@@ -0,0 +1,187 @@
+"""
+Features rolling de jugadores en bloque (slates de props).
+
+compute_player_rolling_features hace una consulta de líneas y dos de temporada
+por jugador y llamada. Aquí, para una fecha y una lista de jugadores:
+- una consulta de GamePlayerLine (periodo ALL) de todos los jugadores,
+- sumas acumuladas en NumPy por jugador para todas las ventanas,
+- una consulta por tabla de temporada (compute_season_players_features),
+y el resultado se guarda en PlayerFeatureSet con un bulk upsert.
+
+Las features son las mismas (mismas claves y redondeos) que las de
+compute_player_rolling_features.
+"""
+
+import logging
+from datetime import date, timedelta
+
+import numpy as np
+
+from features.engine.player_rolling import PLAYER_STATS, _player_window_features
+from features.engine.rolling import SEASON_TO_DATE
+
+logger = logging.getLogger(__name__)
+
+# Días hacia atrás para buscar la rotación de los equipos del slate
+ROTATION_DAYS = 30
+
+
+def _load_lines(player_ids, as_of_date: date):
+    """
+    Líneas ALL de `player_ids` anteriores a as_of_date, ordenadas por
+    (jugador, fecha). Devuelve (player_ids, fechas ordinales, stats int64, min).
+    """
+    from core.models import GamePlayerLine
+
+    rows = list(
+        GamePlayerLine.objects.filter(
+            period="ALL",
+            player__player_id__in=list(player_ids),
+            game__date__lt=as_of_date,
+        )
+        .order_by("player_id", "game__date")
+        .values_list("player_id", "game__date", "min_played", *PLAYER_STATS)
+    )
+    n = len(rows)
+    pids = np.array([r[0] for r in rows], dtype=object)
+    dates = np.fromiter((r[1].toordinal() for r in rows), dtype=np.int64, count=n)
+    mins = np.fromiter((float(r[2] or 0) for r in rows), dtype=np.float64, count=n)
+    stats = np.array([r[3:] for r in rows], dtype=np.int64).reshape(n, len(PLAYER_STATS))
+    return pids, dates, stats, mins
+
+
+def compute_players_rolling_features(
+    player_ids,
+    as_of_date: date,
+    windows=(5, 10, 20),
+    season_type: str = "Regular Season",
+) -> dict:
+    """
+    compute_player_rolling_features para muchos jugadores a la vez.
+    Devuelve {player_id: features}; los jugadores sin líneas ni stats de
+    temporada quedan con un dict vacío.
+    """
+    from features.engine.season import (
+        _season_from_date,
+        _season_start,
+        compute_season_players_features,
+    )
+
+    player_ids = [str(p) for p in player_ids]
+    out = {pid: {} for pid in player_ids}
+
+    try:
+        pids, dates, stats, mins = _load_lines(player_ids, as_of_date)
+        if len(pids):
+            # Tramos [start, end) por jugador y sumas acumuladas con fila 0 = 0
+            starts = np.flatnonzero(np.r_[True, pids[1:] != pids[:-1]])
+            ends = np.r_[starts[1:], len(pids)]
+            values = np.column_stack([stats.astype(np.float64), mins])
+            cum = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+            for window in windows:
+                if window == SEASON_TO_DATE:
+                    # Primera línea de cada jugador en la temporada de as_of_date
+                    seg = np.repeat(np.arange(len(starts)), ends - starts)
+                    keys = seg * 10_000_000 + dates
+                    first = np.searchsorted(
+                        keys, np.arange(len(starts)) * 10_000_000 + _season_start(as_of_date).toordinal()
+                    )
+                    lo = np.maximum(starts, first)
+                else:
+                    lo = np.maximum(starts, ends - int(window))
+                counts = ends - lo
+                sums = cum[ends] - cum[lo]
+
+                for i in np.flatnonzero(counts):
+                    row = sums[i]
+                    window_sums = {c: int(round(row[j])) for j, c in enumerate(PLAYER_STATS)}
+                    window_sums["min"] = float(row[-1])
+                    out[pids[starts[i]]].update(
+                        _player_window_features(window_sums, int(counts[i]), window)
+                    )
+    except Exception as exc:
+        logger.warning("bulk player rolling features error: %s", exc)
+
+    season = _season_from_date(as_of_date)
+    for pid, season_feats in compute_season_players_features(player_ids, season, season_type).items():
+        if pid in out:
+            out[pid].update(season_feats)
+    return out
+
+
+def slate_player_ids(as_of_date: date, team_ids=None, days: int = ROTATION_DAYS) -> list:
+    """
+    Jugadores de la rotación reciente (líneas en los últimos `days` días) de los
+    equipos que juegan en as_of_date, o de `team_ids` si se indica.
+    """
+    from core.models import Game, GamePlayerLine
+
+    if team_ids is None:
+        team_ids = set()
+        for home, away in Game.objects.filter(date=as_of_date).values_list(
+            "home_team_id", "away_team_id"
+        ):
+            team_ids.update(t for t in (home, away) if t)
+    if not team_ids:
+        return []
+
+    return sorted(
+        GamePlayerLine.objects.filter(
+            team_id__in=list(team_ids),
+            period="ALL",
+            player__isnull=False,
+            game__date__lt=as_of_date,
+            game__date__gte=as_of_date - timedelta(days=days),
+        )
+        .order_by()
+        .values_list("player_id", flat=True)
+        .distinct()
+    )
+
+
+def build_player_feature_sets(
+    as_of_date: date,
+    player_ids=None,
+    team_ids=None,
+    windows=(5, 10, 20),
+    min_minutes: float = 0.0,
+    season_type: str = "Regular Season",
+    context: str = "all",
+    batch_size: int = 1000,
+) -> dict:
+    """
+    Calcula y guarda en PlayerFeatureSet las features de los jugadores del slate
+    de as_of_date (o de `player_ids`). Con `min_minutes` descarta a los que
+    promedian menos minutos en la ventana más corta.
+    Devuelve {"players", "written", "skipped"}.
+    """
+    from features.engine.season import _season_from_date
+    from features.models import PlayerFeatureSet
+
+    if player_ids is None:
+        player_ids = slate_player_ids(as_of_date, team_ids=team_ids)
+    by_player = compute_players_rolling_features(
+        player_ids, as_of_date, windows=windows, season_type=season_type,
+    )
+
+    min_key = f"player_min_avg_{windows[0]}" if windows else None
+    season = _season_from_date(as_of_date)
+    objs = []
+    for player_id, features in by_player.items():
+        if not features or (min_minutes and features.get(min_key, 0.0) < min_minutes):
+            continue
+        objs.append(PlayerFeatureSet(
+            player_id=player_id, as_of_date=as_of_date, context=context,
+            features=features, season=season,
+        ))
+
+    if objs:
+        PlayerFeatureSet.objects.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["player_id", "as_of_date", "context"],
+            update_fields=["features", "season", "computed_at"],
+        )
+    return {"players": len(by_player), "written": len(objs), "skipped": len(by_player) - len(objs)}
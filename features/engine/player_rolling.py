@@ -9,80 +9,92 @@ from datetime import date
 logger = logging.getLogger(__name__)
 
 
+PLAYER_STATS = (
+    "pts", "reb", "ast", "stl", "blk", "tov",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta",
+)
+
+
+def _player_window_features(sums: dict, n: int, w) -> dict:
+    """
+    Promedios/porcentajes de una ventana de `n` partidos del jugador a partir de
+    sus sumas (PLAYER_STATS + `min`). Compartido por la ruta ORM y el store.
+    """
+    features = {}
+    features[f"player_pts_avg_{w}"] = round(sums["pts"] / n, 2)
+    features[f"player_reb_avg_{w}"] = round(sums["reb"] / n, 2)
+    features[f"player_ast_avg_{w}"] = round(sums["ast"] / n, 2)
+    features[f"player_stl_avg_{w}"] = round(sums["stl"] / n, 2)
+    features[f"player_blk_avg_{w}"] = round(sums["blk"] / n, 2)
+    features[f"player_tov_avg_{w}"] = round(sums["tov"] / n, 2)
+    features[f"player_min_avg_{w}"] = round(sums["min"] / n, 2)
+
+    total_fga = sums["fga"]
+    total_fg3a = sums["fg3a"]
+    total_fta = sums["fta"]
+    features[f"player_fg_pct_{w}"] = (
+        round(sums["fgm"] / total_fga, 4) if total_fga else 0.0
+    )
+    features[f"player_fg3_pct_{w}"] = (
+        round(sums["fg3m"] / total_fg3a, 4) if total_fg3a else 0.0
+    )
+    features[f"player_ft_pct_{w}"] = (
+        round(sums["ftm"] / total_fta, 4) if total_fta else 0.0
+    )
+
+    # TS% = PTS / (2 * (FGA + 0.44 * FTA))
+    denom = 2 * (total_fga + 0.44 * total_fta)
+    features[f"player_ts_pct_{w}"] = (
+        round(sums["pts"] / denom, 4) if denom else 0.0
+    )
+
+    pra = sums["pts"] + sums["reb"] + sums["ast"]
+    features[f"player_pra_avg_{w}"] = round(pra / n, 2)
+    return features
+
+
 def compute_player_rolling_features(
     player_id: str,
     as_of_date: date,
     windows=(5, 10, 20),
+    store=None,
 ) -> dict:
     """
     Devuelve estadísticas rolling del jugador hasta as_of_date,
     más features de temporada (usg%, ts%, off/def rating).
+    Con `store` (PlayerGameLogStore) los rolling se sirven desde memoria;
+    las ventanas admiten SEASON_TO_DATE ("std").
     """
     features = {}
     try:
-        from core.models import GamePlayerLine
-
-        qs = (
-            GamePlayerLine.objects.filter(
-                player__player_id=player_id,
-                game__date__lt=as_of_date,
-                period="ALL",
-            )
-            .select_related("game")
-            .order_by("-game__date")
-        )
+        if store is not None:
+            for window in windows:
+                sums, n = store.line_sums(player_id, as_of_date, window, PLAYER_STATS + ("min",))
+                if n:
+                    features.update(_player_window_features(sums, n, window))
+        else:
+            from core.models import GamePlayerLine
+            from features.engine.rolling import _window_rows
 
-        for window in windows:
-            lines = list(qs[:window])
-            n = len(lines)
-            if n == 0:
-                continue
-
-            pts_list = [row.pts for row in lines]
-            reb_list = [row.reb for row in lines]
-            ast_list = [row.ast for row in lines]
-            stl_list = [row.stl for row in lines]
-            blk_list = [row.blk for row in lines]
-            tov_list = [row.tov for row in lines]
-            min_list = [row.min_played or 0 for row in lines]
-            fgm_list = [row.fgm for row in lines]
-            fga_list = [row.fga for row in lines]
-            fg3m_list = [row.fg3m for row in lines]
-            fg3a_list = [row.fg3a for row in lines]
-            ftm_list = [row.ftm for row in lines]
-            fta_list = [row.fta for row in lines]
-
-            w = window
-            features[f"player_pts_avg_{w}"] = round(sum(pts_list) / n, 2)
-            features[f"player_reb_avg_{w}"] = round(sum(reb_list) / n, 2)
-            features[f"player_ast_avg_{w}"] = round(sum(ast_list) / n, 2)
-            features[f"player_stl_avg_{w}"] = round(sum(stl_list) / n, 2)
-            features[f"player_blk_avg_{w}"] = round(sum(blk_list) / n, 2)
-            features[f"player_tov_avg_{w}"] = round(sum(tov_list) / n, 2)
-            features[f"player_min_avg_{w}"] = round(sum(min_list) / n, 2)
-
-            total_fga = sum(fga_list)
-            total_fg3a = sum(fg3a_list)
-            total_fta = sum(fta_list)
-            features[f"player_fg_pct_{w}"] = (
-                round(sum(fgm_list) / total_fga, 4) if total_fga else 0.0
-            )
-            features[f"player_fg3_pct_{w}"] = (
-                round(sum(fg3m_list) / total_fg3a, 4) if total_fg3a else 0.0
-            )
-            features[f"player_ft_pct_{w}"] = (
-                round(sum(ftm_list) / total_fta, 4) if total_fta else 0.0
+            qs = (
+                GamePlayerLine.objects.filter(
+                    player__player_id=player_id,
+                    game__date__lt=as_of_date,
+                    period="ALL",
+                )
+                .select_related("game")
+                .order_by("-game__date")
             )
 
-            # TS% = PTS / (2 * (FGA + 0.44 * FTA))
-            total_pts = sum(pts_list)
-            denom = 2 * (total_fga + 0.44 * total_fta)
-            features[f"player_ts_pct_{w}"] = (
-                round(total_pts / denom, 4) if denom else 0.0
-            )
+            for window in windows:
+                lines = _window_rows(qs, window, as_of_date)
+                n = len(lines)
+                if n == 0:
+                    continue
 
-            pra = [p + r + a for p, r, a in zip(pts_list, reb_list, ast_list)]
-            features[f"player_pra_avg_{w}"] = round(sum(pra) / n, 2)
+                sums = {stat: sum(getattr(row, stat) for row in lines) for stat in PLAYER_STATS}
+                sums["min"] = sum(row.min_played or 0 for row in lines)
+                features.update(_player_window_features(sums, n, window))
 
     except Exception as exc:
         logger.warning(
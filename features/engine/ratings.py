@@ -0,0 +1,363 @@
+"""
+Ratings de equipo (Elo, Glicko-2, TrueSkill) como fuente de features.
+
+build_ratings recorre los partidos con resultado en orden cronológico con los
+motores de ia.services.rating_systems (un periodo de rating por día de partidos)
+y guarda en TeamRating el rating y la desviación previos y posteriores de cada
+equipo en cada partido. Es incremental: retoma el estado desde las filas
+guardadas y solo recalcula desde el primer partido nuevo o con el resultado
+cambiado.
+
+RatingIndex: índice en memoria (una consulta a TeamRating) con el último estado
+de cada equipo ordenado por fecha y los días con partidos; el rating
+pre-partido en cualquier fecha es una búsqueda binaria más la regresión de
+temporada (Elo), los periodos sin jugar (Glicko-2) o la dinámica τ (TrueSkill).
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = getattr(settings, "FEATURES_STORE_REFRESH_SECONDS", 300)
+
+ELO_K = getattr(settings, "FEATURES_ELO_K", 20.0)
+ELO_HOME_ADVANTAGE = getattr(settings, "FEATURES_ELO_HOME_ADVANTAGE", 100.0)
+ELO_SEASON_REGRESSION = getattr(settings, "FEATURES_ELO_SEASON_REGRESSION", 0.25)
+
+GLICKO2_TAU = getattr(settings, "FEATURES_GLICKO2_TAU", 0.5)
+
+RATING_SYSTEMS = ("elo", "glicko2", "trueskill")
+
+
+def make_engine(system: str = "elo"):
+    """Motor de rating vacío con los parámetros de settings."""
+    from ia.services.rating_systems import EloRatings, Glicko2Ratings, TrueSkillRatings
+
+    if system == "elo":
+        return EloRatings(
+            k_factor=ELO_K,
+            home_advantage=ELO_HOME_ADVANTAGE,
+            season_regression=ELO_SEASON_REGRESSION,
+        )
+    if system == "glicko2":
+        return Glicko2Ratings(tau=GLICKO2_TAU, home_advantage=ELO_HOME_ADVANTAGE)
+    if system == "trueskill":
+        return TrueSkillRatings()
+    raise ValueError(f"Sistema de rating desconocido: {system}")
+
+
+def _finished_games():
+    from core.models import Game
+
+    return (
+        Game.objects.filter(
+            date__isnull=False,
+            home_team__isnull=False,
+            away_team__isnull=False,
+            home_score__isnull=False,
+            away_score__isnull=False,
+        )
+        .order_by("date", "game_id")
+        .values_list("game_id", "date", "home_team_id", "away_team_id", "home_score", "away_score")
+    )
+
+
+def _pending_since(system: str) -> Optional[date]:
+    """
+    Fecha del primer partido con resultado sin rating o con el resultado
+    distinto del usado al calcularlo; None si todo está al día.
+    """
+    from features.models import TeamRating
+
+    rated = {
+        gid: (pts, opp)
+        for gid, pts, opp in TeamRating.objects.filter(system=system, home_away="home")
+        .values_list("game_id", "points", "opp_points")
+    }
+    for gid, game_date, _, _, home_score, away_score in _finished_games().iterator(chunk_size=2000):
+        if rated.get(gid) != (home_score, away_score):
+            return game_date
+    return None
+
+
+def build_ratings(system: str = "elo", full: bool = False, batch_size: int = 1000) -> dict:
+    """
+    Calcula y guarda los TeamRating de `system`.
+    - full: desde el primer partido.
+    - por defecto: desde el primer partido pendiente (nuevo o con resultado
+      cambiado), retomando el estado de cada equipo de su última fila anterior.
+    Cada día con partidos es un periodo de rating. Devuelve {"games", "since", "teams"}.
+    """
+    from django.db.models import Max
+    from features.engine.season import _season_from_date
+    from features.models import TeamRating
+
+    since = None
+    if not full:
+        since = _pending_since(system)
+        if since is None:
+            return {"games": 0, "since": None, "teams": []}
+
+    engine = make_engine(system)
+    rows = TeamRating.objects.filter(system=system)
+    if since is not None:
+        before = rows.filter(date__lt=since)
+        last = before.values("team_id").annotate(last=Max("date"))
+        last_dates = {r["team_id"]: r["last"] for r in last}
+        for team_id, game_date, season, rating, deviation, volatility in before.filter(
+            date__in=set(last_dates.values())
+        ).values_list("team_id", "date", "season", "rating_post", "deviation_post", "volatility"):
+            if last_dates.get(team_id) == game_date:
+                engine.set_state(
+                    team_id, rating, deviation, volatility,
+                    season=season, last_period=game_date.toordinal(),
+                )
+        engine.set_periods(
+            d.toordinal() for d in before.order_by().values_list("date", flat=True).distinct()
+        )
+        rows.filter(date__gte=since).delete()
+    else:
+        rows.delete()
+
+    games = _finished_games()
+    if since is not None:
+        games = games.filter(date__gte=since)
+
+    n_games = 0
+    teams = set()
+    pending = []
+
+    def flush_period(game_date, period_games):
+        season = _season_from_date(game_date)
+        results = engine.update_period(game_date.toordinal(), [g[1:] for g in period_games], season)
+        for (gid, home, away, home_score, away_score), r in zip(period_games, results):
+            pending.append(TeamRating(
+                system=system, team_id=home, game_id=gid, date=game_date, season=season,
+                home_away="home", points=home_score, opp_points=away_score,
+                rating_pre=r["home_pre"], rating_post=r["home_post"],
+                deviation_pre=r.get("home_dev_pre"), deviation_post=r.get("home_dev_post"),
+                volatility=r.get("home_vol"), win_prob=r["prob"],
+            ))
+            pending.append(TeamRating(
+                system=system, team_id=away, game_id=gid, date=game_date, season=season,
+                home_away="away", points=away_score, opp_points=home_score,
+                rating_pre=r["away_pre"], rating_post=r["away_post"],
+                deviation_pre=r.get("away_dev_pre"), deviation_post=r.get("away_dev_post"),
+                volatility=r.get("away_vol"), win_prob=1.0 - r["prob"],
+            ))
+            teams.update((home, away))
+
+    period_date, period_games = None, []
+    for gid, game_date, home, away, home_score, away_score in games.iterator(chunk_size=2000):
+        if period_games and game_date != period_date:
+            flush_period(period_date, period_games)
+            n_games += len(period_games)
+            period_games = []
+            if len(pending) >= batch_size:
+                TeamRating.objects.bulk_create(pending, batch_size=batch_size)
+                pending = []
+        period_date = game_date
+        period_games.append((gid, home, away, home_score, away_score))
+    if period_games:
+        flush_period(period_date, period_games)
+        n_games += len(period_games)
+    if pending:
+        TeamRating.objects.bulk_create(pending, batch_size=batch_size)
+
+    if teams:
+        from features.engine.matchup_cache import invalidate_teams
+        invalidate_teams(teams)
+    refresh_rating_index()
+    return {"games": n_games, "since": since, "teams": sorted(teams)}
+
+
+def build_all_ratings(full: bool = False) -> dict:
+    """build_ratings para todos los RATING_SYSTEMS. Devuelve {system: resultado}."""
+    return {system: build_ratings(system=system, full=full) for system in RATING_SYSTEMS}
+
+
+class RatingIndex:
+    """
+    Estado posterior por equipo de un sistema: `teams[team_id]` = (fechas
+    ordinales ascendentes, ratings, desviaciones, volatilidades, temporadas), y
+    `periods`, los días con partidos (para los periodos sin jugar de Glicko-2).
+    """
+
+    def __init__(self, system: str = "elo"):
+        self.system = system
+        self.engine = make_engine(system)
+        self.teams: dict = {}
+        self.periods = np.zeros(0, dtype=np.int64)
+        self.loaded_at = 0.0
+
+    def load(self):
+        from features.models import TeamRating
+
+        by_team = defaultdict(lambda: ([], [], [], [], []))
+        for team_id, game_date, season, rating, deviation, volatility in (
+            TeamRating.objects.filter(system=self.system)
+            .order_by("team_id", "date")
+            .values_list("team_id", "date", "season", "rating_post", "deviation_post", "volatility")
+        ):
+            cols = by_team[team_id]
+            for col, value in zip(cols, (game_date.toordinal(), rating, deviation, volatility, season)):
+                col.append(value)
+        self.teams = {
+            team_id: (np.asarray(cols[0], dtype=np.int64), *cols[1:])
+            for team_id, cols in by_team.items()
+        }
+        if self.teams:
+            self.periods = np.unique(np.concatenate([t[0] for t in self.teams.values()]))
+        self.loaded_at = time.time()
+        return self
+
+    def rating(self, team_id, as_of_date: date, season: str):
+        """
+        (rating, desviación) pre-partido del equipo en as_of_date; None si no
+        tiene partidos previos. La desviación es None en Elo.
+        """
+        entry = self.teams.get(str(team_id))
+        if entry is None:
+            return None
+        dates, ratings, deviations, volatilities, seasons = entry
+        as_of = as_of_date.toordinal()
+        i = int(np.searchsorted(dates, as_of, side="left")) - 1
+        if i < 0:
+            return None
+        idle = int(
+            np.searchsorted(self.periods, as_of, side="left")
+            - np.searchsorted(self.periods, dates[i], side="right")
+        )
+        return self.engine.pre_game(
+            ratings[i], deviations[i], volatilities[i], seasons[i], season, idle
+        )
+
+
+_indexes: dict = {}
+_index_lock = threading.Lock()
+
+
+def get_rating_index(system: str = "elo", max_age: float = None) -> RatingIndex:
+    """
+    Índice de ratings del proceso, cargado la primera vez y recargado si tiene
+    más de `max_age` segundos (FEATURES_STORE_REFRESH_SECONDS).
+    """
+    if max_age is None:
+        max_age = REFRESH_SECONDS
+    with _index_lock:
+        index = _indexes.get(system)
+        if index is None or time.time() - index.loaded_at > max_age:
+            index = _indexes[system] = RatingIndex(system).load()
+        return index
+
+
+def refresh_rating_index() -> None:
+    """Recarga los índices ya cargados en este proceso (p.ej. tras build_ratings)."""
+    with _index_lock:
+        for system in list(_indexes):
+            _indexes[system] = RatingIndex(system).load()
+
+
+def _team_rating(system: str, team_id, as_of_date: date, season: str, engine):
+    """Ruta ORM de RatingIndex.rating: última fila del equipo antes de as_of_date."""
+    from features.models import TeamRating
+
+    rows = TeamRating.objects.filter(system=system)
+    row = (
+        rows.filter(team_id=str(team_id), date__lt=as_of_date)
+        .order_by("-date")
+        .values_list("date", "season", "rating_post", "deviation_post", "volatility")
+        .first()
+    )
+    if row is None:
+        return None
+    last_date, last_season, rating, deviation, volatility = row
+    idle = 0
+    if system == "glicko2":
+        idle = (
+            rows.filter(date__gt=last_date, date__lt=as_of_date)
+            .order_by().values("date").distinct().count()
+        )
+    return engine.pre_game(rating, deviation, volatility, last_season, season, idle)
+
+
+def compute_rating_features(
+    home_team_id: str,
+    away_team_id: str,
+    as_of_date: Optional[date] = None,
+    system: str = "elo",
+    index: Optional[RatingIndex] = None,
+) -> dict:
+    """
+    Ratings pre-partido de local y visitante, su diferencia, su desviación
+    (Glicko-2: `_rd`, TrueSkill: `_sigma`) y la probabilidad de victoria del
+    local (con ventaja de campo). Con `index` se sirven desde memoria; sin él,
+    lecturas indexadas de TeamRating. Vacío si alguno de los equipos no tiene
+    rating previo.
+    """
+    from features.engine.season import _season_from_date
+
+    features = {}
+    if as_of_date is None:
+        as_of_date = date.today()
+    season = _season_from_date(as_of_date)
+
+    try:
+        if index is not None:
+            engine = index.engine
+            home = index.rating(home_team_id, as_of_date, season)
+            away = index.rating(away_team_id, as_of_date, season)
+        else:
+            engine = make_engine(system)
+            home = _team_rating(system, home_team_id, as_of_date, season, engine)
+            away = _team_rating(system, away_team_id, as_of_date, season, engine)
+        if home is None or away is None:
+            return features
+
+        (home_rating, home_dev), (away_rating, away_dev) = home, away
+        features[f"{system}_home"] = round(home_rating, 1)
+        features[f"{system}_away"] = round(away_rating, 1)
+        features[f"{system}_diff"] = round(home_rating - away_rating, 1)
+        if engine.deviation_name:
+            features[f"{system}_home_{engine.deviation_name}"] = round(home_dev, 2)
+            features[f"{system}_away_{engine.deviation_name}"] = round(away_dev, 2)
+        features[f"{system}_home_win_prob"] = round(
+            engine.win_prob(home_rating, home_dev, away_rating, away_dev), 4
+        )
+    except Exception as exc:
+        logger.warning(
+            "rating features error home=%s away=%s system=%s: %s",
+            home_team_id, away_team_id, system, exc,
+        )
+
+    return features
+
+
+def get_rating_indexes(max_age: float = None) -> dict:
+    """{system: RatingIndex} de todos los RATING_SYSTEMS."""
+    return {system: get_rating_index(system, max_age) for system in RATING_SYSTEMS}
+
+
+def compute_all_rating_features(home_team_id: str, away_team_id: str,
+                                as_of_date: Optional[date] = None,
+                                indexes: Optional[dict] = None) -> dict:
+    """
+    compute_rating_features de todos los RATING_SYSTEMS desde sus índices en
+    memoria (`indexes`, por defecto los del proceso).
+    """
+    if indexes is None:
+        indexes = get_rating_indexes()
+    features = {}
+    for system in RATING_SYSTEMS:
+        features.update(compute_rating_features(
+            home_team_id, away_team_id, as_of_date, system=system, index=indexes[system],
+        ))
+    return features
@@ -0,0 +1,160 @@
+"""
+Cliente Redis compartido para la caché de features.
+
+Un único ConnectionPool por proceso con timeouts de socket cortos y un circuit
+breaker: tras FEATURES_REDIS_FAILURE_THRESHOLD errores seguidos se deja de usar
+Redis durante FEATURES_REDIS_COOLDOWN_SECONDS (se va directo a DB) y después se
+prueba de nuevo con una sola petición. Contadores hit/miss/write/error/skipped en memoria y en Prometheus.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = getattr(
+    settings, "FEATURES_REDIS_URL",
+    getattr(settings, "CELERY_BROKER_URL", "redis://redis:6379/0"),
+)
+SOCKET_TIMEOUT = getattr(settings, "FEATURES_REDIS_SOCKET_TIMEOUT", 0.25)
+MAX_CONNECTIONS = getattr(settings, "FEATURES_REDIS_MAX_CONNECTIONS", 50)
+FAILURE_THRESHOLD = getattr(settings, "FEATURES_REDIS_FAILURE_THRESHOLD", 3)
+COOLDOWN_SECONDS = getattr(settings, "FEATURES_REDIS_COOLDOWN_SECONDS", 30)
+
+RESULTS = ("hit", "miss", "write", "error", "skipped")
+
+try:
+    from prometheus_client import Counter, Gauge
+
+    _REQUESTS = Counter(
+        "nba_features_redis_requests_total",
+        "Accesos a la caché Redis de features por resultado",
+        ["result"],
+    )
+    _CIRCUIT_OPEN = Gauge(
+        "nba_features_redis_circuit_open",
+        "1 si el circuit breaker de Redis de features está abierto",
+    )
+except Exception:  # prometheus_client no disponible
+    _REQUESTS = None
+    _CIRCUIT_OPEN = None
+
+
+class CircuitBreaker:
+    """
+    Abre el circuito tras `threshold` fallos consecutivos y lo mantiene abierto
+    `cooldown` segundos. Pasado ese tiempo queda semiabierto: deja pasar una
+    sola petición de prueba y el resto sigue yendo a DB hasta que la prueba
+    acaba bien (se cierra) o mal (se vuelve a abrir). Si la prueba no informa
+    de su resultado en `cooldown` segundos, se permite otra.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.cooldown:
+                return False
+            if self.probe_started is not None and now - self.probe_started < self.cooldown:
+                # Ya hay una prueba en curso
+                return False
+            self.probe_started = now
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+        if _CIRCUIT_OPEN is not None:
+            _CIRCUIT_OPEN.set(0)
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.probe_started is not None:
+                # Falló la prueba: otro periodo de enfriamiento completo
+                self.probe_started = None
+                self.opened_at = time.monotonic()
+            elif self.failures >= self.threshold and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                logger.warning(
+                    "Redis features: %s fallos seguidos, circuito abierto %ss",
+                    self.failures, self.cooldown,
+                )
+        if _CIRCUIT_OPEN is not None and self.is_open:
+            _CIRCUIT_OPEN.set(1)
+
+
+breaker = CircuitBreaker()
+_counts = dict.fromkeys(RESULTS, 0)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                import redis
+                _pool = redis.ConnectionPool.from_url(
+                    REDIS_URL,
+                    decode_responses=False,  # valores binarios (features.engine.codec)
+                    socket_timeout=SOCKET_TIMEOUT,
+                    socket_connect_timeout=SOCKET_TIMEOUT,
+                    max_connections=MAX_CONNECTIONS,
+                    health_check_interval=30,
+                )
+    return _pool
+
+
+def get_redis():
+    """
+    Cliente Redis sobre el pool compartido, o None si Redis no está disponible
+    o el circuito está abierto (el llamador debe ir a DB).
+    """
+    if not breaker.allow():
+        record("skipped")
+        return None
+    try:
+        import redis
+        return redis.Redis(connection_pool=_get_pool())
+    except Exception as exc:
+        logger.debug("Redis features client error: %s", exc)
+        return None
+
+
+def record(result: str, n: int = 1) -> None:
+    """
+    Anota el resultado de un acceso (hit/miss/write/error/skipped). Un error
+    cuenta para el circuit breaker; un acceso correcto lo cierra.
+    """
+    _counts[result] = _counts.get(result, 0) + n
+    if _REQUESTS is not None:
+        _REQUESTS.labels(result=result).inc(n)
+    if result == "error":
+        breaker.failure()
+    elif result in ("hit", "miss", "write"):
+        breaker.success()
+
+
+def stats() -> dict:
+    """Contadores del proceso y estado del circuito."""
+    return {**_counts, "circuit_open": breaker.is_open}
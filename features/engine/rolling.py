@@ -1,6 +1,9 @@
 """
 Features de estadísticas rolling por equipo (últimos N partidos).
 Calcula promedios de PTS, REB, AST, FG%, 3P%, TOV, etc.
+
+Las ventanas son un nº de partidos o SEASON_TO_DATE ("std"): todos los partidos
+de la temporada anteriores a la fecha (las claves quedan como `team_pts_avg_std`).
 """
 
 import logging
@@ -9,17 +12,97 @@ from datetime import date
 logger = logging.getLogger(__name__)
 
 
+TEAM_STATS = (
+    "pts", "reb", "ast", "tov", "stl", "blk",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta",
+)
+QUARTER_STATS = ("pts", "fgm", "fga", "fg3m", "fg3a", "tov")
+
+# Ventana especial: temporada hasta la fecha (desde el 1 de octubre)
+SEASON_TO_DATE = "std"
+
+# Cuartos que forman cada mitad
+HALF_QUARTERS = {1: ("Q1", "Q2"), 2: ("Q3", "Q4")}
+
+
+def _window_rows(qs, window, as_of_date: date, date_field: str = "game__date") -> list:
+    """Filas de la ventana en la ruta ORM: qs ordenado por fecha descendente."""
+    if window == SEASON_TO_DATE:
+        from features.engine.season import _season_start
+        return list(qs.filter(**{f"{date_field}__gte": _season_start(as_of_date)}))
+    return list(qs[:window])
+
+
+def _team_window_features(sums: dict, n: int, w: int) -> dict:
+    """
+    Promedios/porcentajes de una ventana de `n` partidos a partir de sus sumas.
+    Compartido por la ruta ORM, el store en memoria y el motor vectorizado.
+    """
+    features = {}
+    features[f"team_pts_avg_{w}"] = round(sums["pts"] / n, 2)
+    features[f"team_reb_avg_{w}"] = round(sums["reb"] / n, 2)
+    features[f"team_ast_avg_{w}"] = round(sums["ast"] / n, 2)
+    features[f"team_tov_avg_{w}"] = round(sums["tov"] / n, 2)
+    features[f"team_stl_avg_{w}"] = round(sums["stl"] / n, 2)
+    features[f"team_blk_avg_{w}"] = round(sums["blk"] / n, 2)
+
+    total_fga = sums["fga"]
+    total_fg3a = sums["fg3a"]
+    total_fta = sums["fta"]
+    features[f"team_fg_pct_{w}"] = round(sums["fgm"] / total_fga, 4) if total_fga else 0.0
+    features[f"team_fg3_pct_{w}"] = round(sums["fg3m"] / total_fg3a, 4) if total_fg3a else 0.0
+    features[f"team_ft_pct_{w}"] = round(sums["ftm"] / total_fta, 4) if total_fta else 0.0
+
+    # Puntos por partido oponente
+    features[f"team_pts_allowed_avg_{w}"] = round(sums["opp_pts"] / n, 2)
+    features[f"team_point_diff_avg_{w}"] = round(
+        features[f"team_pts_avg_{w}"] - features[f"team_pts_allowed_avg_{w}"], 2
+    )
+    return features
+
+
+def _quarter_window_features(sums: dict, n: int, prefix: str, w: int) -> dict:
+    total_fga = sums["fga"]
+    total_fg3a = sums["fg3a"]
+    return {
+        f"team_{prefix}_pts_avg_{w}": round(sums["pts"] / n, 2),
+        f"team_{prefix}_tov_avg_{w}": round(sums["tov"] / n, 2),
+        f"team_{prefix}_fg_pct_{w}": (
+            round(sums["fgm"] / total_fga, 4) if total_fga else 0.0
+        ),
+        f"team_{prefix}_fg3_pct_{w}": (
+            round(sums["fg3m"] / total_fg3a, 4) if total_fg3a else 0.0
+        ),
+    }
+
+
+def _win_pct_features(wins: int, n: int, w: int) -> dict:
+    return {f"team_win_pct_{w}": round(wins / n, 4)}
+
+
+def _half_window_features(total: int, n: int, prefix: str, w: int) -> dict:
+    return {f"team_{prefix}_pts_avg_{w}": round(total / n, 2)}
+
+
 def compute_rolling_team_features(
     team_id: str,
     as_of_date: date,
     windows=(5, 10),
+    store=None,
 ) -> dict:
     """
     Devuelve estadísticas rolling del equipo como local o visitante.
-    Usa GameTeamLine normalizado.
+    Usa GameTeamLine normalizado, o el TeamGameLogStore en memoria si se pasa `store`.
     """
     features = {}
     try:
+        if store is not None:
+            for window in windows:
+                sums, n = store.line_sums(team_id, as_of_date, window, TEAM_STATS + ("opp_pts",))
+                if n:
+                    features.update(_team_window_features(sums, n, window))
+            return features
+
         from core.models import GameTeamLine
 
         qs = (
@@ -33,52 +116,16 @@ def compute_rolling_team_features(
         )
 
         for window in windows:
-            lines = list(qs[:window])
-            n = len(lines)
-            if n == 0:
+            lines = _window_rows(qs, window, as_of_date)
+            if not lines:
                 continue
 
-            pts_list = [l.pts for l in lines]
-            reb_list = [l.reb for l in lines]
-            ast_list = [l.ast for l in lines]
-            tov_list = [l.tov for l in lines]
-            stl_list = [l.stl for l in lines]
-            blk_list = [l.blk for l in lines]
-            fgm_list = [l.fgm for l in lines]
-            fga_list = [l.fga for l in lines]
-            fg3m_list = [l.fg3m for l in lines]
-            fg3a_list = [l.fg3a for l in lines]
-            ftm_list = [l.ftm for l in lines]
-            fta_list = [l.fta for l in lines]
-
-            w = window
-            features[f"team_pts_avg_{w}"] = round(sum(pts_list) / n, 2)
-            features[f"team_reb_avg_{w}"] = round(sum(reb_list) / n, 2)
-            features[f"team_ast_avg_{w}"] = round(sum(ast_list) / n, 2)
-            features[f"team_tov_avg_{w}"] = round(sum(tov_list) / n, 2)
-            features[f"team_stl_avg_{w}"] = round(sum(stl_list) / n, 2)
-            features[f"team_blk_avg_{w}"] = round(sum(blk_list) / n, 2)
-
-            total_fga = sum(fga_list)
-            total_fg3a = sum(fg3a_list)
-            total_fta = sum(fta_list)
-            features[f"team_fg_pct_{w}"] = round(sum(fgm_list) / total_fga, 4) if total_fga else 0.0
-            features[f"team_fg3_pct_{w}"] = round(sum(fg3m_list) / total_fg3a, 4) if total_fg3a else 0.0
-            features[f"team_ft_pct_{w}"] = round(sum(ftm_list) / total_fta, 4) if total_fta else 0.0
-
-            # Puntos por partido oponente
-            opp_scores = []
-            for line in lines:
-                game = line.game
-                if game.home_team_id == team_id:
-                    opp_scores.append(game.away_score or 0)
-                else:
-                    opp_scores.append(game.home_score or 0)
-            if opp_scores:
-                features[f"team_pts_allowed_avg_{w}"] = round(sum(opp_scores) / len(opp_scores), 2)
-                features[f"team_point_diff_avg_{w}"] = round(
-                    features[f"team_pts_avg_{w}"] - features[f"team_pts_allowed_avg_{w}"], 2
-                )
+            sums = {stat: sum(getattr(l, stat) for l in lines) for stat in TEAM_STATS}
+            sums["opp_pts"] = sum(
+                (l.game.away_score if l.game.home_team_id == team_id else l.game.home_score) or 0
+                for l in lines
+            )
+            features.update(_team_window_features(sums, len(lines), window))
 
     except Exception as exc:
         logger.warning("rolling team features error team=%s: %s", team_id, exc)
@@ -86,26 +133,22 @@ def compute_rolling_team_features(
     return features
 
 
-def compute_win_pct_features(team_id: str, as_of_date: date, windows=(5, 10)) -> dict:
+def compute_win_pct_features(team_id: str, as_of_date: date, windows=(5, 10), store=None) -> dict:
     """
     Win% en los últimos N partidos del equipo.
     """
     features = {}
     try:
-        from core.models import Game
+        if store is not None:
+            for window in windows:
+                sums, n = store.result_sums(team_id, as_of_date, window, ("won",))
+                if n:
+                    features.update(_win_pct_features(sums["won"], n, window))
+            return features
 
-        games = (
-            Game.objects.filter(
-                date__lt=as_of_date,
-            )
-            .filter(
-                models.Q(home_team__team_id=team_id) | models.Q(away_team__team_id=team_id)
-            )
-            .order_by("-date")
-        )
-
-        # Usar Django Q objects
         from django.db.models import Q
+        from core.models import Game
+
         games = (
             Game.objects.filter(
                 date__lt=as_of_date,
@@ -116,7 +159,7 @@ def compute_win_pct_features(team_id: str, as_of_date: date, windows=(5, 10)) ->
         )
 
         for window in windows:
-            window_games = list(games[:window])
+            window_games = _window_rows(games, window, as_of_date, date_field="date")
             n = len(window_games)
             if n == 0:
                 continue
@@ -126,7 +169,7 @@ def compute_win_pct_features(team_id: str, as_of_date: date, windows=(5, 10)) ->
                     wins += 1
                 elif g.away_team_id == team_id and (g.away_score or 0) > (g.home_score or 0):
                     wins += 1
-            features[f"team_win_pct_{window}"] = round(wins / n, 4)
+            features.update(_win_pct_features(wins, n, window))
 
     except Exception as exc:
         logger.warning("win_pct features error team=%s: %s", team_id, exc)
@@ -139,11 +182,19 @@ def compute_rolling_quarter_features(
     as_of_date: date,
     quarter: str = "Q1",
     windows: tuple = (5, 10),
+    store=None,
 ) -> dict:
     """Rolling de puntos/FG/TOV de un equipo en un cuarto específico (Q1..Q4)."""
     features = {}
     prefix = quarter.lower()
     try:
+        if store is not None:
+            for window in windows:
+                sums, n = store.line_sums(team_id, as_of_date, window, QUARTER_STATS, period=quarter)
+                if n:
+                    features.update(_quarter_window_features(sums, n, prefix, window))
+            return features
+
         from core.models import GameTeamLine
 
         qs = (
@@ -157,29 +208,12 @@ def compute_rolling_quarter_features(
         )
 
         for window in windows:
-            lines = list(qs[:window])
-            n = len(lines)
-            if n == 0:
+            lines = _window_rows(qs, window, as_of_date)
+            if not lines:
                 continue
 
-            pts = [l.pts for l in lines]
-            fgm = [l.fgm for l in lines]
-            fga = [l.fga for l in lines]
-            fg3m = [l.fg3m for l in lines]
-            fg3a = [l.fg3a for l in lines]
-            tov = [l.tov for l in lines]
-
-            total_fga = sum(fga)
-            total_fg3a = sum(fg3a)
-
-            features[f"team_{prefix}_pts_avg_{window}"] = round(sum(pts) / n, 2)
-            features[f"team_{prefix}_tov_avg_{window}"] = round(sum(tov) / n, 2)
-            features[f"team_{prefix}_fg_pct_{window}"] = (
-                round(sum(fgm) / total_fga, 4) if total_fga else 0.0
-            )
-            features[f"team_{prefix}_fg3_pct_{window}"] = (
-                round(sum(fg3m) / total_fg3a, 4) if total_fg3a else 0.0
-            )
+            sums = {stat: sum(getattr(l, stat) for l in lines) for stat in QUARTER_STATS}
+            features.update(_quarter_window_features(sums, len(lines), prefix, window))
 
     except Exception as exc:
         logger.warning(
@@ -194,18 +228,30 @@ def compute_rolling_half_features(
     as_of_date: date,
     half: int = 1,
     windows: tuple = (5, 10),
+    store=None,
 ) -> dict:
     """
     Rolling de puntos de equipo en primera (Q1+Q2) o segunda (Q3+Q4) mitad.
-    Suma las filas Q1/Q2 o Q3/Q4 de GameTeamLine por partido.
+    Ventana sobre los partidos del equipo; promedia los que tienen puntos en la mitad.
+    Con `store` sale del pivot por partido del TeamGameLogStore; sin él, una
+    consulta de partidos por ventana y una sola de GameTeamLine para todas.
+    Ambos caminos suman las filas de cuarto de GameTeamLine (no GamePeriodLine,
+    que puede no estar sincronizada para partidos con líneas de cuarto).
     """
     features = {}
-    quarters = ("Q1", "Q2") if half == 1 else ("Q3", "Q4")
+    quarters = HALF_QUARTERS[1 if half == 1 else 2]
     prefix = f"h{half}"
 
     try:
+        if store is not None:
+            for window in windows:
+                total, n = store.half_sums(team_id, as_of_date, window, half)
+                if n:
+                    features.update(_half_window_features(total, n, prefix, window))
+            return features
+
         from django.db.models import Q as DQ
-        from core.models import GameTeamLine, Game
+        from core.models import Game, GameTeamLine
 
         game_qs = (
             Game.objects.filter(date__lt=as_of_date)
@@ -215,30 +261,33 @@ def compute_rolling_half_features(
             .order_by("-date")
         )
 
-        for window in windows:
-            recent_game_ids = list(
-                game_qs.values_list("game_id", flat=True)[:window]
+        window_ids = {
+            window: _window_rows(
+                game_qs.values_list("game_id", flat=True), window, as_of_date, date_field="date"
             )
-            if not recent_game_ids:
-                continue
-
-            pts_by_game: dict[str, int] = {gid: 0 for gid in recent_game_ids}
-            for qtr in quarters:
-                rows = GameTeamLine.objects.filter(
-                    game__game_id__in=recent_game_ids,
-                    team__team_id=team_id,
-                    period=qtr,
-                ).values("game__game_id", "pts")
-                for row in rows:
-                    gid = row["game__game_id"]
-                    pts_by_game[gid] = pts_by_game.get(gid, 0) + (row["pts"] or 0)
-
-            pts_list = [v for v in pts_by_game.values() if v > 0]
+            for window in windows
+        }
+        all_ids = set().union(*window_ids.values())
+        if not all_ids:
+            return features
+
+        # Pivot: puntos de la mitad por partido, en una sola consulta
+        pts_by_game: dict[str, int] = {}
+        for gid, pts in GameTeamLine.objects.filter(
+            game__game_id__in=all_ids,
+            team__team_id=team_id,
+            period__in=quarters,
+        ).values_list("game__game_id", "pts"):
+            pts_by_game[gid] = pts_by_game.get(gid, 0) + (pts or 0)
+
+        for window, recent_game_ids in window_ids.items():
+            pts_list = [pts_by_game.get(gid, 0) for gid in recent_game_ids]
+            pts_list = [v for v in pts_list if v > 0]
             n = len(pts_list)
             if n == 0:
                 continue
 
-            features[f"team_{prefix}_pts_avg_{window}"] = round(sum(pts_list) / n, 2)
+            features.update(_half_window_features(sum(pts_list), n, prefix, window))
 
     except Exception as exc:
         logger.warning(
@@ -17,6 +17,12 @@ def _season_from_date(as_of_date: date) -> str:
     return f"{y - 1}-{str(y)[-2:]}"
 
 
+def _season_start(as_of_date: date) -> date:
+    """Primer día (1 de octubre) de la temporada NBA a la que pertenece la fecha."""
+    y = as_of_date.year if as_of_date.month >= 10 else as_of_date.year - 1
+    return date(y, 10, 1)
+
+
 def compute_season_team_features(
     team_abb: str,
     season: str,
@@ -72,6 +78,40 @@ def compute_season_team_features(
     return features
 
 
+def _season_player_trad_features(trad) -> dict:
+    features = {}
+    if trad and trad.gp:
+        gp = trad.gp
+        features["season_pts_pg"] = round((trad.pts or 0) / gp, 2)
+        features["season_reb_pg"] = round((trad.reb or 0) / gp, 2)
+        features["season_ast_pg"] = round((trad.ast or 0) / gp, 2)
+        features["season_stl_pg"] = round((trad.stl or 0) / gp, 2)
+        features["season_blk_pg"] = round((trad.blk or 0) / gp, 2)
+        features["season_tov_pg"] = round((trad.tov or 0) / gp, 2)
+        features["season_fg_pct"] = round(trad.fg_pct or 0.0, 4)
+        features["season_fg3_pct"] = round(trad.fg3_pct or 0.0, 4)
+        features["season_ft_pct"] = round(trad.ft_pct or 0.0, 4)
+        features["season_dd2"] = trad.dd2 or 0
+        features["season_td3"] = trad.td3 or 0
+    return features
+
+
+def _season_player_adv_features(adv) -> dict:
+    features = {}
+    if adv:
+        features["season_usg_pct"] = round(adv.usg_pct or 0.0, 4)
+        features["season_ts_pct"] = round(adv.ts_pct or 0.0, 4)
+        features["season_efg_pct"] = round(adv.efg_pct or 0.0, 4)
+        features["season_off_rtg"] = round(adv.off_rating or 0.0, 2)
+        features["season_def_rtg"] = round(adv.def_rating or 0.0, 2)
+        features["season_net_rtg"] = round(adv.net_rating or 0.0, 2)
+        features["season_ast_pct"] = round(adv.ast_pct or 0.0, 4)
+        features["season_reb_pct"] = round(adv.reb_pct or 0.0, 4)
+        features["season_oreb_pct"] = round(adv.oreb_pct or 0.0, 4)
+        features["season_dreb_pct"] = round(adv.dreb_pct or 0.0, 4)
+    return features
+
+
 def compute_season_player_features(
     player_id: str,
     season: str,
@@ -90,40 +130,54 @@ def compute_season_player_features(
             season=season,
             season_type__icontains=season_type.split()[0],
         ).first()
-
-        if trad and trad.gp:
-            gp = trad.gp
-            features["season_pts_pg"] = round((trad.pts or 0) / gp, 2)
-            features["season_reb_pg"] = round((trad.reb or 0) / gp, 2)
-            features["season_ast_pg"] = round((trad.ast or 0) / gp, 2)
-            features["season_stl_pg"] = round((trad.stl or 0) / gp, 2)
-            features["season_blk_pg"] = round((trad.blk or 0) / gp, 2)
-            features["season_tov_pg"] = round((trad.tov or 0) / gp, 2)
-            features["season_fg_pct"] = round(trad.fg_pct or 0.0, 4)
-            features["season_fg3_pct"] = round(trad.fg3_pct or 0.0, 4)
-            features["season_ft_pct"] = round(trad.ft_pct or 0.0, 4)
-            features["season_dd2"] = trad.dd2 or 0
-            features["season_td3"] = trad.td3 or 0
+        features.update(_season_player_trad_features(trad))
 
         adv = PlayersGeneralAdvanced.objects.filter(
             player_id=player_id,
             season=season,
             season_type__icontains=season_type.split()[0],
         ).first()
-
-        if adv:
-            features["season_usg_pct"] = round(adv.usg_pct or 0.0, 4)
-            features["season_ts_pct"] = round(adv.ts_pct or 0.0, 4)
-            features["season_efg_pct"] = round(adv.efg_pct or 0.0, 4)
-            features["season_off_rtg"] = round(adv.off_rating or 0.0, 2)
-            features["season_def_rtg"] = round(adv.def_rating or 0.0, 2)
-            features["season_net_rtg"] = round(adv.net_rating or 0.0, 2)
-            features["season_ast_pct"] = round(adv.ast_pct or 0.0, 4)
-            features["season_reb_pct"] = round(adv.reb_pct or 0.0, 4)
-            features["season_oreb_pct"] = round(adv.oreb_pct or 0.0, 4)
-            features["season_dreb_pct"] = round(adv.dreb_pct or 0.0, 4)
+        features.update(_season_player_adv_features(adv))
 
     except Exception as exc:
         logger.warning("season player features error player=%s season=%s: %s", player_id, season, exc)
 
     return features
+
+
+def compute_season_players_features(
+    player_ids,
+    season: str,
+    season_type: str = "Regular Season",
+) -> dict:
+    """
+    compute_season_player_features para muchos jugadores: una consulta por
+    tabla. Devuelve {player_id: features} (solo jugadores con datos).
+    """
+    out: dict = {}
+    ids = sorted({int(p) for p in map(str, player_ids) if p.isdigit()})
+    if not ids:
+        return out
+    try:
+        from players.models import PlayersGeneralTraditional, PlayersGeneralAdvanced
+
+        for model, build in (
+            (PlayersGeneralTraditional, _season_player_trad_features),
+            (PlayersGeneralAdvanced, _season_player_adv_features),
+        ):
+            qs = model.objects.filter(
+                player_id__in=ids,
+                season=season,
+                season_type__icontains=season_type.split()[0],
+            )
+            # Mismo registro que .first() en la consulta por jugador
+            first = {}
+            for row in (qs if qs.ordered else qs.order_by("pk")):
+                first.setdefault(str(row.player_id), row)
+            for player_id, row in first.items():
+                out.setdefault(player_id, {}).update(build(row))
+
+    except Exception as exc:
+        logger.warning("season players features error season=%s: %s", season, exc)
+
+    return out
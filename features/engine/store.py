@@ -0,0 +1,439 @@
+"""
+Almacén columnar en memoria de game logs por equipo y por jugador.
+
+Carga GameTeamLine / GamePlayerLine + Game una sola vez por proceso en arrays NumPy
+(ordenados por fecha) con un índice de sumas acumuladas por stat: "últimos N partidos
+antes de la fecha D" es una búsqueda binaria, y la suma de cualquier ventana
+(N partidos o temporada hasta la fecha) son dos lecturas y una resta.
+El refresco es incremental: solo se leen de DB las líneas nuevas y los partidos
+que han podido cambiar desde la última carga.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+
+from features.engine.player_rolling import PLAYER_STATS
+from features.engine.rolling import HALF_QUARTERS, SEASON_TO_DATE, TEAM_STATS
+from features.engine.season import _season_start
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = getattr(settings, "FEATURES_STORE_REFRESH_SECONDS", 300)
+
+_GAME_FIELDS = ("game_id", "date", "home_team_id", "away_team_id", "home_score", "away_score")
+
+
+class GameLogBlock:
+    """
+    Bloque columnar de un equipo/jugador: fechas (ordinales) ascendentes, columnas
+    alineadas y sus sumas acumuladas (csum[c][i] = suma de las i primeras filas).
+    """
+
+    __slots__ = ("dates", "cols", "csum")
+
+    def __init__(self, dates: np.ndarray, cols: dict):
+        self.dates = dates
+        self.cols = cols
+        self.csum = {}
+        for k, v in cols.items():
+            if v.dtype.kind in "iub":
+                self.csum[k] = np.concatenate(([0], np.cumsum(v, dtype=np.int64)))
+            elif v.dtype.kind == "f":
+                self.csum[k] = np.concatenate(([0.0], np.cumsum(v)))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def bounds(self, as_of_date: date, window) -> tuple[int, int]:
+        """[start, end) de la ventana (nº de partidos o SEASON_TO_DATE) antes de as_of_date."""
+        end = int(np.searchsorted(self.dates, as_of_date.toordinal(), side="left"))
+        if window == SEASON_TO_DATE:
+            start = int(np.searchsorted(
+                self.dates, _season_start(as_of_date).toordinal(), side="left"
+            ))
+        else:
+            start = max(0, end - int(window))
+        return start, end
+
+    def before(self, as_of_date: date, n) -> dict:
+        """Columnas de los últimos `n` registros con fecha < as_of_date."""
+        start, end = self.bounds(as_of_date, n)
+        return {k: v[start:end] for k, v in self.cols.items()}
+
+    def sums(self, as_of_date: date, window, cols) -> tuple[dict, int]:
+        """(sumas de `cols`, nº de partidos) de la ventana, sin recorrerla."""
+        start, end = self.bounds(as_of_date, window)
+        csum = self.csum
+        return {c: (csum[c][end] - csum[c][start]).item() for c in cols}, end - start
+
+
+def _block(rows_idx, dates, cols) -> GameLogBlock:
+    idx = np.asarray(rows_idx, dtype=np.int64)
+    order = idx[np.argsort(dates[idx], kind="stable")]
+    return GameLogBlock(dates[order], {k: v[order] for k, v in cols.items()})
+
+
+class _GameLogStore:
+    """
+    Base de los stores: tablas maestras de partidos y líneas (por pk) en memoria,
+    carga completa y refresco incremental. Las subclases definen las líneas
+    (`line_fields`, `_line_queryset`) y cómo se construyen los bloques (`_rebuild`).
+    """
+
+    label = "game log"
+    line_fields: tuple = ()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._line_rows: dict = {}
+        self._game_rows: dict = {}
+        self._max_line_pk = 0
+        self._open_from = None
+        self.loaded_at = 0.0
+        self.version = 0
+
+    def _line_queryset(self):
+        raise NotImplementedError
+
+    def _rebuild(self):
+        raise NotImplementedError
+
+    # ── Carga ──────────────────────────────────────────────────────────────
+
+    def load(self):
+        """Carga completa desde DB."""
+        from core.models import Game
+
+        with self._lock:
+            self._game_rows = {
+                row[0]: row[1:]
+                for row in Game.objects.values_list(*_GAME_FIELDS).iterator(chunk_size=5000)
+            }
+            self._line_rows = {}
+            self._max_line_pk = 0
+            self._ingest_lines(self._line_queryset())
+            self._finish_rebuild()
+        return self
+
+    def refresh(self, game_ids=None) -> bool:
+        """
+        Refresco incremental: lee las líneas con pk mayor que la última cargada
+        y los partidos afectados o todavía abiertos. `game_ids` fuerza la relectura
+        de esos partidos y de sus líneas (p.ej. corregidos en sitio, mismo pk).
+        Si detecta borrados recarga todo. Devuelve True si hubo cambios.
+        """
+        from core.models import Game
+
+        with self._lock:
+            line_qs = self._line_queryset()
+            if line_qs.filter(pk__lte=self._max_line_pk).count() != len(self._line_rows):
+                reload = True
+            else:
+                reload = False
+                n_lines = len(self._line_rows)
+                new_game_ids = self._ingest_lines(line_qs.filter(pk__gt=self._max_line_pk))
+                changed = False
+                if game_ids:
+                    game_ids = set(game_ids)
+                    new_game_ids |= game_ids
+                    for pk, row in self._line_qs_rows(line_qs.filter(game_id__in=game_ids)):
+                        if self._line_rows.get(pk) != row:
+                            self._line_rows[pk] = row
+                            changed = True
+                game_qs = Game.objects.filter(game_id__in=new_game_ids)
+                if self._open_from is not None:
+                    game_qs = game_qs | Game.objects.filter(date__gte=self._open_from)
+                n_games = len(self._game_rows)
+                for row in game_qs.values_list(*_GAME_FIELDS):
+                    if self._game_rows.get(row[0]) != row[1:]:
+                        self._game_rows[row[0]] = row[1:]
+                        changed = True
+                if changed or n_lines != len(self._line_rows) or n_games != len(self._game_rows):
+                    self._finish_rebuild()
+                    return True
+                self.loaded_at = time.time()
+                return False
+        if reload:
+            logger.info("%s store: borrados detectados, recarga completa", self.label)
+            self.load()
+        return True
+
+    def _line_qs_rows(self, qs):
+        for row in qs.values_list("pk", *self.line_fields).iterator(chunk_size=5000):
+            yield row[0], row[1:]
+
+    def _ingest_lines(self, qs) -> set:
+        game_ids = set()
+        gid_pos = self.line_fields.index("game_id")
+        for pk, row in self._line_qs_rows(qs):
+            self._line_rows[pk] = row
+            game_ids.add(row[gid_pos])
+            if pk > self._max_line_pk:
+                self._max_line_pk = pk
+        return game_ids
+
+    def _finish_rebuild(self):
+        self._rebuild()
+        dated = [g for g in self._game_rows.values() if g[0] is not None]
+        open_dates = [g[0] for g in dated if g[3] is None]
+        self._open_from = min(open_dates) if open_dates else max(
+            (g[0] for g in dated), default=None
+        )
+        self.loaded_at = time.time()
+        self.version += 1
+        logger.debug(
+            "%s store v%s: %s partidos, %s líneas",
+            self.label, self.version, len(self._game_rows), len(self._line_rows),
+        )
+
+
+class TeamGameLogStore(_GameLogStore):
+    """
+    Game logs por equipo en memoria.
+
+    - lines(team, period): GameTeamLine del equipo en ese periodo (ALL, Q1..Q4)
+      con las stats de TEAM_STATS y los puntos del rival (de Game).
+    - results(team): partidos del equipo con resultado (home_score no nulo).
+    - schedule(team): todos los partidos del equipo con fecha, con el pivot de
+      puntos por mitad (h1_pts/h2_pts, y h1_pos/h2_pos si son > 0).
+    """
+
+    label = "team"
+    line_fields = ("team_id", "period", "game_id", *TEAM_STATS)
+
+    def __init__(self):
+        super().__init__()
+        self._lines: dict = {}
+        self._results: dict = {}
+        self._schedule: dict = {}
+
+    def _line_queryset(self):
+        from core.models import GameTeamLine
+        return GameTeamLine.objects.all()
+
+    def _rebuild(self):
+        """Reconstruye los bloques por equipo desde las tablas maestras en memoria."""
+        games = self._game_rows
+
+        # Pivot de puntos por mitad (Q1+Q2, Q3+Q4) por (equipo, partido)
+        half_of = {q: i for i, quarters in enumerate(HALF_QUARTERS.values()) for q in quarters}
+        pts_pos = TEAM_STATS.index("pts")
+        half_pts = defaultdict(lambda: [0, 0])
+        for team_id, period, gid, *stats in self._line_rows.values():
+            if period in half_of:
+                half_pts[(team_id, gid)][half_of[period]] += stats[pts_pos] or 0
+
+        # Partidos por equipo
+        g_ids, g_dates, g_pts, g_opp, g_won, g_scored, g_home = [], [], [], [], [], [], []
+        g_halves = []
+        by_team = defaultdict(list)
+        for gid, (gdate, home_id, away_id, hs, as_) in games.items():
+            if gdate is None:
+                continue
+            for team_id, is_home in ((home_id, True), (away_id, False)):
+                if team_id is None or (not is_home and away_id == home_id):
+                    continue
+                own, opp = (hs, as_) if is_home else (as_, hs)
+                by_team[team_id].append(len(g_ids))
+                g_ids.append(gid)
+                g_dates.append(gdate.toordinal())
+                g_pts.append(own or 0)
+                g_opp.append(opp or 0)
+                g_won.append((own or 0) > (opp or 0))
+                g_scored.append(hs is not None)
+                g_home.append(is_home)
+                g_halves.append(half_pts.get((team_id, gid), (0, 0)))
+        g_dates = np.asarray(g_dates, dtype=np.int64)
+        g_cols = {
+            "game_id": np.asarray(g_ids, dtype=object),
+            "pts": np.asarray(g_pts, dtype=np.int64),
+            "opp_pts": np.asarray(g_opp, dtype=np.int64),
+            "won": np.asarray(g_won, dtype=bool),
+            "is_home": np.asarray(g_home, dtype=bool),
+        }
+        halves = np.asarray(g_halves, dtype=np.int64).reshape(-1, 2)
+        for i in range(2):
+            g_cols[f"h{i + 1}_pts"] = halves[:, i]
+            g_cols[f"h{i + 1}_pos"] = halves[:, i] > 0
+        scored = np.asarray(g_scored, dtype=bool)
+        schedule, results = {}, {}
+        for team_id, idx in by_team.items():
+            idx = np.asarray(idx, dtype=np.int64)
+            schedule[team_id] = _block(idx, g_dates, g_cols)
+            results[team_id] = _block(idx[scored[idx]], g_dates, g_cols)
+
+        # Líneas por (equipo, periodo)
+        l_dates, l_opp, l_gids, l_stats = [], [], [], []
+        by_key = defaultdict(list)
+        for team_id, period, gid, *stats in self._line_rows.values():
+            game = games.get(gid)
+            if game is None or game[0] is None:
+                continue
+            gdate, home_id, _, hs, as_ = game
+            by_key[(team_id, period)].append(len(l_dates))
+            l_dates.append(gdate.toordinal())
+            l_opp.append((as_ if home_id == team_id else hs) or 0)
+            l_gids.append(gid)
+            l_stats.append(stats)
+        l_dates = np.asarray(l_dates, dtype=np.int64)
+        stats_arr = np.asarray(l_stats, dtype=np.int64).reshape(-1, len(TEAM_STATS))
+        l_cols = {name: stats_arr[:, i] for i, name in enumerate(TEAM_STATS)}
+        l_cols["opp_pts"] = np.asarray(l_opp, dtype=np.int64)
+        l_cols["game_id"] = np.asarray(l_gids, dtype=object)
+        lines = {key: _block(idx, l_dates, l_cols) for key, idx in by_key.items()}
+
+        self._lines, self._results, self._schedule = lines, results, schedule
+
+    # ── Consultas ──────────────────────────────────────────────────────────
+
+    def lines(self, team_id: str, as_of_date: date, n, period: str = "ALL") -> dict:
+        """Últimas `n` GameTeamLine del equipo (periodo dado) antes de as_of_date."""
+        block = self._lines.get((str(team_id), period))
+        return block.before(as_of_date, n) if block is not None else {}
+
+    def line_sums(self, team_id: str, as_of_date: date, window, cols,
+                  period: str = "ALL") -> tuple[dict, int]:
+        """Sumas de `cols` de las GameTeamLine de la ventana antes de as_of_date."""
+        block = self._lines.get((str(team_id), period))
+        return block.sums(as_of_date, window, cols) if block is not None else ({}, 0)
+
+    def results(self, team_id: str, as_of_date: date, n) -> dict:
+        """Últimos `n` partidos con resultado del equipo antes de as_of_date."""
+        block = self._results.get(str(team_id))
+        return block.before(as_of_date, n) if block is not None else {}
+
+    def result_sums(self, team_id: str, as_of_date: date, window,
+                    cols=("won",)) -> tuple[dict, int]:
+        """Sumas de `cols` (won, pts, opp_pts) de los partidos con resultado de la ventana."""
+        block = self._results.get(str(team_id))
+        return block.sums(as_of_date, window, cols) if block is not None else ({}, 0)
+
+    def schedule(self, team_id: str, as_of_date: date, n) -> dict:
+        """Últimos `n` partidos (con o sin resultado) del equipo antes de as_of_date."""
+        block = self._schedule.get(str(team_id))
+        return block.before(as_of_date, n) if block is not None else {}
+
+    def half_sums(self, team_id: str, as_of_date: date, window, half: int) -> tuple[int, int]:
+        """
+        (puntos, nº de partidos con puntos) de la mitad `half` en los partidos de la
+        ventana antes de as_of_date; los partidos sin líneas de cuarto no cuentan.
+        """
+        block = self._schedule.get(str(team_id))
+        if block is None:
+            return 0, 0
+        sums, _ = block.sums(as_of_date, window, (f"h{half}_pts", f"h{half}_pos"))
+        return sums[f"h{half}_pts"], sums[f"h{half}_pos"]
+
+    def team_ids(self) -> set:
+        """Equipos con algún partido con fecha."""
+        return set(self._schedule)
+
+    def activity_dates(self, team_id: str) -> np.ndarray:
+        """
+        Fechas (ordinales, ascendentes) en las que cambia el estado rolling del
+        equipo: días con GameTeamLine (cualquier periodo), con resultado o con
+        partido en calendario (las ventanas de mitades cuentan partidos).
+        """
+        team_id = str(team_id)
+        blocks = [b for (t, _), b in self._lines.items() if t == team_id]
+        for by_team in (self._results, self._schedule):
+            if team_id in by_team:
+                blocks.append(by_team[team_id])
+        if not blocks:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([b.dates for b in blocks]))
+
+
+class PlayerGameLogStore(_GameLogStore):
+    """
+    Game logs por jugador en memoria: GamePlayerLine (periodo ALL) con las stats
+    de PLAYER_STATS y los minutos jugados (`min`, nulo → 0).
+    """
+
+    label = "player"
+    line_fields = ("player_id", "game_id", "min_played", *PLAYER_STATS)
+
+    def __init__(self):
+        super().__init__()
+        self._lines: dict = {}
+
+    def _line_queryset(self):
+        from core.models import GamePlayerLine
+        return GamePlayerLine.objects.filter(period="ALL", player__isnull=False)
+
+    def _rebuild(self):
+        """Reconstruye los bloques por jugador desde las tablas maestras en memoria."""
+        games = self._game_rows
+        dates, mins, gids, stats_rows = [], [], [], []
+        by_player = defaultdict(list)
+        for player_id, gid, min_played, *stats in self._line_rows.values():
+            game = games.get(gid)
+            if game is None or game[0] is None:
+                continue
+            by_player[player_id].append(len(dates))
+            dates.append(game[0].toordinal())
+            mins.append(float(min_played or 0))
+            gids.append(gid)
+            stats_rows.append(stats)
+        dates = np.asarray(dates, dtype=np.int64)
+        stats_arr = np.asarray(stats_rows, dtype=np.int64).reshape(-1, len(PLAYER_STATS))
+        cols = {name: stats_arr[:, i] for i, name in enumerate(PLAYER_STATS)}
+        cols["min"] = np.asarray(mins, dtype=np.float64)
+        cols["game_id"] = np.asarray(gids, dtype=object)
+        self._lines = {pid: _block(idx, dates, cols) for pid, idx in by_player.items()}
+
+    def lines(self, player_id: str, as_of_date: date, n) -> dict:
+        """Últimas `n` líneas del jugador antes de as_of_date."""
+        block = self._lines.get(str(player_id))
+        return block.before(as_of_date, n) if block is not None else {}
+
+    def line_sums(self, player_id: str, as_of_date: date, window, cols) -> tuple[dict, int]:
+        """Sumas de `cols` de las líneas del jugador en la ventana antes de as_of_date."""
+        block = self._lines.get(str(player_id))
+        return block.sums(as_of_date, window, cols) if block is not None else ({}, 0)
+
+
+_stores: dict = {}
+_store_lock = threading.Lock()
+
+
+def _get_store(cls, max_age: float = None):
+    if max_age is None:
+        max_age = REFRESH_SECONDS
+    with _store_lock:
+        store = _stores.get(cls)
+        if store is None:
+            store = _stores[cls] = cls().load()
+            return store
+    if time.time() - store.loaded_at > max_age:
+        try:
+            store.refresh()
+        except Exception as exc:
+            logger.warning("%s store refresh error: %s", store.label, exc)
+    return store
+
+
+def get_team_store(max_age: float = None) -> TeamGameLogStore:
+    """
+    Devuelve el store de equipos del proceso, cargándolo la primera vez.
+    Si han pasado más de `max_age` segundos (FEATURES_STORE_REFRESH_SECONDS) desde
+    la última comprobación, aplica un refresco incremental.
+    """
+    return _get_store(TeamGameLogStore, max_age)
+
+
+def get_player_store(max_age: float = None) -> PlayerGameLogStore:
+    """Como get_team_store, para los game logs de jugadores."""
+    return _get_store(PlayerGameLogStore, max_age)
+
+
+def refresh_team_store(game_ids=None) -> None:
+    """Refresca los stores de proceso ya cargados (p.ej. tras sync_normalized)."""
+    for store in list(_stores.values()):
+        store.refresh(game_ids=game_ids)
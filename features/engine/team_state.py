@@ -0,0 +1,138 @@
+"""
+Estados diarios materializados por equipo (TeamDailyState).
+
+Una fila por (equipo, fecha con partido) con el estado rolling tras los partidos
+de ese día: bloque "team" (rolling ALL + win%), un bloque por cuarto (Q1..Q4) y
+uno por mitad (H1, H2), con las mismas ventanas que el cálculo por partido. El estado pre-partido de un
+equipo en una fecha es la última fila anterior a esa fecha, así que un matchup
+se arma con dos lecturas indexadas más el H2H.
+
+Se construye desde el TeamGameLogStore en una pasada cronológica por equipo y se
+amplía de forma incremental (por defecto desde la última fila de cada equipo);
+solo se escriben las filas cuyo contenido cambió.
+"""
+
+import logging
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+STATE_PERIODS = ("Q1", "Q2", "Q3", "Q4")
+
+
+def compute_team_state(team_id: str, as_of_date: date, store) -> dict:
+    """Bloques de estado de un equipo con los partidos anteriores a as_of_date."""
+    from features.engine.rolling import (
+        compute_rolling_half_features,
+        compute_rolling_quarter_features,
+        compute_rolling_team_features,
+        compute_win_pct_features,
+    )
+
+    team = compute_rolling_team_features(team_id, as_of_date, store=store)
+    team.update(compute_win_pct_features(team_id, as_of_date, store=store))
+    state = {"team": team}
+    for quarter in STATE_PERIODS:
+        state[quarter] = compute_rolling_quarter_features(
+            team_id, as_of_date, quarter=quarter, store=store
+        )
+    for half in (1, 2):
+        state[f"H{half}"] = compute_rolling_half_features(
+            team_id, as_of_date, half=half, store=store
+        )
+    return state
+
+
+def build_team_daily_states(since: date | None = None, full: bool = False,
+                            team_ids=None, batch_size: int = 1000) -> dict:
+    """
+    Calcula y guarda los TeamDailyState.
+    - full: todas las fechas de todos los equipos.
+    - since: fechas >= since (tras corregir partidos ya sincronizados).
+    - por defecto: desde la última fila guardada de cada equipo (incremental).
+    Borra las filas del tramo recalculado cuya fecha ya no tiene partidos e
+    invalida la caché de matchups de los equipos con cambios.
+    Devuelve {"written", "skipped", "deleted", "teams"}.
+    """
+    from django.db.models import Max
+    from features.engine.base import features_hash
+    from features.engine.season import _season_from_date
+    from features.engine.store import get_team_store
+    from features.models import TeamDailyState
+
+    store = get_team_store(max_age=0)
+    teams = sorted(store.team_ids() if team_ids is None else {str(t) for t in team_ids})
+
+    last_stored = {}
+    if not full and since is None:
+        last_stored = dict(
+            TeamDailyState.objects.filter(team_id__in=teams)
+            .values("team_id").annotate(last=Max("date")).values_list("team_id", "last")
+        )
+
+    written = skipped = deleted = 0
+    changed_teams = set()
+    for team_id in teams:
+        start = None if full else (since or last_stored.get(team_id))
+        ordinals = store.activity_dates(team_id)
+        dates = [date.fromordinal(int(o)) for o in ordinals]
+        if start is not None:
+            dates = [d for d in dates if d >= start]
+
+        existing_qs = TeamDailyState.objects.filter(team_id=team_id)
+        if start is not None:
+            existing_qs = existing_qs.filter(date__gte=start)
+        existing = dict(existing_qs.values_list("date", "content_hash"))
+
+        stale = set(existing) - set(dates)
+        if stale:
+            deleted += TeamDailyState.objects.filter(team_id=team_id, date__in=stale).delete()[0]
+            changed_teams.add(team_id)
+
+        changed = []
+        for day in dates:
+            # Estado tras los partidos de `day` = estado pre-partido del día siguiente
+            state = compute_team_state(team_id, day + timedelta(days=1), store)
+            digest = features_hash(state)
+            if existing.get(day) == digest:
+                skipped += 1
+                continue
+            changed.append(TeamDailyState(
+                team_id=team_id, date=day, season=_season_from_date(day),
+                features=state, content_hash=digest,
+            ))
+
+        if changed:
+            TeamDailyState.objects.bulk_create(
+                changed,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["team_id", "date"],
+                update_fields=["season", "features", "content_hash", "updated_at"],
+            )
+            written += len(changed)
+            changed_teams.add(team_id)
+
+    if changed_teams:
+        from features.engine.matchup_cache import invalidate_teams
+        invalidate_teams(changed_teams)
+
+    return {
+        "written": written, "skipped": skipped, "deleted": deleted,
+        "teams": sorted(changed_teams),
+    }
+
+
+def get_team_state(team_id: str, as_of_date: date) -> dict | None:
+    """
+    Estado pre-partido del equipo en as_of_date (última fila anterior), o None
+    si no hay ninguna.
+    """
+    from features.models import TeamDailyState
+
+    return (
+        TeamDailyState.objects.filter(team_id=str(team_id), date__lt=as_of_date)
+        .order_by("-date")
+        .values_list("features", flat=True)
+        .first()
+    )
@@ -0,0 +1,319 @@
+"""
+Motor vectorizado de features para backfill de temporadas completas.
+
+Carga una sola vez partidos y líneas de equipo en DataFrames de pandas, calcula
+las ventanas rolling con sumas acumuladas por grupo y las alinea con cada partido
+objetivo mediante merge_asof (estrictamente antes de la fecha del partido).
+La aritmética final (promedios, redondeos, diferenciales, extras de mercado) es la
+misma que usa compute_features_for_matchup, por lo que la salida coincide clave a clave.
+"""
+
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from features.engine.h2h import _h2h_features
+from features.engine.matchup import QUARTER_MARKETS, assemble_matchup_features
+from features.engine.ratings import compute_all_rating_features, get_rating_indexes
+from features.engine.rolling import (
+    HALF_QUARTERS,
+    QUARTER_STATS,
+    TEAM_STATS,
+    _half_window_features,
+    _quarter_window_features,
+    _team_window_features,
+    _win_pct_features,
+)
+from features.engine.season import _season_from_date, compute_season_team_features
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = (5, 10)
+H2H_LAST_N = 10
+# Mercado → bloque de ventanas de periodo que añade a la base
+PERIOD_BLOCKS = {"first_half": "h1", "second_half": "h2", **{q: q.upper() for q in QUARTER_MARKETS}}
+
+
+def _rolling_asof(targets: pd.DataFrame, events: pd.DataFrame, cols, windows) -> dict:
+    """
+    Para cada fila de `targets` (key, date) devuelve las sumas de `cols` sobre las
+    últimas w filas de `events` con la misma key y fecha < date, más su recuento `n_{w}`.
+    Resultado: dict columna → array alineado con `targets`.
+    """
+    cols = list(cols)
+    if events.empty:
+        nan = np.full(len(targets), np.nan)
+        return {
+            **{f"{c}_{w}": nan for c in cols for w in windows},
+            **{f"n_{w}": nan for w in windows},
+        }
+    events = events.sort_values(["key", "date"], kind="stable").reset_index(drop=True)
+    grouped = events.groupby("key", sort=False)
+    position = grouped.cumcount().to_numpy()
+    csum = grouped[cols].cumsum()
+
+    rolled = events[["key", "date"]].copy()
+    for w in windows:
+        prev = csum.groupby(events["key"], sort=False).shift(w, fill_value=0)
+        window_sums = csum - prev
+        for c in cols:
+            rolled[f"{c}_{w}"] = window_sums[c].to_numpy()
+        rolled[f"n_{w}"] = np.minimum(position + 1, w)
+
+    merged = pd.merge_asof(
+        targets.sort_values("date", kind="stable"),
+        rolled.sort_values("date", kind="stable"),
+        on="date",
+        by="key",
+        allow_exact_matches=False,
+        direction="backward",
+    ).sort_values("row")
+    return {
+        c: merged[c].to_numpy()
+        for c in merged.columns if c not in ("key", "date", "row")
+    }
+
+
+def _window_parts(arrays: dict, i: int, cols, windows, make) -> dict:
+    """Aplica `make(sums, n, w)` a cada ventana con datos de la fila i."""
+    features = {}
+    for w in windows:
+        n = arrays[f"n_{w}"][i]
+        if n != n or n == 0:  # NaN: sin partidos previos
+            continue
+        sums = {c: int(arrays[f"{c}_{w}"][i]) for c in cols}
+        features.update(make(sums, int(n), w))
+    return features
+
+
+def _load_frames(max_ordinal: int, periods):
+    """Partidos y líneas de equipo (de los periodos pedidos) anteriores a max_ordinal."""
+    from core.models import Game, GameTeamLine
+
+    games = pd.DataFrame.from_records(
+        Game.objects.exclude(date__isnull=True).values_list(
+            "game_id", "date", "home_team_id", "away_team_id",
+            "home_score", "away_score",
+        ),
+        columns=["game_id", "date", "home", "away", "home_score", "away_score"],
+    )
+    if games.empty:
+        return games, pd.DataFrame(columns=["team", "period", "game_id", *TEAM_STATS])
+    games["date"] = games["date"].map(date.toordinal)
+    games = games[games["date"] < max_ordinal]
+
+    lines = pd.DataFrame.from_records(
+        GameTeamLine.objects.filter(
+            period__in=periods, game__date__isnull=False,
+        ).values_list("team_id", "period", "game_id", *TEAM_STATS),
+        columns=["team", "period", "game_id", *TEAM_STATS],
+    )
+    lines = lines.merge(
+        games[["game_id", "date", "home", "home_score", "away_score"]],
+        on="game_id", how="inner",
+    )
+    is_home = lines["home"] == lines["team"]
+    lines["opp_pts"] = (
+        lines["away_score"].where(is_home, lines["home_score"]).fillna(0).astype(np.int64)
+    )
+    return games, lines
+
+
+def _team_games(games: pd.DataFrame) -> pd.DataFrame:
+    """Una fila por (partido, equipo) con puntos propios/rival y victoria."""
+    home = pd.DataFrame({
+        "game_id": games["game_id"], "date": games["date"], "key": games["home"],
+        "own": games["home_score"], "opp": games["away_score"],
+        "scored": games["home_score"].notna(),
+    })
+    away = pd.DataFrame({
+        "game_id": games["game_id"], "date": games["date"], "key": games["away"],
+        "own": games["away_score"], "opp": games["home_score"],
+        "scored": games["home_score"].notna(),
+    })
+    away = away[games["away"] != games["home"]]
+    both = pd.concat([home, away], ignore_index=True)
+    both = both[both["key"].notna()]
+    both["won"] = (
+        both["own"].fillna(0).astype(np.int64) > both["opp"].fillna(0).astype(np.int64)
+    ).astype(np.int64)
+    return both
+
+
+def compute_features_vectorized(games, market: str = "base") -> list:
+    """
+    Calcula el vector de features de `market` para todos los `games` (core.Game
+    con home_team/away_team) de una vez. Devuelve [(game, features), ...] con la
+    misma salida que compute_features_for_matchup partido a partido.
+    """
+    return [
+        (game, by_market[market])
+        for game, by_market in compute_features_vectorized_markets(games, [market])
+    ]
+
+
+def compute_features_vectorized_markets(games, markets=("base",)) -> list:
+    """
+    Versión multi-mercado: el bloque común (rolling, win%, season-level, H2H) se
+    calcula una vez y las ventanas de cuartos/mitades solo para los mercados que
+    las usan. Devuelve [(game, {market: features}), ...].
+    """
+    from core.models import Team
+
+    games = list(games)
+    if not games:
+        return []
+
+    today = date.today()
+    as_of = [g.date or today for g in games]
+    targets = pd.DataFrame({
+        "row": np.arange(len(games)),
+        "date": [d.toordinal() for d in as_of],
+        "home": [g.home_team_id for g in games],
+        "away": [g.away_team_id for g in games],
+    })
+
+    quarters = [m.upper() for m in markets if m in QUARTER_MARKETS]
+    halves = [h for m, h in (("first_half", 1), ("second_half", 2)) if m in markets]
+    periods = ["ALL", *quarters]
+    for half in halves:
+        periods.extend(q for q in HALF_QUARTERS[half] if q not in periods)
+
+    all_games, lines = _load_frames(int(targets["date"].max()), periods)
+    team_games = _team_games(all_games)
+    all_lines = lines[lines["period"] == "ALL"].rename(columns={"team": "key"})
+    results = team_games[team_games["scored"]]
+
+    # Bloques por lado: rolling ALL, win% y, según mercados, cuartos y mitades
+    side_arrays = {}
+    for side in ("home", "away"):
+        side_targets = targets[["row", "date", side]].rename(columns={side: "key"})
+        arrays = {
+            "all": _rolling_asof(side_targets, all_lines, TEAM_STATS + ("opp_pts",), WINDOWS),
+            "win": _rolling_asof(side_targets, results, ("won",), WINDOWS),
+        }
+        for quarter in quarters:
+            q_lines = lines[lines["period"] == quarter].rename(columns={"team": "key"})
+            arrays[quarter] = _rolling_asof(side_targets, q_lines, QUARTER_STATS, WINDOWS)
+        for half in halves:
+            half_pts = (
+                lines[lines["period"].isin(HALF_QUARTERS[half])]
+                .groupby(["game_id", "team"], as_index=False)["pts"].sum()
+                .rename(columns={"team": "key"})
+            )
+            schedule = team_games[["game_id", "date", "key"]].merge(
+                half_pts, on=["game_id", "key"], how="left"
+            )
+            schedule["pts"] = schedule["pts"].fillna(0).astype(np.int64)
+            schedule["pos"] = (schedule["pts"] > 0).astype(np.int64)
+            arrays[f"h{half}"] = _rolling_asof(side_targets, schedule, ("pts", "pos"), WINDOWS)
+        side_arrays[side] = arrays
+
+    # H2H: clave de pareja no ordenada, orientada al equipo "a" (menor id)
+    scored = all_games[all_games["home_score"].notna() & all_games["away_score"].notna()]
+    scored = scored[scored["home"].notna() & scored["away"].notna()]
+    a_is_home = scored["home"] <= scored["away"]
+    h2h_events = pd.DataFrame({
+        "date": scored["date"],
+        "key": np.where(
+            a_is_home, scored["home"] + "|" + scored["away"], scored["away"] + "|" + scored["home"]
+        ),
+        "a_pts": scored["home_score"].where(a_is_home, scored["away_score"]).astype(np.int64),
+        "b_pts": scored["away_score"].where(a_is_home, scored["home_score"]).astype(np.int64),
+    })
+    h2h_events["a_win"] = (h2h_events["a_pts"] > h2h_events["b_pts"]).astype(np.int64)
+    h2h_events["b_win"] = (h2h_events["b_pts"] > h2h_events["a_pts"]).astype(np.int64)
+    home_is_a = (targets["home"] <= targets["away"]).to_numpy()
+    h2h_targets = pd.DataFrame({
+        "row": targets["row"],
+        "date": targets["date"],
+        "key": np.where(
+            home_is_a, targets["home"] + "|" + targets["away"], targets["away"] + "|" + targets["home"]
+        ),
+    })
+    h2h = _rolling_asof(
+        h2h_targets, h2h_events, ("a_pts", "b_pts", "a_win", "b_win"), (H2H_LAST_N,)
+    )
+
+    # Ratings pre-partido: búsqueda binaria en el índice de cada sistema
+    rating_indexes = get_rating_indexes()
+
+    # Season-level: una consulta por (equipo, temporada, tipo) en lugar de por partido
+    abbreviations = dict(Team.objects.values_list("team_id", "abbreviation"))
+    season_cache = {}
+
+    def season_features(team_id, season, season_type):
+        abb = abbreviations.get(team_id)
+        if not abb:
+            return None
+        cache_key = (abb, season, season_type)
+        if cache_key not in season_cache:
+            season_cache[cache_key] = compute_season_team_features(abb, season, season_type)
+        return season_cache[cache_key]
+
+    out = []
+    for i, game in enumerate(games):
+        team_parts = {}
+        period_parts = {}
+        for side in ("home", "away"):
+            arrays = side_arrays[side]
+            part = _window_parts(
+                arrays["all"], i, TEAM_STATS + ("opp_pts",), WINDOWS, _team_window_features
+            )
+            part.update(_window_parts(
+                arrays["win"], i, ("won",), WINDOWS,
+                lambda s, n, w: _win_pct_features(s["won"], n, w),
+            ))
+            team_parts[side] = part
+            for quarter in quarters:
+                prefix = quarter.lower()
+                period_parts.setdefault(quarter, {})[side] = _window_parts(
+                    arrays[quarter], i, QUARTER_STATS, WINDOWS,
+                    lambda s, n, w: _quarter_window_features(s, n, prefix, w),
+                )
+            for half in halves:
+                period_parts.setdefault(f"h{half}", {})[side] = _window_parts(
+                    arrays[f"h{half}"], i, ("pts", "pos"), WINDOWS,
+                    lambda s, n, w: (
+                        _half_window_features(s["pts"], s["pos"], f"h{half}", w)
+                        if s["pos"] else {}
+                    ),
+                )
+
+        season = game.season or _season_from_date(as_of[i])
+        season_type = game.season_type or "Regular Season"
+        season_parts = {}
+        for side, team_id in (("home", game.home_team_id), ("away", game.away_team_id)):
+            feats = season_features(team_id, season, season_type)
+            if feats is not None:
+                season_parts[side] = feats
+
+        n = h2h[f"n_{H2H_LAST_N}"][i]
+        h2h_feats = {}
+        if n == n and n > 0:
+            a_pts, b_pts = int(h2h[f"a_pts_{H2H_LAST_N}"][i]), int(h2h[f"b_pts_{H2H_LAST_N}"][i])
+            a_win, b_win = int(h2h[f"a_win_{H2H_LAST_N}"][i]), int(h2h[f"b_win_{H2H_LAST_N}"][i])
+            if home_is_a[i]:
+                h2h_feats = _h2h_features(int(n), a_win, a_pts, b_pts)
+            else:
+                h2h_feats = _h2h_features(int(n), b_win, b_pts, a_pts)
+
+        ratings = compute_all_rating_features(
+            game.home_team_id, game.away_team_id, as_of[i], indexes=rating_indexes
+        )
+
+        by_market = {}
+        for market in markets:
+            period_features = {
+                f"{side}_{k}": v
+                for side, feats in period_parts.get(PERIOD_BLOCKS.get(market), {}).items()
+                for k, v in feats.items()
+            }
+            by_market[market] = assemble_matchup_features(
+                market, team_parts, season_parts, h2h_feats, period_features, ratings
+            )
+        out.append((game, by_market))
+
+    return out
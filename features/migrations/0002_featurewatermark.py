@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('market', models.CharField(max_length=32, verbose_name='Mercado')),
+                ('season_type', models.CharField(blank=True, max_length=20, verbose_name='SEASON_TYPE')),
+                ('last_game_date', models.DateField(blank=True, null=True, verbose_name='Último partido con fecha')),
+                ('line_max_pk', models.BigIntegerField(default=0, verbose_name='Máx. pk GameTeamLine')),
+                ('line_count', models.IntegerField(default=0, verbose_name='Nº GameTeamLine')),
+                ('game_digests', models.JSONField(default=dict, verbose_name='Huella por partido (game_id → hash)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Feature watermark',
+                'verbose_name_plural': 'Feature watermarks',
+                'ordering': ['market', 'season_type'],
+                'unique_together': {('market', 'season_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0002_featurewatermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamefeatureset',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Hash del contenido de features'),
+        ),
+    ]
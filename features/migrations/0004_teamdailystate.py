@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0003_gamefeatureset_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamDailyState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_id', models.CharField(max_length=20, verbose_name='TEAM_ID')),
+                ('date', models.DateField(verbose_name='Fecha del partido')),
+                ('season', models.CharField(blank=True, max_length=10, verbose_name='SEASON')),
+                ('features', models.JSONField(default=dict, verbose_name='Estado por bloque (team, Q1..Q4)')),
+                ('content_hash', models.CharField(blank=True, max_length=32, verbose_name='Hash del contenido')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Team daily state',
+                'verbose_name_plural': 'Team daily states',
+                'ordering': ['team_id', '-date'],
+                'unique_together': {('team_id', 'date')},
+            },
+        ),
+    ]
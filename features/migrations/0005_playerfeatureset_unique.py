@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0004_teamdailystate'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='playerfeatureset',
+            unique_together={('player_id', 'as_of_date', 'context')},
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0005_playerfeatureset_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('system', models.CharField(max_length=16, verbose_name='Sistema de rating')),
+                ('team_id', models.CharField(max_length=20, verbose_name='TEAM_ID')),
+                ('game_id', models.CharField(max_length=20, verbose_name='GAME_ID')),
+                ('date', models.DateField(verbose_name='Fecha del partido')),
+                ('season', models.CharField(blank=True, max_length=10, verbose_name='SEASON')),
+                ('home_away', models.CharField(blank=True, max_length=10, verbose_name='Home/Away')),
+                ('points', models.IntegerField(default=0, verbose_name='Puntos a favor')),
+                ('opp_points', models.IntegerField(default=0, verbose_name='Puntos en contra')),
+                ('rating_pre', models.FloatField(verbose_name='Rating pre-partido')),
+                ('rating_post', models.FloatField(verbose_name='Rating post-partido')),
+                ('win_prob', models.FloatField(verbose_name='Prob. victoria pre-partido')),
+            ],
+            options={
+                'verbose_name': 'Team rating',
+                'verbose_name_plural': 'Team ratings',
+                'ordering': ['system', 'team_id', '-date'],
+                'indexes': [models.Index(fields=['system', 'team_id', 'date'], name='features_te_system_47b208_idx')],
+                'unique_together': {('system', 'team_id', 'game_id')},
+            },
+        ),
+    ]
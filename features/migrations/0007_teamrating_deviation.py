@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('features', '0006_teamrating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teamrating',
+            name='deviation_post',
+            field=models.FloatField(blank=True, null=True, verbose_name='Desviación post-partido (RD/σ)'),
+        ),
+        migrations.AddField(
+            model_name='teamrating',
+            name='deviation_pre',
+            field=models.FloatField(blank=True, null=True, verbose_name='Desviación pre-partido (RD/σ)'),
+        ),
+        migrations.AddField(
+            model_name='teamrating',
+            name='volatility',
+            field=models.FloatField(blank=True, null=True, verbose_name='Volatilidad post-partido (Glicko-2)'),
+        ),
+    ]
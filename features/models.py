@@ -20,6 +20,7 @@ class GameFeatureSet(models.Model):
         db_index=True,
     )
     features = models.JSONField("Features (dict)", default=dict)
+    content_hash = models.CharField("Hash del contenido de features", max_length=32, blank=True)
     computed_at = models.DateTimeField("Fecha de cómputo", auto_now=True)
     season = models.CharField("SEASON", max_length=10, blank=True, db_index=True)
     season_type = models.CharField("SEASON_TYPE", max_length=20, blank=True, db_index=True)
@@ -41,6 +42,7 @@ class GameFeatureSet(models.Model):
 class PlayerFeatureSet(models.Model):
     """
     Features agregadas por jugador (rolling, matchup) hasta una fecha.
+    Las escribe en bloque features.engine.player_batch (compute_player_features).
     """
 
     player_id = models.CharField("PLAYER_ID", max_length=40, db_index=True)
@@ -58,6 +60,7 @@ class PlayerFeatureSet(models.Model):
         verbose_name = "Player feature set"
         verbose_name_plural = "Player feature sets"
         ordering = ["-as_of_date", "player_id"]
+        unique_together = [["player_id", "as_of_date", "context"]]
         indexes = [
             models.Index(fields=["player_id", "as_of_date"]),
             models.Index(fields=["season", "context"]),
@@ -65,3 +68,90 @@ class PlayerFeatureSet(models.Model):
 
     def __str__(self):
         return f"{self.player_id} @ {self.as_of_date} ({self.context})"
+
+
+class TeamDailyState(models.Model):
+    """
+    Estado rolling de un equipo tras sus partidos de `date` (rolling, win%,
+    cuartos y mitades para todas las ventanas). Es el estado pre-partido de cualquier
+    fecha posterior hasta su siguiente partido.
+    Lo mantiene features.engine.team_state (sync_normalized / build_team_states).
+    """
+
+    team_id = models.CharField("TEAM_ID", max_length=20)
+    date = models.DateField("Fecha del partido")
+    season = models.CharField("SEASON", max_length=10, blank=True)
+    features = models.JSONField("Estado por bloque (team, Q1..Q4)", default=dict)
+    content_hash = models.CharField("Hash del contenido", max_length=32, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Team daily state"
+        verbose_name_plural = "Team daily states"
+        ordering = ["team_id", "-date"]
+        unique_together = [["team_id", "date"]]
+
+    def __str__(self):
+        return f"{self.team_id} @ {self.date}"
+
+
+class TeamRating(models.Model):
+    """
+    Rating de un equipo en un partido para un sistema de rating (elo, glicko2,
+    trueskill): el previo al partido, el posterior, su desviación (RD de Glicko-2,
+    σ de TrueSkill) y la probabilidad de victoria pre-partido. Como un equipo
+    juega como mucho un partido por día, es también la foto por fecha.
+    Lo mantiene features.engine.ratings (sync_normalized / build_ratings).
+    """
+
+    system = models.CharField("Sistema de rating", max_length=16)
+    team_id = models.CharField("TEAM_ID", max_length=20)
+    game_id = models.CharField("GAME_ID", max_length=20)
+    date = models.DateField("Fecha del partido")
+    season = models.CharField("SEASON", max_length=10, blank=True)
+    home_away = models.CharField("Home/Away", max_length=10, blank=True)
+    points = models.IntegerField("Puntos a favor", default=0)
+    opp_points = models.IntegerField("Puntos en contra", default=0)
+    rating_pre = models.FloatField("Rating pre-partido")
+    rating_post = models.FloatField("Rating post-partido")
+    deviation_pre = models.FloatField("Desviación pre-partido (RD/σ)", null=True, blank=True)
+    deviation_post = models.FloatField("Desviación post-partido (RD/σ)", null=True, blank=True)
+    volatility = models.FloatField("Volatilidad post-partido (Glicko-2)", null=True, blank=True)
+    win_prob = models.FloatField("Prob. victoria pre-partido")
+
+    class Meta:
+        verbose_name = "Team rating"
+        verbose_name_plural = "Team ratings"
+        ordering = ["system", "team_id", "-date"]
+        unique_together = [["system", "team_id", "game_id"]]
+        indexes = [models.Index(fields=["system", "team_id", "date"])]
+
+    def __str__(self):
+        return f"{self.system} {self.team_id} @ {self.date}: {self.rating_post:.1f}"
+
+
+class FeatureWatermark(models.Model):
+    """
+    Estado de los datos de partido contra el que se calcularon las features de un
+    (mercado, tipo de temporada). Lo usa `compute_features --incremental` para
+    recalcular solo los partidos nuevos o afectados por un partido cambiado.
+    La fila de mercado "*" guarda la huella de cada partido del tipo de temporada;
+    la de cada mercado, solo los partidos que le quedan pendientes.
+    """
+
+    market = models.CharField("Mercado", max_length=32)
+    season_type = models.CharField("SEASON_TYPE", max_length=20, blank=True)
+    last_game_date = models.DateField("Último partido con fecha", null=True, blank=True)
+    line_max_pk = models.BigIntegerField("Máx. pk GameTeamLine", default=0)
+    line_count = models.IntegerField("Nº GameTeamLine", default=0)
+    game_digests = models.JSONField("Huella por partido (game_id → hash)", default=dict)
+    updated_at = models.DateTimeField("Actualizado", auto_now=True)
+
+    class Meta:
+        verbose_name = "Feature watermark"
+        verbose_name_plural = "Feature watermarks"
+        ordering = ["market", "season_type"]
+        unique_together = [["market", "season_type"]]
+
+    def __str__(self):
+        return f"{self.market}/{self.season_type or '-'} @ {self.last_game_date}"
@@ -0,0 +1,86 @@
+"""Tareas Celery para el cálculo de features."""
+
+from celery import chord, shared_task
+
+# Partidos por tarea de lote: suficientes para amortizar la carga del store del worker
+CHUNK_SIZE = 500
+
+
+@shared_task(name="features.compute_features_chunk")
+def compute_features_chunk(game_ids, markets, to_redis=False):
+    """
+    Calcula las features de un lote de partidos para `markets` y las escribe en
+    bloque. Usa el store de game logs del proceso worker (se carga una vez y se
+    refresca de forma incremental).
+    """
+    from features.engine.batch import compute_game_ids
+    from features.engine.store import get_team_store
+
+    return compute_game_ids(game_ids, markets, store=get_team_store(), to_redis=to_redis)
+
+
+@shared_task(name="features.aggregate_features_chunks")
+def aggregate_features_chunks(results, markets, season_type, train_markets=None):
+    """
+    Callback del chord: une los resúmenes de los lotes, regenera los datasets
+    columnares (si se escribió alguna fila) y, si se pide, lanza el
+    entrenamiento de `train_markets`.
+    """
+    from features.engine.batch import merge_results
+    from features.engine.columnar import export_market
+
+    merged = merge_results(results)
+    exported = {}
+    for market in markets if merged["written"] else ():
+        try:
+            exported[market] = export_market(market, season_type)
+        except Exception as exc:
+            exported[market] = f"error: {exc}"
+
+    summary = {
+        "status": "ok",
+        "games": len(merged["done"]),
+        "written": merged["written"],
+        "skipped": merged["skipped"],
+        "errors": merged["errors"][:100],
+        "n_errors": len(merged["errors"]),
+        "columnar": exported,
+    }
+    if train_markets:
+        from predictions.tasks import train_markets_fanout
+        summary["training"] = train_markets_fanout.delay(train_markets, season_type).id
+    return summary
+
+
+@shared_task(name="features.compute_features_fanout")
+def compute_features_fanout(
+    markets=None, season_type="Regular Season", season="", chunk_size=CHUNK_SIZE,
+    to_redis=False, train_markets=None,
+):
+    """
+    Orquestador: reparte los partidos de una temporada (o de todas) en lotes
+    contiguos por fecha, uno por tarea, y agrega el resultado con un chord.
+    Devuelve el id del chord y el número de lotes.
+    """
+    from core.models import Game
+    from features.engine.batch import partition_game_ids
+
+    if not markets:
+        from predictions.registry import FEATURE_MARKETS
+        markets = list(FEATURE_MARKETS)
+
+    qs = Game.objects.exclude(home_team__isnull=True).exclude(away_team__isnull=True)
+    if season_type:
+        qs = qs.filter(season_type__icontains=season_type)
+    if season:
+        qs = qs.filter(season=season)
+
+    n_games = qs.count()
+    chunks = partition_game_ids(qs, -(-n_games // chunk_size))
+    if not chunks:
+        return {"status": "empty", "chunks": 0}
+
+    result = chord(
+        compute_features_chunk.s(chunk, markets, to_redis) for chunk in chunks
+    )(aggregate_features_chunks.s(markets, season_type, train_markets))
+    return {"status": "started", "chord_id": result.id, "chunks": len(chunks), "games": n_games}
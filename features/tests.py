@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from features.engine import codec
+from features.engine.incremental import affected_game_ids
+
+
+class _MemoryRedis:
+    """Lo que usa el codec de Redis (hgetall/hsetnx/delete), en memoria y en bytes."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        field = field.encode() if isinstance(field, str) else field
+        if field in fields:
+            return 0
+        fields[field] = value.encode() if isinstance(value, str) else value
+        return 1
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+def _reset_codec():
+    codec._schemas.clear()
+    codec._current.clear()
+    codec._loaded_at.clear()
+
+
+class CodecTests(SimpleTestCase):
+    def setUp(self):
+        _reset_codec()
+        self.addCleanup(_reset_codec)
+        self.r = _MemoryRedis()
+
+    def test_round_trip(self):
+        features = {"home_pts_avg_5": 112.4, "away_pts_avg_5": 108.0, "rest_days": 2.0}
+        blob = codec.encode_features(self.r, "moneyline", features, fmt=codec.FORMAT_FLOAT64)
+        self.assertEqual(blob[:1], codec.FORMAT_FLOAT64)
+        self.assertEqual(codec.decode_features(self.r, "moneyline", blob), features)
+
+        blob = codec.encode_features(self.r, "moneyline", features)
+        decoded = codec.decode_features(self.r, "moneyline", blob)
+        self.assertEqual(decoded.keys(), features.keys())
+        for name, value in features.items():
+            self.assertAlmostEqual(decoded[name], value, places=4)
+
+    def test_non_numeric_values_are_stored_as_json(self):
+        features = {"streak": "W3", "rest_days": 2}
+        blob = codec.encode_features(self.r, "moneyline", features)
+        self.assertEqual(blob[:1], codec.FORMAT_JSON)
+        self.assertEqual(codec.decode_features(self.r, "moneyline", blob), features)
+
+    def test_schema_version_bump_keeps_old_values_decodable(self):
+        old = {"a": 1.0, "b": 2.0}
+        old_blob = codec.encode_features(self.r, "totals", old, fmt=codec.FORMAT_FLOAT64)
+        new = {"b": 3.0, "c": 4.0}
+        new_blob = codec.encode_features(self.r, "totals", new, fmt=codec.FORMAT_FLOAT64)
+
+        versions = self.r.hgetall(codec._schema_key("totals"))
+        self.assertEqual(sorted(versions), [b"1", b"2"])
+        self.assertEqual(codec._HEADER.unpack_from(new_blob)[1], 2)
+
+        # Otro proceso (sin esquema en memoria) decodifica ambas versiones
+        _reset_codec()
+        self.assertEqual(codec.decode_features(self.r, "totals", old_blob), old)
+        self.assertEqual(codec.decode_features(self.r, "totals", new_blob), new)
+
+    def test_republished_schema_with_other_order_is_a_miss(self):
+        blob = codec.encode_features(self.r, "spread", {"a": 1.0, "b": 2.0})
+
+        # Registro perdido y republicado por otro proceso con la misma versión y otro orden
+        self.r.delete(codec._schema_key("spread"))
+        _reset_codec()
+        codec.encode_features(self.r, "spread", {"b": 5.0, "a": 6.0})
+
+        self.assertIsNone(codec.decode_features(self.r, "spread", blob))
+
+    def test_unknown_version_is_a_miss(self):
+        blob = codec.encode_features(self.r, "q1", {"a": 1.0})
+        self.r.delete(codec._schema_key("q1"))
+        _reset_codec()
+        self.assertIsNone(codec.decode_features(self.r, "q1", blob))
+
+    def test_writer_rechecks_registry_after_interval(self):
+        codec.encode_features(self.r, "q3", {"a": 1.0})
+        self.r.delete(codec._schema_key("q3"))
+
+        # Dentro del intervalo usa el esquema en memoria; pasado, lo republica
+        codec.encode_features(self.r, "q3", {"a": 1.0})
+        self.assertEqual(self.r.hgetall(codec._schema_key("q3")), {})
+        with mock.patch.object(codec, "SCHEMA_CHECK_SECONDS", 0):
+            blob = codec.encode_features(self.r, "q3", {"a": 1.0})
+        self.assertEqual(list(self.r.hgetall(codec._schema_key("q3"))), [b"1"])
+        self.assertEqual(codec.decode_features(self.r, "q3", blob), {"a": 1.0})
+
+
+class AffectedGameIdsTests(SimpleTestCase):
+    # game_id → (ordinal de fecha, local, visitante, con resultado)
+    GAMES = {
+        "g1": (1, "A", "B", True),
+        "g2": (2, "A", "C", True),
+        "g3": (3, "A", "D", True),
+        "g4": (4, "A", "E", False),
+        "g5": (5, "A", "F", True),
+        "g6": (6, "A", "G", True),
+        "g7": (7, "C", "A", True),
+        "g8": (3, "C", "H", True),
+        "g9": (8, "C", "I", True),
+        "g10": (None, "A", "C", False),
+    }
+
+    def test_expands_to_following_games_of_each_team_and_pair(self):
+        affected = affected_game_ids({"g2"}, self.GAMES, lookback=2)
+        # A: g3, g4 (sin resultado, no cuenta) y g5; C: g8 y g7; pareja A-C: g7
+        self.assertEqual(affected, {"g2", "g3", "g4", "g5", "g7", "g8"})
+
+    def test_head_to_head_reaches_beyond_team_windows(self):
+        affected = affected_game_ids({"g2"}, self.GAMES, lookback=1)
+        self.assertEqual(affected, {"g2", "g3", "g8", "g7"})
+
+    def test_undated_or_unknown_games_only_affect_themselves(self):
+        self.assertEqual(affected_game_ids({"g10", "zz"}, self.GAMES, lookback=2), {"g10", "zz"})
+
+    def test_last_games_affect_nothing_else(self):
+        self.assertEqual(affected_game_ids({"g9"}, self.GAMES, lookback=10), {"g9"})
@@ -1,104 +1,533 @@
 from .base import BaseModel
+from bisect import bisect_left, bisect_right
+import math
 import numpy as np
 
+# Escala Glicko-2 (rating = 1500 + 173.7178 * mu)
+GLICKO2_SCALE = 173.7178
 
-class ELO(BaseModel):
-    def __init__(self, X, y, k_factor=32, initial_rating=1500, **kwargs):
-        super().__init__(X, y, **kwargs)
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def _norm_cdf(x):
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / math.sqrt(2.0))
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * np.asarray(x, dtype=float) ** 2) / math.sqrt(2.0 * math.pi)
+
+
+# ---------------------------------------------------------------------------
+# Motores de rating
+#
+# Interfaz común (la usan features.engine.ratings y los modelos de abajo):
+# - update_period(period, games, season): procesa un periodo de rating (un día
+#   de partidos) con games = [(local, visitante, pts local, pts visitante)] y
+#   devuelve por partido un dict con ratings/desviaciones previos y posteriores.
+# - set_state / set_periods: retomar el cálculo desde ratings guardados.
+# - pre_game: rating/desviación previos a un partido a partir del último estado
+#   guardado (regresión de temporada, periodos sin jugar, dinámica τ…).
+# - win_prob: probabilidad de victoria del local.
+# ---------------------------------------------------------------------------
+
+
+class EloRatings:
+    """
+    Motor Elo de una pasada sobre partidos en orden cronológico.
+
+    - Ventaja de campo: `home_advantage` puntos Elo sumados al local.
+    - Margen de victoria: multiplicador ((|MOV| + 3) ** 0.8) / (7.5 + 0.006 * ventaja
+      Elo del ganador), que amortigua las palizas de los favoritos.
+    - Regresión de temporada: al primer partido de una temporada nueva el rating
+      se acerca a `initial` una fracción `season_regression`.
+
+    `update` procesa un resultado y devuelve los ratings previos y posteriores;
+    `set_state` permite retomar el cálculo desde ratings ya guardados.
+    """
+
+    deviation_name = None
+
+    def __init__(self, k_factor=20.0, home_advantage=100.0, initial_rating=1500.0,
+                 season_regression=0.25, margin_of_victory=True):
         self.k_factor = k_factor
+        self.home_advantage = home_advantage
         self.initial_rating = initial_rating
+        self.season_regression = season_regression
+        self.margin_of_victory = margin_of_victory
         self.ratings = {}
-        self.prepare_data()
-        self._build_model()
+        self.seasons = {}  # temporada del último partido de cada equipo
 
-    def _build_model(self):
-        # ELO no usa modelo sklearn, se implementa directamente
-        self.model = None
+    def set_state(self, team, rating, deviation=None, volatility=None, season=None, last_period=None):
+        self.ratings[team] = float(rating)
+        self.seasons[team] = season
+
+    def set_periods(self, periods):
+        pass
+
+    def regress(self, rating, from_season, to_season):
+        """Rating al empezar `to_season` si el último partido fue en `from_season`."""
+        if from_season and to_season and from_season != to_season:
+            return self.initial_rating + (rating - self.initial_rating) * (1 - self.season_regression)
+        return rating
+
+    def rating(self, team, season=None):
+        """Rating pre-partido del equipo (con la regresión de temporada aplicada)."""
+        if team not in self.ratings:
+            return self.initial_rating
+        return self.regress(self.ratings[team], self.seasons.get(team), season)
+
+    def state(self, team, season=None):
+        return self.rating(team, season), None
+
+    def pre_game(self, rating, deviation, volatility, from_season, to_season, idle_periods=0):
+        return self.regress(rating, from_season, to_season), None
+
+    def expected(self, home_rating, away_rating):
+        """Probabilidad de victoria del local."""
+        return 1.0 / (1.0 + 10 ** ((away_rating - home_rating - self.home_advantage) / 400.0))
+
+    def win_prob(self, home_rating, home_dev, away_rating, away_dev):
+        return self.expected(home_rating, away_rating)
+
+    def _mov_multiplier(self, margin, winner_diff):
+        if not self.margin_of_victory:
+            return 1.0
+        return ((abs(margin) + 3) ** 0.8) / (7.5 + 0.006 * winner_diff)
+
+    def update(self, home, away, home_pts, away_pts, season=None):
+        """
+        Aplica un resultado. Devuelve (home_pre, away_pre, home_win_prob,
+        home_post, away_post).
+        """
+        home_pre = self.rating(home, season)
+        away_pre = self.rating(away, season)
+        prob = self.expected(home_pre, away_pre)
+
+        margin = home_pts - away_pts
+        score = 1.0 if margin > 0 else (0.0 if margin < 0 else 0.5)
+        home_edge = home_pre + self.home_advantage - away_pre
+        winner_diff = home_edge if margin > 0 else (-home_edge if margin < 0 else 0.0)
+        delta = self.k_factor * self._mov_multiplier(margin, winner_diff) * (score - prob)
+
+        self.set_state(home, home_pre + delta, season=season)
+        self.set_state(away, away_pre - delta, season=season)
+        return home_pre, away_pre, prob, home_pre + delta, away_pre - delta
+
+    def update_period(self, period, games, season=None):
+        out = []
+        for home, away, home_pts, away_pts in games:
+            home_pre, away_pre, prob, home_post, away_post = self.update(
+                home, away, home_pts, away_pts, season
+            )
+            out.append({
+                "home_pre": home_pre, "away_pre": away_pre, "prob": prob,
+                "home_post": home_post, "away_post": away_post,
+            })
+        return out
+
+
+class _TeamArrayRatings:
+    """
+    Base de los motores vectorizados: estado en arrays NumPy indexados por
+    equipo (`index[team]`) y lista ordenada de periodos ya procesados.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.periods = []
+        self.last = np.zeros(0, dtype=object)  # último periodo jugado (None si nunca)
+
+    def _new_team(self):
+        raise NotImplementedError
+
+    def _idx(self, teams) -> np.ndarray:
+        for team in teams:
+            if team not in self.index:
+                self.index[team] = len(self.index)
+                self._new_team()
+                self.last = np.append(self.last, np.array([None], dtype=object))
+        return np.array([self.index[t] for t in teams], dtype=np.int64)
+
+    def set_periods(self, periods):
+        self.periods = sorted(periods)
+
+    def idle_periods(self, last_period, period) -> int:
+        """Periodos con partidos entre `last_period` y `period` (ambos excluidos)."""
+        if last_period is None:
+            return 0
+        return max(0, bisect_left(self.periods, period) - bisect_right(self.periods, last_period))
+
+    def _close_period(self, period, teams):
+        self.last[teams] = period
+        if not self.periods or self.periods[-1] != period:
+            self.periods.append(period)
+
+
+class Glicko2Ratings(_TeamArrayRatings):
+    """
+    Glicko-2 con un periodo de rating por día de partidos, vectorizado por equipo.
+
+    Cada equipo que juega en el periodo acumula v⁻¹ y Δ sobre sus partidos; la
+    volatilidad se resuelve con el algoritmo de Illinois para todos a la vez. La
+    desviación crece con los periodos sin jugar (φ² + n·σ², con tope en la
+    inicial). `home_advantage` (puntos de rating) se suma al local en E.
+    """
+
+    deviation_name = "rd"
+
+    def __init__(self, tau=0.5, initial_rating=1500.0, initial_rd=350.0,
+                 initial_volatility=0.06, home_advantage=100.0, epsilon=1e-6):
+        super().__init__()
+        self.tau = tau
+        self.initial_rating = initial_rating
+        self.initial_rd = initial_rd
+        self.initial_volatility = initial_volatility
+        self.home_advantage = home_advantage
+        self.epsilon = epsilon
+        self.mu = np.zeros(0)
+        self.phi = np.zeros(0)
+        self.sigma = np.zeros(0)
+
+    def _new_team(self):
+        self.mu = np.append(self.mu, 0.0)
+        self.phi = np.append(self.phi, self.initial_rd / GLICKO2_SCALE)
+        self.sigma = np.append(self.sigma, self.initial_volatility)
+
+    def set_state(self, team, rating, deviation=None, volatility=None, season=None, last_period=None):
+        i = self._idx([team])[0]
+        self.mu[i] = (rating - self.initial_rating) / GLICKO2_SCALE
+        self.phi[i] = (deviation if deviation is not None else self.initial_rd) / GLICKO2_SCALE
+        self.sigma[i] = volatility if volatility is not None else self.initial_volatility
+        self.last[i] = last_period
+
+    def _inflate(self, phi, sigma, idle):
+        return np.minimum(np.sqrt(phi ** 2 + idle * sigma ** 2), self.initial_rd / GLICKO2_SCALE)
+
+    def state(self, team, season=None):
+        if team not in self.index:
+            return self.initial_rating, self.initial_rd
+        i = self.index[team]
+        return self._rating(self.mu[i]), float(GLICKO2_SCALE * self.phi[i])
+
+    def pre_game(self, rating, deviation, volatility, from_season, to_season, idle_periods=0):
+        phi = self._inflate(deviation / GLICKO2_SCALE, volatility, idle_periods)
+        return rating, float(GLICKO2_SCALE * phi)
+
+    def _rating(self, mu):
+        return float(self.initial_rating + GLICKO2_SCALE * mu)
+
+    @staticmethod
+    def _g(phi):
+        return 1.0 / np.sqrt(1.0 + 3.0 * phi ** 2 / math.pi ** 2)
+
+    def win_prob(self, home_rating, home_dev, away_rating, away_dev):
+        diff = (home_rating + self.home_advantage - away_rating) / GLICKO2_SCALE
+        phi = math.hypot(home_dev, away_dev) / GLICKO2_SCALE
+        return float(1.0 / (1.0 + math.exp(-self._g(phi) * diff)))
+
+    def _volatility(self, delta, phi, v, sigma):
+        """Nueva volatilidad (paso 5 de Glicko-2) para un array de equipos."""
+        a = np.log(sigma ** 2)
+        tau = self.tau
+
+        def f(x):
+            ex = np.exp(x)
+            return ex * (delta ** 2 - phi ** 2 - v - ex) / (2 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+        A = a.copy()
+        big = delta ** 2 > phi ** 2 + v
+        B = np.where(big, np.log(np.maximum(delta ** 2 - phi ** 2 - v, 1e-300)), a - tau)
+        need = ~big & (f(B) < 0)
+        k = 1
+        while need.any():
+            k += 1
+            B = np.where(need, a - k * tau, B)
+            need &= f(B) < 0
+
+        fA, fB = f(A), f(B)
+        for _ in range(100):
+            active = np.abs(B - A) > self.epsilon
+            if not active.any():
+                break
+            C = A + (A - B) * fA / (fB - fA)
+            fC = f(C)
+            swap = fC * fB <= 0
+            A = np.where(active, np.where(swap, B, A), A)
+            fA = np.where(active, np.where(swap, fB, fA / 2), fA)
+            B = np.where(active, C, B)
+            fB = np.where(active, fC, fB)
+        return np.exp(A / 2)
+
+    def update_period(self, period, games, season=None):
+        homes = self._idx([g[0] for g in games])
+        aways = self._idx([g[1] for g in games])
+        margin = np.array([g[2] - g[3] for g in games], dtype=float)
+        s_home = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+
+        teams = np.unique(np.concatenate([homes, aways]))
+        idle = np.array([self.idle_periods(self.last[t], period) for t in teams], dtype=float)
+        phi = self.phi.copy()
+        phi[teams] = self._inflate(self.phi[teams], self.sigma[teams], idle)
+        mu = self.mu
+        h = self.home_advantage / GLICKO2_SCALE
+
+        g_home, g_away = self._g(phi[homes]), self._g(phi[aways])
+        e_home = 1.0 / (1.0 + np.exp(-g_away * (mu[homes] + h - mu[aways])))
+        e_away = 1.0 / (1.0 + np.exp(-g_home * (mu[aways] - h - mu[homes])))
+
+        inv_v = np.zeros(len(mu))
+        dsum = np.zeros(len(mu))
+        np.add.at(inv_v, homes, g_away ** 2 * e_home * (1 - e_home))
+        np.add.at(inv_v, aways, g_home ** 2 * e_away * (1 - e_away))
+        np.add.at(dsum, homes, g_away * (s_home - e_home))
+        np.add.at(dsum, aways, g_home * ((1 - s_home) - e_away))
+
+        v = 1.0 / inv_v[teams]
+        sigma_new = self._volatility(v * dsum[teams], phi[teams], v, self.sigma[teams])
+        phi_star = np.sqrt(phi[teams] ** 2 + sigma_new ** 2)
+        phi_new = 1.0 / np.sqrt(1.0 / phi_star ** 2 + 1.0 / v)
+        mu_new = mu[teams] + phi_new ** 2 * dsum[teams]
+
+        pre_mu, pre_phi = mu.copy(), phi
+        self.mu[teams], self.phi[teams], self.sigma[teams] = mu_new, phi_new, sigma_new
+        self._close_period(period, teams)
+
+        out = []
+        for hi, ai in zip(homes, aways):
+            home_dev, away_dev = GLICKO2_SCALE * pre_phi[hi], GLICKO2_SCALE * pre_phi[ai]
+            out.append({
+                "home_pre": self._rating(pre_mu[hi]), "away_pre": self._rating(pre_mu[ai]),
+                "home_dev_pre": float(home_dev), "away_dev_pre": float(away_dev),
+                "prob": self.win_prob(
+                    self._rating(pre_mu[hi]), home_dev, self._rating(pre_mu[ai]), away_dev,
+                ),
+                "home_post": self._rating(self.mu[hi]), "away_post": self._rating(self.mu[ai]),
+                "home_dev_post": float(GLICKO2_SCALE * self.phi[hi]),
+                "away_dev_post": float(GLICKO2_SCALE * self.phi[ai]),
+                "home_vol": float(self.sigma[hi]), "away_vol": float(self.sigma[ai]),
+            })
+        return out
+
+
+class TrueSkillRatings(_TeamArrayRatings):
+    """
+    TrueSkill 1 contra 1 (sin empates) con un periodo por día de partidos,
+    vectorizado por equipo. Antes de cada partido σ² crece τ² (dinámica);
+    `home_advantage` (en unidades de μ) se suma al local en la diferencia de
+    rendimiento. Un empate (margen 0) cuenta como derrota del local.
+    """
+
+    deviation_name = "sigma"
+
+    def __init__(self, mu=25.0, sigma=25.0 / 3, beta=25.0 / 6, tau=25.0 / 300, home_advantage=1.0):
+        super().__init__()
+        self.initial_mu = mu
+        self.initial_sigma = sigma
+        self.beta = beta
+        self.tau = tau
+        self.home_advantage = home_advantage
+        self.mu = np.zeros(0)
+        self.sigma = np.zeros(0)
+
+    def _new_team(self):
+        self.mu = np.append(self.mu, self.initial_mu)
+        self.sigma = np.append(self.sigma, self.initial_sigma)
+
+    def set_state(self, team, rating, deviation=None, volatility=None, season=None, last_period=None):
+        i = self._idx([team])[0]
+        self.mu[i] = rating
+        self.sigma[i] = deviation if deviation is not None else self.initial_sigma
+        self.last[i] = last_period
+
+    def state(self, team, season=None):
+        if team not in self.index:
+            return self.initial_mu, self.initial_sigma
+        i = self.index[team]
+        return float(self.mu[i]), float(math.hypot(self.sigma[i], self.tau))
+
+    def pre_game(self, rating, deviation, volatility, from_season, to_season, idle_periods=0):
+        return rating, float(math.hypot(deviation, self.tau))
+
+    def win_prob(self, home_rating, home_dev, away_rating, away_dev):
+        c = math.sqrt(2 * self.beta ** 2 + home_dev ** 2 + away_dev ** 2)
+        return float(_norm_cdf((home_rating + self.home_advantage - away_rating) / c))
+
+    def update_period(self, period, games, season=None):
+        homes = self._idx([g[0] for g in games])
+        aways = self._idx([g[1] for g in games])
+        home_won = np.array([g[2] > g[3] for g in games])
+
+        teams = np.unique(np.concatenate([homes, aways]))
+        sigma2 = self.sigma ** 2
+        sigma2[teams] += self.tau ** 2
+        mu = self.mu
+
+        c2 = 2 * self.beta ** 2 + sigma2[homes] + sigma2[aways]
+        c = np.sqrt(c2)
+        sign = np.where(home_won, 1.0, -1.0)
+        t = sign * (mu[homes] + self.home_advantage - mu[aways]) / c
+        v = _norm_pdf(t) / np.maximum(_norm_cdf(t), 1e-300)
+        w = v * (v + t)
+
+        pre_mu, pre_sigma = mu.copy(), np.sqrt(sigma2)
+        new_mu = mu.copy()
+        new_sigma2 = sigma2.copy()
+        np.add.at(new_mu, homes, sign * sigma2[homes] / c * v)
+        np.add.at(new_mu, aways, -sign * sigma2[aways] / c * v)
+        np.multiply.at(new_sigma2, homes, np.maximum(1 - sigma2[homes] / c2 * w, 1e-6))
+        np.multiply.at(new_sigma2, aways, np.maximum(1 - sigma2[aways] / c2 * w, 1e-6))
+
+        self.mu[teams] = new_mu[teams]
+        self.sigma[teams] = np.sqrt(new_sigma2[teams])
+        self._close_period(period, teams)
+
+        out = []
+        for i, (hi, ai) in enumerate(zip(homes, aways)):
+            out.append({
+                "home_pre": float(pre_mu[hi]), "away_pre": float(pre_mu[ai]),
+                "home_dev_pre": float(pre_sigma[hi]), "away_dev_pre": float(pre_sigma[ai]),
+                "prob": float(_norm_cdf((pre_mu[hi] + self.home_advantage - pre_mu[ai]) / c[i])),
+                "home_post": float(self.mu[hi]), "away_post": float(self.mu[ai]),
+                "home_dev_post": float(self.sigma[hi]), "away_dev_post": float(self.sigma[ai]),
+            })
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Modelos (interfaz BaseModel)
+# ---------------------------------------------------------------------------
+
+
+class _RatingSystemModel(BaseModel):
+    """
+    Sistema de rating sobre filas (local, visitante, puntos local, puntos
+    visitante[, fecha[, temporada]]) en orden cronológico; y = 1 si gana el
+    local. Las filas con la misma fecha forman un periodo de rating. El split
+    es temporal y sin normalizar (los ratings dependen del orden).
+    """
+
+    def __init__(self, X, y, **kwargs):
+        kwargs.setdefault("normalize", False)
+        super().__init__(X, y, **kwargs)
+        self.ratings = {}
+
+    def prepare_data(self):
+        if self.X is None or self.y is None:
+            raise ValueError("X e y no pueden ser None")
+        if len(self.X) != len(self.y):
+            raise ValueError("X e y deben tener la misma longitud")
+        # Split temporal: los últimos partidos son el test
+        n_train = int(len(self.X) * (1 - self.test_size))
+        self.X_train, self.X_test = self.X[:n_train], self.X[n_train:]
+        self.y_train, self.y_test = self.y[:n_train], self.y[n_train:]
 
     def fit(self):
-        # ELO se entrena procesando los partidos históricos
-        # X debe contener información de equipos/jugadores
-        # y debe contener resultados (1 = victoria equipo1, 0 = victoria equipo2)
-        unique_teams = np.unique(self.X_train.flatten() if hasattr(self.X_train, 'flatten') else self.X_train)
-        self.ratings = {team: self.initial_rating for team in unique_teams}
+        period, games, key, season = 0, [], None, None
+        for n, row in enumerate(self.X_train):
+            row_key = row[4] if len(row) > 4 else n
+            if games and row_key != key:
+                self.model.update_period(period, games, season)
+                period, games = period + 1, []
+            key = row_key
+            season = row[5] if len(row) > 5 else None
+            games.append((row[0], row[1], float(row[2]), float(row[3])))
+        if games:
+            self.model.update_period(period, games, season)
+        self.ratings = {team: self.model.state(team)[0] for team in self._teams()}
         self.is_trained = True
 
+    def _teams(self):
+        teams = getattr(self.model, "index", None) or getattr(self.model, "ratings", {})
+        return list(teams)
+
     def predict(self, X=None):
         if not self.is_trained:
             raise ValueError("El modelo debe estar entrenado antes de predecir")
-        # Implementación básica de predicción ELO
-        # Retorna probabilidad de victoria basada en diferencia de ratings
-        raise NotImplementedError("Predicción ELO requiere implementación específica")
+        X = self.X_test if X is None else X
+        probs = []
+        for row in X:
+            season = row[5] if len(row) > 5 else None
+            home, home_dev = self.model.state(row[0], season)
+            away, away_dev = self.model.state(row[1], season)
+            probs.append(self.model.win_prob(home, home_dev, away, away_dev))
+        return np.array(probs)
 
     def evaluate(self, metrics=None):
         if not self.is_trained:
             raise ValueError("El modelo debe estar entrenado antes de evaluarlo")
-        # Métricas específicas para sistemas de rating
-        return {"ratings": self.ratings}
+        result = {"ratings": self.ratings}
+        if len(self.X_test):
+            prob = self.predict()
+            y = np.asarray(self.y_test, dtype=float)
+            result["brier"] = float(np.mean((prob - y) ** 2))
+            result["accuracy"] = float(np.mean((prob >= 0.5) == (y == 1)))
+        return result
 
 
-class Glicko(BaseModel):
-    def __init__(self, X, y, tau=0.0833, initial_rating=1500, initial_rd=350, **kwargs):
+class ELO(_RatingSystemModel):
+    def __init__(self, X, y, k_factor=20, initial_rating=1500, home_advantage=100,
+                 season_regression=0.25, **kwargs):
+        super().__init__(X, y, **kwargs)
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.home_advantage = home_advantage
+        self.season_regression = season_regression
+        self.prepare_data()
+        self._build_model()
+
+    def _build_model(self):
+        self.model = EloRatings(
+            k_factor=self.k_factor,
+            home_advantage=self.home_advantage,
+            initial_rating=self.initial_rating,
+            season_regression=self.season_regression,
+        )
+
+
+class Glicko(_RatingSystemModel):
+    def __init__(self, X, y, tau=0.5, initial_rating=1500, initial_rd=350,
+                 initial_volatility=0.06, home_advantage=100, **kwargs):
         super().__init__(X, y, **kwargs)
         self.tau = tau
         self.initial_rating = initial_rating
         self.initial_rd = initial_rd
-        self.ratings = {}
+        self.initial_volatility = initial_volatility
+        self.home_advantage = home_advantage
         self.rd = {}  # Rating deviation
         self.prepare_data()
         self._build_model()
 
     def _build_model(self):
-        # Glicko no usa modelo sklearn, se implementa directamente
-        self.model = None
+        self.model = Glicko2Ratings(
+            tau=self.tau,
+            initial_rating=self.initial_rating,
+            initial_rd=self.initial_rd,
+            initial_volatility=self.initial_volatility,
+            home_advantage=self.home_advantage,
+        )
 
     def fit(self):
-        # Glicko se entrena procesando los partidos históricos
-        unique_teams = np.unique(self.X_train.flatten() if hasattr(self.X_train, 'flatten') else self.X_train)
-        self.ratings = {team: self.initial_rating for team in unique_teams}
-        self.rd = {team: self.initial_rd for team in unique_teams}
-        self.is_trained = True
-
-    def predict(self, X=None):
-        if not self.is_trained:
-            raise ValueError("El modelo debe estar entrenado antes de predecir")
-        # Implementación básica de predicción Glicko
-        raise NotImplementedError("Predicción Glicko requiere implementación específica")
+        super().fit()
+        self.rd = {team: self.model.state(team)[1] for team in self._teams()}
 
     def evaluate(self, metrics=None):
-        if not self.is_trained:
-            raise ValueError("El modelo debe estar entrenado antes de evaluarlo")
-        return {"ratings": self.ratings, "rd": self.rd}
+        return {**super().evaluate(metrics), "rd": self.rd}
 
 
-class TrueSkill(BaseModel):
-    def __init__(self, X, y, mu=25.0, sigma=25.0/3, beta=25.0/6, tau=25.0/300, **kwargs):
+class TrueSkill(_RatingSystemModel):
+    def __init__(self, X, y, mu=25.0, sigma=25.0/3, beta=25.0/6, tau=25.0/300,
+                 home_advantage=1.0, **kwargs):
         super().__init__(X, y, **kwargs)
         self.mu = mu
         self.sigma = sigma
         self.beta = beta
         self.tau = tau
-        self.ratings = {}
+        self.home_advantage = home_advantage
         self.prepare_data()
         self._build_model()
 
     def _build_model(self):
-        # TrueSkill no usa modelo sklearn, se implementa directamente
-        self.model = None
-
-    def fit(self):
-        # TrueSkill se entrena procesando los partidos históricos
-        unique_teams = np.unique(self.X_train.flatten() if hasattr(self.X_train, 'flatten') else self.X_train)
-        self.ratings = {team: {"mu": self.mu, "sigma": self.sigma} for team in unique_teams}
-        self.is_trained = True
-
-    def predict(self, X=None):
-        if not self.is_trained:
-            raise ValueError("El modelo debe estar entrenado antes de predecir")
-        # Implementación básica de predicción TrueSkill
-        raise NotImplementedError("Predicción TrueSkill requiere implementación específica")
-
-    def evaluate(self, metrics=None):
-        if not self.is_trained:
-            raise ValueError("El modelo debe estar entrenado antes de evaluarlo")
-        return {"ratings": self.ratings}
+        self.model = TrueSkillRatings(
+            mu=self.mu, sigma=self.sigma, beta=self.beta, tau=self.tau,
+            home_advantage=self.home_advantage,
+        )
@@ -1,3 +1,72 @@
-from django.test import TestCase
+import math
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from ia.services.rating_systems import GLICKO2_SCALE, Glicko2Ratings, TrueSkillRatings
+
+
+class Glicko2RatingsTests(SimpleTestCase):
+    def test_glickman_worked_example(self):
+        # Ejemplo de "Example of the Glicko-2 system" (Glickman): 1500/200/0.06
+        # contra 1400/30 (gana), 1550/100 (pierde) y 1700/300 (pierde), τ = 0.5
+        engine = Glicko2Ratings(tau=0.5, home_advantage=0.0)
+        engine.set_state("p", 1500.0, 200.0, 0.06)
+        for team, rating, rd in (("a", 1400.0, 30.0), ("b", 1550.0, 100.0), ("c", 1700.0, 300.0)):
+            engine.set_state(team, rating, rd, 0.06)
+
+        engine.update_period(1, [("p", "a", 1, 0), ("p", "b", 0, 1), ("p", "c", 0, 1)])
+
+        rating, rd = engine.state("p")
+        self.assertAlmostEqual(rating, 1464.06, delta=0.02)
+        self.assertAlmostEqual(rd, 151.52, delta=0.02)
+        self.assertAlmostEqual(float(engine.sigma[engine.index["p"]]), 0.05999, delta=1e-5)
+
+    def test_idle_periods_inflate_deviation_up_to_initial(self):
+        engine = Glicko2Ratings(initial_rd=350.0)
+        _, rd = engine.pre_game(1500.0, 50.0, 0.06, None, None, idle_periods=10)
+        self.assertAlmostEqual(rd, math.hypot(50.0, 10 ** 0.5 * 0.06 * GLICKO2_SCALE), places=6)
+        _, rd = engine.pre_game(1500.0, 340.0, 0.06, None, None, idle_periods=10_000)
+        self.assertEqual(rd, 350.0)
+
+
+class TrueSkillRatingsTests(SimpleTestCase):
+    def test_first_game_mean_and_variance(self):
+        # Dos equipos nuevos (μ 25, σ 25/3, β 25/6), sin dinámica ni ventaja de
+        # campo y sin margen de empate: c² = 2β² + 2σ², t = 0, v = 2φ(0), w = v²
+        engine = TrueSkillRatings(tau=0.0, home_advantage=0.0)
+        out = engine.update_period(1, [("x", "y", 110, 100)])
+
+        sigma2 = (25.0 / 3) ** 2
+        c2 = 2 * (25.0 / 6) ** 2 + 2 * sigma2
+        v = 2 / math.sqrt(2 * math.pi)
+        delta = sigma2 / math.sqrt(c2) * v
+        new_sigma = math.sqrt(sigma2 * (1 - sigma2 / c2 * v * v))
+
+        self.assertAlmostEqual(out[0]["prob"], 0.5)
+        self.assertAlmostEqual(out[0]["home_post"], 25.0 + delta)
+        self.assertAlmostEqual(out[0]["away_post"], 25.0 - delta)
+        self.assertAlmostEqual(out[0]["home_post"], 29.2052, places=4)
+        self.assertAlmostEqual(out[0]["home_dev_post"], new_sigma)
+        self.assertAlmostEqual(out[0]["away_dev_post"], new_sigma)
+        self.assertAlmostEqual(new_sigma, 7.1945, places=4)
+
+    def test_upset_moves_more_than_expected_win(self):
+        engine = TrueSkillRatings(tau=0.0, home_advantage=0.0)
+        engine.set_state("fav", 30.0, 2.0)
+        engine.set_state("dog", 20.0, 2.0)
+        expected = engine.update_period(1, [("fav", "dog", 100, 90)])[0]
+
+        engine.set_state("fav", 30.0, 2.0)
+        engine.set_state("dog", 20.0, 2.0)
+        upset = engine.update_period(2, [("fav", "dog", 90, 100)])[0]
+
+        self.assertGreater(expected["home_post"], 30.0)
+        self.assertLess(upset["home_post"], 30.0)
+        self.assertGreater(30.0 - upset["home_post"], expected["home_post"] - 30.0)
+        self.assertLess(upset["home_dev_post"], 2.0)
+
+    def test_dynamics_add_tau_to_variance_before_the_game(self):
+        engine = TrueSkillRatings(tau=1.0)
+        engine.set_state("x", 25.0, 3.0)
+        self.assertAlmostEqual(engine.state("x")[1], math.hypot(3.0, 1.0))
+        self.assertAlmostEqual(engine.pre_game(25.0, 3.0, None, None, None)[1], math.hypot(3.0, 1.0))
@@ -47,15 +47,18 @@ def _score(candidate):
     return candidate.get("probability", 0)
 
 
-def _predict_matchup_for_market(home_team_id, away_team_id, as_of_date, market):
+def _predict_matchup_for_market(home_team_id, away_team_id, as_of_date, market, features=None):
+    from features.engine.batch import TARGET_KEYS
     from predictions.inference import get_features_for_matchup, load_model, predict_proba
 
-    features = get_features_for_matchup(
+    features = features or get_features_for_matchup(
         home_team_id=str(home_team_id),
         away_team_id=str(away_team_id),
         as_of_date=as_of_date,
         market=market,
     )
+    # Los vectores guardados de partidos jugados llevan el resultado: fuera
+    features = {k: v for k, v in features.items() if k not in TARGET_KEYS}
     if not features:
         return None, {}
 
@@ -78,11 +81,13 @@ def _team_label(team_id):
 
 
 def _build_candidates(home_team_id, away_team_id, market, as_of_date,
-                      odds_home=None, odds_away=None, risk_threshold=0.58):
+                      odds_home=None, odds_away=None, risk_threshold=0.58, features=None):
     home_name = _team_label(home_team_id)
     away_name = _team_label(away_team_id)
 
-    prob_home, _ = _predict_matchup_for_market(home_team_id, away_team_id, as_of_date, market)
+    prob_home, _ = _predict_matchup_for_market(
+        home_team_id, away_team_id, as_of_date, market, features=features
+    )
     if prob_home is None:
         return []
 
@@ -250,6 +255,36 @@ def run_discovery(matchday_json, market, n_top, risk_level):
         return [], [f"JSON inválido: {e}"]
 
     all_candidates = []
+    markets = BINARY_MARKETS if market == "all" else [market]
+
+    # Partidos con game_id: features precalculadas en un solo acceso por mercado
+    game_ids = [
+        str(m["game_id"]) for m in matchday if isinstance(m, dict) and m.get("game_id")
+    ]
+    stored = {}
+    stored_games = {}
+    if game_ids:
+        from core.models import Game
+        from predictions.inference import get_features_for_games
+        from predictions.registry import MARKET_REGISTRY
+
+        # Las features se guardan por feature_market (winner_match → moneyline)
+        feature_markets = {
+            mkt: MARKET_REGISTRY.get(mkt, {}).get("feature_market", mkt) for mkt in markets
+        }
+        for feature_market in dict.fromkeys(feature_markets.values()):
+            try:
+                stored[feature_market] = get_features_for_games(game_ids, market=feature_market)
+            except Exception as exc:
+                logger.warning(
+                    "discovery stored features error market=%s: %s", feature_market, exc
+                )
+        stored = {mkt: stored.get(fm, {}) for mkt, fm in feature_markets.items()}
+        stored_games = {
+            gid: (str(home), str(away), game_date)
+            for gid, home, away, game_date in Game.objects.filter(game_id__in=game_ids)
+            .values_list("game_id", "home_team_id", "away_team_id", "date")
+        }
 
     for i, match in enumerate(matchday):
         if not isinstance(match, dict):
@@ -271,7 +306,10 @@ def run_discovery(matchday_json, market, n_top, risk_level):
 
         odds_home = match.get("odds_home")
         odds_away = match.get("odds_away")
-        markets = BINARY_MARKETS if market == "all" else [market]
+
+        # Features guardadas solo si el partido es el mismo enfrentamiento y fecha
+        game_id = str(match.get("game_id") or "")
+        use_stored = stored_games.get(game_id) == (str(home_id), str(away_id), as_of_date)
 
         for mkt in markets:
             try:
@@ -279,6 +317,7 @@ def run_discovery(matchday_json, market, n_top, risk_level):
                     home_id, away_id, mkt, as_of_date,
                     odds_home=odds_home, odds_away=odds_away,
                     risk_threshold=risk_threshold,
+                    features=stored.get(mkt, {}).get(game_id) if use_stored else None,
                 )
                 all_candidates.extend(candidates)
             except Exception as exc:
@@ -30,6 +30,7 @@ def run_walk_forward_backtest(
         if stdout:
             stdout.write(msg + "\n")
 
+    from features.engine.base import get_game_features_many
     from features.models import GameFeatureSet
     from core.models import Game
     from predictions.train import (
@@ -38,21 +39,32 @@ def run_walk_forward_backtest(
         train_xgboost_classifier,
         platt_scaling,
     )
-    from predictions.inference import load_model, predict_proba
+    from predictions.inference import load_model, predict_proba, predict_proba_matrix
+    from features.engine.columnar import load_market
 
     market_type = get_market_type(market)
     results_by_year = {}
 
+    # Dataset columnar del mercado: todas las temporadas en una sola lectura
+    dataset = load_market(market, season_type)
+    if dataset is not None:
+        log(f"[backtest] Dataset columnar: {len(dataset)} partidos")
+
     for year in range(start_year, end_year + 1):
         log(f"\n[backtest] Año: {year}")
 
         # Feature sets del año actual
-        qs_eval = GameFeatureSet.objects.filter(
-            market=market,
-            season=str(year),
-        ).exclude(features={})
-
-        if not qs_eval.exists():
+        if dataset is not None:
+            rows = np.flatnonzero(dataset.seasons == str(year))
+            has_data = len(rows) > 0
+        else:
+            qs_eval = GameFeatureSet.objects.filter(
+                market=market,
+                season=str(year),
+            ).exclude(features={})
+            has_data = qs_eval.exists()
+
+        if not has_data:
             log(f"[backtest]   Sin datos para {year}. Saltando.")
             continue
 
@@ -83,27 +95,48 @@ def run_walk_forward_backtest(
         feature_names = model_payload.get("feature_names", [])
 
         # Evaluar
-        y_true = []
-        y_pred_probs = []
-        roi_series = []
-
-        for fs in qs_eval.iterator():
-            game = Game.objects.filter(game_id=fs.game_id).first()
-            if not game or game.home_score is None:
-                continue
-
-            true_home_win = 1 if (game.home_score or 0) > (game.away_score or 0) else 0
-            prob = predict_proba(fs.features, model_payload, feature_names)
-            if prob is None:
-                continue
-
-            y_true.append(true_home_win)
-            y_pred_probs.append(prob)
-
+        if dataset is not None:
+            home = dataset.column("home_pts")[rows]
+            away = dataset.column("away_pts")[rows]
+            scored = ~(np.isnan(home) | np.isnan(away))
+            X = dataset.select(feature_names, fillna=0.0)[rows[scored]]
+            probs = predict_proba_matrix(X, model_payload) if len(X) else None
+            if probs is None:
+                y_true, y_pred_probs = [], []
+            else:
+                y_true = (home[scored] > away[scored]).astype(int).tolist()
+                y_pred_probs = probs.tolist()
             # ROI simulado: apostar si prob > 0.55, cuota implícita
-            if prob > 0.55:
-                ev = prob * (1 / prob - 1) - (1 - prob)
-                roi_series.append(ev)
+            roi_series = [
+                prob * (1 / prob - 1) - (1 - prob) for prob in y_pred_probs if prob > 0.55
+            ]
+        else:
+            y_true = []
+            y_pred_probs = []
+            roi_series = []
+
+            game_ids = list(qs_eval.values_list("game_id", flat=True))
+            features_by_game = get_game_features_many(game_ids, market)
+            games = Game.objects.in_bulk(game_ids)
+
+            for game_id in game_ids:
+                game = games.get(game_id)
+                features = features_by_game.get(game_id)
+                if not game or game.home_score is None or not features:
+                    continue
+
+                true_home_win = 1 if (game.home_score or 0) > (game.away_score or 0) else 0
+                prob = predict_proba(features, model_payload, feature_names)
+                if prob is None:
+                    continue
+
+                y_true.append(true_home_win)
+                y_pred_probs.append(prob)
+
+                # ROI simulado: apostar si prob > 0.55, cuota implícita
+                if prob > 0.55:
+                    ev = prob * (1 / prob - 1) - (1 - prob)
+                    roi_series.append(ev)
 
         n = len(y_true)
         if n == 0:
@@ -32,13 +32,20 @@ def get_features_for_game(game_id, market="base"):
     return get_game_features(game_id, market=market)
 
 
+def get_features_for_games(game_ids, market="base"):
+    """Carga features de varios partidos de una vez (Redis MGET + una consulta DB)."""
+    from features.engine.base import get_game_features_many
+    return get_game_features_many(game_ids, market=market)
+
+
 def get_features_for_matchup(home_team_id, away_team_id, as_of_date=None, market="moneyline"):
     """
     Calcula features para un matchup sin partido en BD.
-    Usa historial anterior a as_of_date.
+    Usa historial anterior a as_of_date (estados materializados TeamDailyState),
+    con caché LRU + Redis invalidada al sincronizar partidos de cualquiera de los equipos.
     """
-    from features.engine.matchup import compute_features_for_matchup
-    return compute_features_for_matchup(
+    from features.engine.matchup_cache import get_matchup_features
+    return get_matchup_features(
         home_team_id=home_team_id,
         away_team_id=away_team_id,
         as_of_date=as_of_date,
@@ -52,26 +59,35 @@ def predict_proba(features_dict, model_payload, feature_names):
     """
     import numpy as np
     X = np.array([[float(features_dict.get(k, 0.0)) for k in feature_names]], dtype=np.float64)
+    probs = predict_proba_matrix(X, model_payload)
+    return None if probs is None else float(probs[0])
+
+
+def predict_proba_matrix(X, model_payload):
+    """
+    Probabilidades para una matriz (filas = partidos, columnas en el orden de
+    `feature_names` del modelo) en una sola llamada, con calibración si existe.
+    """
+    import numpy as np
     model = model_payload.get("model")
     if model is None:
         return None
     try:
         import xgboost as xgb
-        d = xgb.DMatrix(X)
-        p = model.predict(d)[0]
+        p = np.asarray(model.predict(xgb.DMatrix(X)), dtype=np.float64)
     except Exception:
         try:
-            p = float(model.predict_proba(X)[0, 1])
+            p = np.asarray(model.predict_proba(X)[:, 1], dtype=np.float64)
         except Exception:
             return None
 
     platt = model_payload.get("platt")
-    if platt is not None:
+    if platt is not None and len(p):
         eps = 1e-6
         p = np.clip(p, eps, 1 - eps)
-        logit = np.log(p / (1 - p)).reshape(1, -1)
-        p = platt.predict_proba(logit)[0, 1]
-    return float(p)
+        logit = np.log(p / (1 - p)).reshape(-1, 1)
+        p = platt.predict_proba(logit)[:, 1]
+    return p
 
 
 def ev_vs_odds(prob_home_win, odds_home, odds_away):
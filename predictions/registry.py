@@ -314,6 +314,12 @@ DERIVED_MARKETS: set[str] = {
     k for k, v in MARKET_REGISTRY.items() if v.get("kind") == DERIVED
 }
 
+# feature_market únicos de los mercados PRIMARY, en orden de registro
+FEATURE_MARKETS: list[str] = list(dict.fromkeys(
+    v["feature_market"] for v in MARKET_REGISTRY.values()
+    if v.get("kind") == PRIMARY and v.get("feature_market")
+))
+
 
 def get_primary_market(market: str) -> str | None:
     """
@@ -332,6 +338,24 @@ def get_primary_market(market: str) -> str | None:
     return derived_from
 
 
+_SCORE_TARGETS = ("home_win", "total", "home_score", "away_score", "margin")
+
+
+def _score_target(h, a, target: str) -> float | None:
+    """Targets que salen del marcador final de Game."""
+    if target == "home_win":
+        return (1.0 if h > a else 0.0) if (h is not None and a is not None) else None
+    if target == "total":
+        return float(h + a) if (h is not None and a is not None) else None
+    if target == "home_score":
+        return float(h) if h is not None else None
+    if target == "away_score":
+        return float(a) if a is not None else None
+    if target == "margin":
+        return float(h - a) if (h is not None and a is not None) else None
+    return None
+
+
 def extract_target(game_id: str, target: str) -> float | None:
     """
     Extrae el valor de entrenamiento (label) para un partido y tipo de target.
@@ -343,19 +367,8 @@ def extract_target(game_id: str, target: str) -> float | None:
         if not game:
             return None
 
-        h = game.home_score
-        a = game.away_score
-
-        if target == "home_win":
-            return (1.0 if h > a else 0.0) if (h is not None and a is not None) else None
-        if target == "total":
-            return float(h + a) if (h is not None and a is not None) else None
-        if target == "home_score":
-            return float(h) if h is not None else None
-        if target == "away_score":
-            return float(a) if a is not None else None
-        if target == "margin":
-            return float(h - a) if (h is not None and a is not None) else None
+        if target in _SCORE_TARGETS:
+            return _score_target(game.home_score, game.away_score, target)
 
         return _extract_summary_target(game, target)
 
@@ -364,58 +377,121 @@ def extract_target(game_id: str, target: str) -> float | None:
         return None
 
 
-def _extract_summary_target(game, target: str) -> float | None:
-    """Targets que requieren GameSummary (cuartos, mitades, OT, etc.)."""
-    try:
+_PERIOD_FIELDS = ("q1", "q2", "q3", "q4", "ot1")
+
+
+def _period_points(games) -> dict:
+    """
+    Puntos por período de local y visitante: {game_id: (home, away)}, con cada
+    lado como dict q1..q4/ot1. Lee GamePeriodLine en una consulta; los partidos
+    sin filas (aún no sincronizados) se buscan en GameSummary.
+    """
+    from core.models import GamePeriodLine
+
+    games = [g for g in games if g.home_team_id and g.away_team_id]
+    by_pk = {g.pk: g for g in games}
+    sides: dict = {}
+    for row in GamePeriodLine.objects.filter(game_id__in=list(by_pk)).values(
+        "game_id", "team_id", *_PERIOD_FIELDS
+    ):
+        sides[(row["game_id"], row["team_id"])] = row
+
+    out = {}
+    missing = []
+    for g in games:
+        h = sides.get((g.pk, g.home_team_id))
+        a = sides.get((g.pk, g.away_team_id))
+        if h and a:
+            out[g.game_id] = (h, a)
+        else:
+            missing.append(g)
+
+    if missing:
         from game.models import GameSummary
 
-        home_abb = game.home_team.abbreviation if game.home_team else None
-        away_abb = game.away_team.abbreviation if game.away_team else None
-        if not home_abb or not away_abb:
-            return None
+        summaries = {}
+        for row in GameSummary.objects.filter(
+            game_id__in=[g.game_id for g in missing]
+        ).values("game_id", "team_abb", *_PERIOD_FIELDS):
+            summaries.setdefault((row["game_id"], row["team_abb"]), row)
+        for g in missing:
+            h = summaries.get((g.game_id, g.home_team.abbreviation))
+            a = summaries.get((g.game_id, g.away_team.abbreviation))
+            if h and a:
+                out[g.game_id] = (h, a)
+    return out
+
+
+def _summary_targets(home: dict, away: dict) -> dict:
+    """Tabla de targets por período (cuartos, mitades, OT…) de un partido."""
+    h = {q: home.get(q) or 0 for q in _PERIOD_FIELDS}
+    a = {q: away.get(q) or 0 for q in _PERIOD_FIELDS}
+
+    h1_home = h["q1"] + h["q2"]
+    h1_away = a["q1"] + a["q2"]
+    h2_home = h["q3"] + h["q4"]
+    h2_away = a["q3"] + a["q4"]
+
+    return {
+        # Mitades
+        "h1_home_win": 1.0 if h1_home > h1_away else 0.0,
+        "h1_total":    float(h1_home + h1_away),
+        "h1_home":     float(h1_home),
+        "h1_away":     float(h1_away),
+        "h2_home_win": 1.0 if h2_home > h2_away else 0.0,
+        "h2_total":    float(h2_home + h2_away),
+        "h2_home":     float(h2_home),
+        "h2_away":     float(h2_away),
+        # Cuartos
+        **{f"q{i}_home_win": 1.0 if h[f"q{i}"] > a[f"q{i}"] else 0.0 for i in range(1, 5)},
+        **{f"q{i}_total": float(h[f"q{i}"] + a[f"q{i}"]) for i in range(1, 5)},
+        **{f"q{i}_home": float(h[f"q{i}"]) for i in range(1, 5)},
+        **{f"q{i}_away": float(a[f"q{i}"]) for i in range(1, 5)},
+        # Especiales de partido
+        "ot":              1.0 if h["ot1"] > 0 else 0.0,
+        "first_half_more": 1.0 if (h1_home + h1_away) >= (h2_home + h2_away) else 0.0,
+        "quarter_most":    float(max(range(1, 5), key=lambda i: h[f"q{i}"] + a[f"q{i}"])),
+        "home_win_all_q":  1.0 if all(h[f"q{i}"] > a[f"q{i}"] for i in range(1, 5)) else 0.0,
+        "home_win_both_h": 1.0 if (h1_home > h1_away and h2_home > h2_away) else 0.0,
+        # Requiere GamePlayByPlay — sin implementar todavía
+        "home_first_score": None,
+    }
 
-        home_s = GameSummary.objects.filter(game_id=game.game_id, team_abb=home_abb).first()
-        away_s = GameSummary.objects.filter(game_id=game.game_id, team_abb=away_abb).first()
-        if not home_s or not away_s:
-            return None
 
-        def _q(summary, field: str) -> int:
-            return getattr(summary, field, 0) or 0
-
-        h = {q: _q(home_s, q) for q in ("q1", "q2", "q3", "q4")}
-        a = {q: _q(away_s, q) for q in ("q1", "q2", "q3", "q4")}
-
-        h1_home = h["q1"] + h["q2"]
-        h1_away = a["q1"] + a["q2"]
-        h2_home = h["q3"] + h["q4"]
-        h2_away = a["q3"] + a["q4"]
-
-        table: dict[str, float | None] = {
-            # Mitades
-            "h1_home_win": 1.0 if h1_home > h1_away else 0.0,
-            "h1_total":    float(h1_home + h1_away),
-            "h1_home":     float(h1_home),
-            "h1_away":     float(h1_away),
-            "h2_home_win": 1.0 if h2_home > h2_away else 0.0,
-            "h2_total":    float(h2_home + h2_away),
-            "h2_home":     float(h2_home),
-            "h2_away":     float(h2_away),
-            # Cuartos
-            **{f"q{i}_home_win": 1.0 if h[f"q{i}"] > a[f"q{i}"] else 0.0 for i in range(1, 5)},
-            **{f"q{i}_total": float(h[f"q{i}"] + a[f"q{i}"]) for i in range(1, 5)},
-            **{f"q{i}_home": float(h[f"q{i}"]) for i in range(1, 5)},
-            **{f"q{i}_away": float(a[f"q{i}"]) for i in range(1, 5)},
-            # Especiales de partido
-            "ot":              1.0 if (_q(home_s, "ot1") > 0) else 0.0,
-            "first_half_more": 1.0 if (h1_home + h1_away) >= (h2_home + h2_away) else 0.0,
-            "quarter_most":    float(max(range(1, 5), key=lambda i: h[f"q{i}"] + a[f"q{i}"])),
-            "home_win_all_q":  1.0 if all(h[f"q{i}"] > a[f"q{i}"] for i in range(1, 5)) else 0.0,
-            "home_win_both_h": 1.0 if (h1_home > h1_away and h2_home > h2_away) else 0.0,
-            # Requiere GamePlayByPlay — sin implementar todavía
-            "home_first_score": None,
-        }
-        return table.get(target)
+def _extract_summary_target(game, target: str) -> float | None:
+    """Targets por período (cuartos, mitades, OT, etc.) desde GamePeriodLine."""
+    try:
+        points = _period_points([game]).get(game.game_id)
+        if points is None:
+            return None
+        return _summary_targets(*points).get(target)
 
     except Exception as exc:
         logger.warning("_extract_summary_target error: %s", exc)
         return None
+
+
+def extract_targets(game_ids, target: str, chunk_size: int = 1000) -> dict:
+    """
+    extract_target para muchos partidos con consultas por lote en vez de por
+    partido. Devuelve {game_id: valor o None}.
+    """
+    from core.models import Game
+
+    game_ids = [str(g) for g in game_ids]
+    out = dict.fromkeys(game_ids)
+    for i in range(0, len(game_ids), chunk_size):
+        try:
+            games = list(
+                Game.objects.select_related("home_team", "away_team")
+                .filter(game_id__in=game_ids[i:i + chunk_size])
+            )
+            if target in _SCORE_TARGETS:
+                for game in games:
+                    out[game.game_id] = _score_target(game.home_score, game.away_score, target)
+                continue
+            for game_id, points in _period_points(games).items():
+                out[game_id] = _summary_targets(*points).get(target)
+        except Exception as exc:
+            logger.warning("extract_targets error target=%s: %s", target, exc)
+    return out
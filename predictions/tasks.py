@@ -0,0 +1,59 @@
+"""Tareas Celery para el entrenamiento de modelos."""
+
+from celery import chord, shared_task
+
+
+def _model_dir(model_dir: str = ""):
+    from pathlib import Path
+
+    from django.conf import settings
+
+    return Path(model_dir or getattr(settings, "MODEL_STORAGE_PATH", settings.MEDIA_ROOT / "models"))
+
+
+@shared_task(name="predictions.train_market")
+def train_market(market, season_type="Regular_Season", model_dir=""):
+    """Entrena y guarda el modelo de un mercado PRIMARY."""
+    import io
+
+    from predictions.train import train_and_save
+
+    log = io.StringIO()
+    try:
+        ok, msg = train_and_save(
+            season_type=season_type,
+            market=market,
+            model_dir=_model_dir(model_dir),
+            stdout=log,
+        )
+    except Exception as exc:
+        ok, msg = False, f"Error entrenando {market}: {exc}"
+    return {"market": market, "season_type": season_type, "ok": ok, "message": msg}
+
+
+@shared_task(name="predictions.aggregate_training")
+def aggregate_training(results):
+    """Callback del chord: resumen de los entrenamientos."""
+    results = [r for r in results if r]
+    return {
+        "status": "ok",
+        "trained": [r["market"] for r in results if r["ok"]],
+        "failed": {r["market"]: r["message"] for r in results if not r["ok"]},
+    }
+
+
+@shared_task(name="predictions.train_markets_fanout")
+def train_markets_fanout(markets=None, season_type="Regular_Season", model_dir=""):
+    """
+    Orquestador: una tarea de entrenamiento por mercado (por defecto todos los
+    PRIMARY) y un chord que agrega los resultados.
+    """
+    if not markets:
+        from predictions.registry import MARKET_REGISTRY, PRIMARY
+        markets = [m for m, cfg in MARKET_REGISTRY.items() if cfg.get("kind") == PRIMARY]
+
+    season_type = season_type.replace(" ", "_")
+    result = chord(
+        train_market.s(market, season_type, model_dir) for market in markets
+    )(aggregate_training.s())
+    return {"status": "started", "chord_id": result.id, "markets": len(markets)}
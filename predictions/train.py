@@ -49,6 +49,58 @@ def build_xy_from_features(feature_sets, target_key="home_win", fillna=0.0):
     return X[valid], y[valid], all_keys
 
 
+# Targets que salen directamente del marcador (columnas home_pts/away_pts del dataset)
+_SCORE_TARGETS = {
+    "home_win": lambda h, a: (h > a).astype(np.float64),
+    "total": lambda h, a: h + a,
+    "home_score": lambda h, a: h,
+    "away_score": lambda h, a: a,
+    "margin": lambda h, a: h - a,
+}
+
+
+def matrix_targets(dataset, target_key):
+    """
+    Vector de targets alineado con las filas de un FeatureMatrix (NaN si no hay).
+    Los de marcador se calculan en bloque; el resto con extract_targets.
+    """
+    if target_key in _SCORE_TARGETS:
+        h = np.asarray(dataset.column("home_pts"), dtype=np.float64)
+        a = np.asarray(dataset.column("away_pts"), dtype=np.float64)
+        y = _SCORE_TARGETS[target_key](h, a)
+        y[np.isnan(h) | np.isnan(a)] = np.nan
+        return y
+
+    from predictions.registry import extract_targets
+    targets = extract_targets(dataset.game_ids, target_key)
+    return np.array([
+        np.nan if (t := targets.get(str(gid))) is None else t
+        for gid in dataset.game_ids
+    ], dtype=np.float64)
+
+
+def split_xy_from_matrix(dataset, target_key, fillna=0.0):
+    """
+    Split temporal 80/10/10 de un FeatureMatrix (filas ordenadas por fecha).
+    Devuelve (X_train, y_train, X_val, y_val, feature_names) con las columnas
+    que tienen algún valor en train, igual que build_xy_from_features.
+    """
+    y = matrix_targets(dataset, target_key)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    train_idx = valid[:int(n * 0.8)]
+    val_idx = valid[int(n * 0.8):int(n * 0.9)]
+
+    X_train = np.asarray(dataset.X[train_idx], dtype=np.float64)
+    keep = ~np.all(np.isnan(X_train), axis=0) if len(X_train) else np.zeros(0, dtype=bool)
+    feature_names = [c for c, k in zip(dataset.columns, keep) if k]
+    X_train = X_train[:, keep]
+    X_val = np.asarray(dataset.X[val_idx], dtype=np.float64)[:, keep]
+    X_train[np.isnan(X_train)] = fillna
+    X_val[np.isnan(X_val)] = fillna
+    return X_train, y[train_idx], X_val, y[val_idx], feature_names
+
+
 def train_xgboost_classifier(X_train, y_train, X_val, y_val, **kwargs):
     """Entrena XGBoost para clasificación (home_win binario)."""
     try:
@@ -148,7 +200,7 @@ def train_and_save(
 
     log(f"[train] Mercado: {market} | Tipo temporada: {season_type}")
 
-    from predictions.registry import MARKET_REGISTRY, PRIMARY, NOT_CONTEMPLATED, extract_target
+    from predictions.registry import MARKET_REGISTRY, PRIMARY, NOT_CONTEMPLATED, extract_targets
 
     registry_cfg = MARKET_REGISTRY.get(market, {})
     if registry_cfg.get("kind") == NOT_CONTEMPLATED:
@@ -160,48 +212,61 @@ def train_and_save(
     target_key = registry_cfg.get("target", "home_win")
     feature_market = registry_cfg.get("feature_market", market)
 
-    # Cargar feature sets
-    try:
-        from features.models import GameFeatureSet
-
-        qs = GameFeatureSet.objects.filter(
-            market=feature_market,
-            season_type__icontains=season_type.split("_")[0],
-        ).exclude(features={})
-
-        log(f"[train] Feature sets encontrados: {qs.count()}")
-        if qs.count() < 10:
-            return False, f"Insuficientes datos ({qs.count()} partidos) para {market}"
-
-        rows = []
-        for fs in qs.iterator():
-            target = extract_target(fs.game_id, target_key)
-            if target is None:
-                continue
-            rows.append({"features": fs.features, "target": target})
-
-    except Exception as exc:
-        return False, f"Error cargando features: {exc}"
-
-    if len(rows) < 10:
-        return False, f"Insuficientes partidos con resultado para {market}"
-
-    # Ordenar por fecha para split temporal
-    # Split 80/10/10
-    n = len(rows)
-    train_end = int(n * 0.8)
-    val_end = int(n * 0.9)
-
-    train_rows = rows[:train_end]
-    val_rows = rows[train_end:val_end]
-
-    target_key = "target"
-
-    try:
-        X_train, y_train, feature_names = build_xy_from_features(train_rows, target_key)
-        X_val, y_val, _ = build_xy_from_features(val_rows, target_key)
-    except Exception as exc:
-        return False, f"Error construyendo matrices: {exc}"
+    # Dataset columnar (compute_features): una lectura, ya ordenado por fecha
+    from features.engine.columnar import load_market
+
+    dataset = load_market(feature_market, season_type)
+    if dataset is not None and len(dataset) >= 10:
+        log(f"[train] Dataset columnar: {len(dataset)} partidos × {len(dataset.columns)} columnas")
+        try:
+            X_train, y_train, X_val, y_val, feature_names = split_xy_from_matrix(
+                dataset, target_key,
+            )
+        except Exception as exc:
+            return False, f"Error construyendo matrices: {exc}"
+    else:
+        # Cargar feature sets
+        try:
+            from features.models import GameFeatureSet
+
+            qs = GameFeatureSet.objects.filter(
+                market=feature_market,
+                season_type__icontains=season_type.split("_")[0],
+            ).exclude(features={})
+
+            log(f"[train] Feature sets encontrados: {qs.count()}")
+            if qs.count() < 10:
+                return False, f"Insuficientes datos ({qs.count()} partidos) para {market}"
+
+            feature_sets = list(qs)
+            targets = extract_targets([fs.game_id for fs in feature_sets], target_key)
+            rows = []
+            for fs in feature_sets:
+                target = targets.get(str(fs.game_id))
+                if target is None:
+                    continue
+                rows.append({"features": fs.features, "target": target})
+
+        except Exception as exc:
+            return False, f"Error cargando features: {exc}"
+
+        if len(rows) < 10:
+            return False, f"Insuficientes partidos con resultado para {market}"
+
+        # Ordenar por fecha para split temporal
+        # Split 80/10/10
+        n = len(rows)
+        train_end = int(n * 0.8)
+        val_end = int(n * 0.9)
+
+        train_rows = rows[:train_end]
+        val_rows = rows[train_end:val_end]
+
+        try:
+            X_train, y_train, feature_names = build_xy_from_features(train_rows, "target")
+            X_val, y_val, _ = build_xy_from_features(val_rows, "target")
+        except Exception as exc:
+            return False, f"Error construyendo matrices: {exc}"
 
     if len(X_train) == 0 or len(X_val) == 0:
         return False, "No hay suficientes datos con target válido"
@@ -1263,12 +1263,44 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
 OLLAMA_DEFAULT_MODEL = os.getenv("OLLAMA_DEFAULT_MODEL", "llama3.1:8b")
 OLLAMA_SECOND_MODEL = os.getenv("OLLAMA_SECOND_MODEL", "mistral:7b")
 
+# import_data: processes for independent import stages (1 = sequential; SQLite always sequential)
+IMPORT_DATA_WORKERS = int(os.getenv("IMPORT_DATA_WORKERS", "4"))
+
 # Model storage path (joblib serialized models)
 MODEL_STORAGE_PATH = os.getenv("MODEL_STORAGE_PATH", str(BASE_DIR / "models"))
 
+# Dense columnar feature datasets (.npy + JSON schema) per feature market / season type
+FEATURES_COLUMNAR_PATH = os.getenv(
+    "FEATURES_COLUMNAR_PATH", str(Path(MODEL_STORAGE_PATH) / "features")
+)
+
 # Feature cache prefix and TTL (seconds) for Redis
 FEATURES_CACHE_PREFIX = os.getenv("FEATURES_CACHE_PREFIX", "nba_features")
 FEATURES_CACHE_TTL = int(os.getenv("FEATURES_CACHE_TTL", "3600"))
+# Seconds before a process re-checks its cached feature schema against the Redis registry
+FEATURES_SCHEMA_CHECK_SECONDS = int(os.getenv("FEATURES_SCHEMA_CHECK_SECONDS", "60"))
+
+# Feature cache Redis client: pool, short socket timeouts and circuit breaker
+FEATURES_REDIS_URL = os.getenv("FEATURES_REDIS_URL", CELERY_BROKER_URL)
+FEATURES_REDIS_SOCKET_TIMEOUT = float(os.getenv("FEATURES_REDIS_SOCKET_TIMEOUT", "0.25"))
+FEATURES_REDIS_MAX_CONNECTIONS = int(os.getenv("FEATURES_REDIS_MAX_CONNECTIONS", "50"))
+FEATURES_REDIS_FAILURE_THRESHOLD = int(os.getenv("FEATURES_REDIS_FAILURE_THRESHOLD", "3"))
+FEATURES_REDIS_COOLDOWN_SECONDS = int(os.getenv("FEATURES_REDIS_COOLDOWN_SECONDS", "30"))
+
+# Ad-hoc matchup feature cache: Redis TTL, per-process LRU size and local revalidation (seconds)
+FEATURES_MATCHUP_CACHE_TTL = int(os.getenv("FEATURES_MATCHUP_CACHE_TTL", str(6 * 3600)))
+FEATURES_MATCHUP_LRU_SIZE = int(os.getenv("FEATURES_MATCHUP_LRU_SIZE", "2048"))
+FEATURES_MATCHUP_LOCAL_TTL = int(os.getenv("FEATURES_MATCHUP_LOCAL_TTL", "30"))
+
+# Seconds between incremental refreshes of the in-memory team game-log store
+FEATURES_STORE_REFRESH_SECONDS = int(os.getenv("FEATURES_STORE_REFRESH_SECONDS", "300"))
+
+# Team ratings (features.engine.ratings); changing them requires `build_ratings --full`
+FEATURES_ELO_K = float(os.getenv("FEATURES_ELO_K", "20"))
+FEATURES_ELO_HOME_ADVANTAGE = float(os.getenv("FEATURES_ELO_HOME_ADVANTAGE", "100"))
+FEATURES_ELO_SEASON_REGRESSION = float(os.getenv("FEATURES_ELO_SEASON_REGRESSION", "0.25"))
+# Glicko-2 volatility constraint (home advantage shared with Elo)
+FEATURES_GLICKO2_TAU = float(os.getenv("FEATURES_GLICKO2_TAU", "0.5"))
 
 # MLflow (optional)
 MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "")
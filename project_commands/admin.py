@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import ImportLedger
+
+
+@admin.register(ImportLedger)
+class ImportLedgerAdmin(admin.ModelAdmin):
+    list_display = ("csv_path", "target", "size", "byte_offset", "row_count", "updated_at")
+    list_filter = ("target",)
+    search_fields = ("csv_path",)
+    readonly_fields = ("size", "checksum", "byte_offset", "row_count", "updated_at")
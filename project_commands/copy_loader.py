@@ -0,0 +1,178 @@
+"""
+Carga de CSV en PostgreSQL con COPY (import_data).
+
+Cada CSV se vuelca tal cual (columnas texto) con COPY FROM STDIN a una tabla
+staging UNLOGGED y se fusiona en la tabla destino con un único INSERT … SELECT
+que hace en SQL las conversiones de safe_int/safe_float:
+- modelos con unique_together: ON CONFLICT (clave) DO NOTHING / DO UPDATE
+  (la última fila del CSV gana, como update_or_create fila a fila),
+- modelos sin restricción única: anti-join NOT EXISTS sobre la clave natural
+  (equivale al set de registros existentes que usa la ruta Python).
+
+Solo PostgreSQL; en otros backends (o si COPY falla) import_data usa la ruta
+Python de siempre.
+"""
+
+import csv
+import logging
+import os
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Tipos de columna: TEXT tal cual (NULL → ''), STR con strip y recorte a
+# max_length, INT/FLOAT como
+# safe_int/safe_float (vacío, '-' o inválido → 0), BOOL "true" exacto (sin strip),
+# FLAG como el parseo de booleanos del import genérico y SEASON_TYPE normalizado
+# (Regular+Season → regular-season).
+TEXT, STR, INT, FLOAT, BOOL, FLAG, SEASON_TYPE = (
+    "text", "str", "int", "float", "bool", "flag", "season_type",
+)
+
+_INT_RE = r"^[+-]?[0-9]+$"
+_FLOAT_RE = r"^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$"
+
+
+def copy_available() -> bool:
+    """True si la conexión por defecto es PostgreSQL (COPY FROM STDIN)."""
+    return connection.vendor == "postgresql"
+
+
+def csv_header(csv_path) -> list:
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def cast_expr(col: str, kind: str, max_length=None) -> str:
+    """Expresión SQL que convierte la columna texto `col` de staging."""
+    raw = f'"{col}"'
+    value = f"btrim({raw})"
+    if kind == INT:
+        expr = f"CASE WHEN {value} ~ '{_INT_RE}' THEN {value}::bigint ELSE 0 END"
+    elif kind == FLOAT:
+        expr = f"CASE WHEN {value} ~ '{_FLOAT_RE}' THEN {value}::double precision ELSE 0.0 END"
+    elif kind == BOOL:
+        expr = f"lower(coalesce({raw}, '')) = 'true'"
+    elif kind == FLAG:
+        expr = f"lower(coalesce({value}, '')) IN ('true', '1', 'yes', 'sí', 'si')"
+    elif kind == SEASON_TYPE:
+        expr = f"lower(replace(coalesce({value}, ''), '+', '-'))"
+    elif kind == STR:
+        expr = f"coalesce({value}, '')"
+    else:
+        expr = f"coalesce({raw}, '')"
+    if max_length and kind in (STR, SEASON_TYPE):
+        expr = f"left({expr}, {int(max_length)})"
+    return expr
+
+
+class _ProgressReader:
+    """Envuelve el fichero para COPY y avanza la barra por bytes leídos."""
+
+    def __init__(self, f, progress=None):
+        self.f = f
+        self.progress = progress
+
+    def read(self, size=-1):
+        chunk = self.f.read(size)
+        if self.progress is not None and chunk:
+            self.progress.update(len(chunk))
+        return chunk
+
+
+def _copy_into(cursor, table: str, columns, csv_path, progress=None):
+    quoted = ", ".join(f'"{c}"' for c in columns)
+    sql = f'COPY "{table}" ({quoted}) FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING \'UTF8\')'
+    with open(csv_path, "rb") as f:
+        reader = _ProgressReader(f, progress)
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(sql, reader, size=1 << 20)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                while chunk := reader.read(1 << 20):
+                    copy.write(chunk)
+
+
+def load_csv(csv_path, model, columns, key, mode="nothing", progress=None) -> dict:
+    """
+    Carga `csv_path` en la tabla de `model`.
+    - columns: [(campo, índice de columna del CSV o None, tipo)]; con None (o un
+      índice fuera de la cabecera) se inserta el default del campo.
+    - key: campos de la clave natural.
+    - mode: "nothing" (ON CONFLICT DO NOTHING), "update" (ON CONFLICT DO
+      UPDATE de las columnas del CSV) o "missing" (NOT EXISTS, para tablas sin
+      restricción única).
+    Devuelve {"rows": filas del CSV, "created": insertadas, "updated": actualizadas}.
+    """
+    meta = model._meta
+    header = csv_header(csv_path)
+    table = meta.db_table
+    stage = f"stage_{table}_{os.getpid()}"[:63]
+    stage_cols = [f"c{i}" for i in range(len(header))]
+
+    exprs, params, from_csv = [], [], []
+    for name, index, kind in columns:
+        field = meta.get_field(name)
+        if index is None or index >= len(header):
+            exprs.append(f'%s AS "{field.column}"')
+            params.append(field.get_default())
+            continue
+        expr = cast_expr(stage_cols[index], kind, getattr(field, "max_length", None))
+        exprs.append(f'{expr} AS "{field.column}"')
+        from_csv.append(field.column)
+
+    fields = [meta.get_field(name).column for name, _, _ in columns]
+    key = [meta.get_field(name).column for name in key]
+    key_cols = ", ".join(f'"{k}"' for k in key)
+    auto_add = [
+        f.column for f in meta.concrete_fields
+        if getattr(f, "auto_now_add", False) or getattr(f, "auto_now", False)
+    ]
+    auto_now = [f.column for f in meta.concrete_fields if getattr(f, "auto_now", False)]
+    insert_cols = ", ".join(f'"{c}"' for c in fields + auto_add)
+    select_cols = ", ".join([f's."{c}"' for c in fields] + ["now()"] * len(auto_add))
+
+    source = f'SELECT {", ".join(exprs)}, _row FROM "{stage}"'
+    where = tail = ""
+    updates = [f'"{c}" = EXCLUDED."{c}"' for c in from_csv if c not in key]
+    if mode == "update" and updates:
+        # Una fila por clave (la última del CSV): DO UPDATE no admite la misma clave dos veces
+        source = f"SELECT DISTINCT ON ({key_cols}) * FROM ({source}) c ORDER BY {key_cols}, _row DESC"
+        updates += [f'"{c}" = now()' for c in auto_now]
+        tail = f"ON CONFLICT ({key_cols}) DO UPDATE SET {', '.join(updates)}"
+    elif mode == "missing":
+        match = " AND ".join(f't."{k}" = s."{k}"' for k in key)
+        where = f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" t WHERE {match})'
+    else:
+        tail = f"ON CONFLICT ({key_cols}) DO NOTHING"
+
+    # xmax = 0 solo en las filas recién insertadas (no en las actualizadas por DO UPDATE)
+    merge = (
+        f'WITH merged AS (INSERT INTO "{table}" ({insert_cols}) '
+        f"SELECT {select_cols} FROM ({source}) s {where} {tail} RETURNING (xmax = 0) AS created) "
+        "SELECT count(*) FILTER (WHERE created), count(*) FILTER (WHERE NOT created) FROM merged"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE UNLOGGED TABLE "{stage}" (_row bigserial, '
+            + ", ".join(f'"{c}" text' for c in stage_cols) + ")"
+        )
+        try:
+            _copy_into(cursor, stage, stage_cols, csv_path, progress)
+            cursor.execute(f'SELECT count(*) FROM "{stage}"')
+            rows = cursor.fetchone()[0]
+            cursor.execute(f'ANALYZE "{stage}"')
+            with transaction.atomic():
+                if mode == "missing":
+                    # Anti-join con hash: con un nested loop (destino vacío según sus
+                    # estadísticas) cada fila re-escanea el destino, incluidas las que
+                    # el propio INSERT va añadiendo, y la carga se vuelve cuadrática
+                    cursor.execute("SET LOCAL enable_nestloop = off")
+                cursor.execute(merge, params or None)
+                created, updated = cursor.fetchone()
+        finally:
+            cursor.execute(f'DROP TABLE IF EXISTS "{stage}"')
+    return {"rows": rows, "created": created, "updated": updated}
@@ -0,0 +1,145 @@
+"""
+Lectura tipada de CSV con Polars (import_data, ruta sin COPY).
+
+El CSV se lee por bloques de bytes (cortados en fin de línea fuera de
+comillas) y cada bloque se parsea con Polars, multihilo, con todas las
+columnas como texto; las conversiones de safe_int/safe_float se hacen con
+expresiones sobre la columna entera (strip, '-'/vacío/inválido → null → 0).
+Las columnas se describen igual que en copy_loader: (campo, índice, tipo).
+
+Las líneas en blanco y las filas con menos de `min_columns` campos se
+descartan (como csv.reader y el `if len(row) < n: continue` de la lectura fila
+a fila); Polars las rellenaría con nulos. Solo en los bloques con alguna fila
+nula desde la última columna exigida se cuentan los campos y se vuelve a parsear.
+
+La barra de progreso avanza por bytes leídos, sin contar líneas antes.
+"""
+
+import numpy as np
+import polars as pl
+
+from project_commands.copy_loader import BOOL, FLAG, FLOAT, INT, SEASON_TYPE, STR, csv_header
+
+CHUNK_BYTES = 16 << 20
+
+
+def column_expr(col: str, kind: str, max_length=None) -> pl.Expr:
+    """Expresión Polars que convierte la columna texto `col` (equivale a cast_expr)."""
+    raw = pl.col(col)
+    value = raw.str.strip_chars()
+    if kind == INT:
+        expr = value.cast(pl.Int64, strict=False).fill_null(0)
+    elif kind == FLOAT:
+        expr = value.cast(pl.Float64, strict=False).fill_null(0.0)
+    elif kind == BOOL:
+        expr = raw.fill_null("").str.to_lowercase() == "true"
+    elif kind == FLAG:
+        expr = value.fill_null("").str.to_lowercase().is_in(["true", "1", "yes", "sí", "si"])
+    elif kind == SEASON_TYPE:
+        expr = value.fill_null("").str.replace_all("+", "-", literal=True).str.to_lowercase()
+    elif kind == STR:
+        expr = value.fill_null("")
+    else:
+        expr = raw.fill_null("")
+    if max_length and kind in (STR, SEASON_TYPE):
+        expr = expr.str.slice(0, int(max_length))
+    return expr
+
+
+def _blocks(f, chunk_bytes):
+    """(bloque, bytes leídos) con bloques terminados en fin de línea fuera de comillas."""
+    rest = b""
+    read = 0
+    while True:
+        data = f.read(chunk_bytes)
+        read += len(data)
+        if not data:
+            if rest.strip():
+                yield rest, read
+            return
+        block = rest + data
+        cut = block.rfind(b"\n")
+        # Un salto de línea dentro de un campo entrecomillado no cierra la fila
+        while cut != -1 and block.count(b'"', 0, cut) % 2:
+            cut = block.rfind(b"\n", 0, cut)
+        if cut == -1:
+            rest = block
+            continue
+        rest = block[cut + 1:]
+        yield block[:cut + 1], read
+        read = 0
+
+
+def _complete_rows(block: bytes, min_columns: int) -> bytes:
+    """
+    `block` sin las filas de menos de `min_columns` campos (comas fuera de
+    comillas + 1; una línea en blanco tiene 0, como en csv.reader).
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    quotes = np.flatnonzero(data == ord('"'))
+    newlines = np.flatnonzero(data == ord("\n"))
+    commas = np.flatnonzero(data == ord(","))
+    if len(quotes):
+        # Con un número impar de comillas antes, la posición está dentro de un campo
+        newlines = newlines[np.searchsorted(quotes, newlines) % 2 == 0]
+        commas = commas[np.searchsorted(quotes, commas) % 2 == 0]
+    ends = newlines + 1
+    if not len(ends) or ends[-1] != len(block):
+        ends = np.append(ends, len(block))
+    starts = np.concatenate(([0], ends[:-1]))
+    fields = np.bincount(np.searchsorted(ends, commas, side="right"), minlength=len(ends)) + 1
+    lengths = ends - starts
+    blank = (lengths == 1) | ((lengths == 2) & (data[starts] == ord("\r")))
+    fields[blank & (data[ends - 1] == ord("\n"))] = 0
+    keep = fields >= min_columns
+    if keep.all():
+        return block
+    return b"".join(block[start:end] for start, end in zip(starts[keep], ends[keep]))
+
+
+def read_batches(csv_path, columns, model=None, chunk_bytes=CHUNK_BYTES, progress=None,
+                 min_columns=0):
+    """
+    Genera DataFrames con una columna por campo de `columns` ([(campo, índice o
+    None, tipo)]), ya tipados. Con índice None (o fuera de la cabecera y de
+    `min_columns`) la columna toma el default del campo de `model`. Las líneas en
+    blanco y las filas de menos de `min_columns` campos se descartan; las demás
+    filas cortas dejan vacías las columnas que faltan.
+    """
+    meta = model._meta if model is not None else None
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        if progress is not None:
+            progress.update(len(header))
+        width = len(csv_header(csv_path))
+        if not width:
+            return
+        width = max(width, min_columns)
+
+        exprs = []
+        for name, index, kind in columns:
+            field = meta.get_field(name) if meta is not None else None
+            if index is None or index >= width:
+                exprs.append(pl.lit(field.get_default() if field is not None else None).alias(name))
+                continue
+            max_length = getattr(field, "max_length", None)
+            exprs.append(column_expr(f"c{index}", kind, max_length).alias(name))
+
+        # Cabecera c0..cN delante de cada bloque: fija el ancho aunque la primera fila sea corta
+        names = ",".join(f"c{i}" for i in range(width)).encode() + b"\n"
+        min_columns = max(min_columns, 1)
+        # Una fila corta deja nulas todas las columnas desde la última exigida
+        short = pl.all_horizontal(
+            pl.col(f"c{i}").is_null() for i in range(min_columns - 1, width)
+        ).any()
+        for block, size in _blocks(f, chunk_bytes):
+            frame = pl.read_csv(names + block, infer_schema=False, truncate_ragged_lines=True)
+            # Puede ser una fila corta o una con esos campos vacíos: solo entonces
+            # se cuentan los campos de cada fila y se vuelve a parsear
+            if frame.select(short).item():
+                block = _complete_rows(block, min_columns)
+                frame = pl.read_csv(names + block, infer_schema=False, truncate_ragged_lines=True)
+            if progress is not None:
+                progress.update(size)
+            if frame.height:
+                yield frame.select(exprs)
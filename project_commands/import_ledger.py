@@ -0,0 +1,141 @@
+"""
+Importación incremental de CSV (import_data) con el registro ImportLedger.
+
+Por cada (CSV, modelo destino) se guarda el tamaño, el SHA-256 de los bytes
+importados y hasta qué byte se importó. En la siguiente ejecución:
+- mismo tamaño y mismo checksum → el CSV se salta,
+- más grande y los primeros `byte_offset` bytes con el mismo checksum (y
+  terminados en fin de línea) → solo se importa la cola añadida, en un CSV
+  temporal con la cabecera original delante,
+- cualquier otro caso (reescrito, truncado, sin registro o --force) → completo.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+SKIP, APPEND, FULL = "skip", "append", "full"
+
+HASH_BLOCK = 1 << 20
+
+
+@dataclass
+class ImportPlan:
+    """Qué hacer con un CSV; `imported` lo rellena import_data al terminar."""
+
+    csv_path: str
+    target: str
+    action: str
+    size: int
+    checksum: str
+    offset: int = 0
+    rows: int = 0
+    path: str = ""
+    imported: int = None
+
+
+def _ledger_key(csv_path) -> str:
+    return os.path.normpath(csv_path)
+
+
+def _blocks(f, n):
+    """Hasta `n` bytes de `f` desde su posición actual, por bloques."""
+    while n > 0:
+        block = f.read(min(HASH_BLOCK, n))
+        if not block:
+            return
+        n -= len(block)
+        yield block
+
+
+def _digests(csv_path, offset, size):
+    """
+    (sha256 de los primeros `offset` bytes, sha256 de los primeros `size`
+    bytes, último byte antes de `offset`) en una sola pasada.
+    """
+    digest = hashlib.sha256()
+    last = b""
+    with open(csv_path, "rb") as f:
+        for block in _blocks(f, offset):
+            digest.update(block)
+            last = block[-1:]
+        prefix = digest.hexdigest()
+        for block in _blocks(f, size - offset):
+            digest.update(block)
+    return prefix, digest.hexdigest(), last
+
+
+def plan_import(csv_path, target, force=False) -> ImportPlan:
+    """Compara `csv_path` con su registro para `target` (label del modelo)."""
+    from project_commands.models import ImportLedger
+
+    size = os.path.getsize(csv_path)
+    entry = None if force else ImportLedger.objects.filter(
+        csv_path=_ledger_key(csv_path), target=target
+    ).first()
+    offset = entry.byte_offset if entry is not None and 0 < entry.byte_offset <= size else 0
+    prefix, checksum, last = _digests(csv_path, offset, size)
+
+    plan = ImportPlan(csv_path=csv_path, target=target, action=FULL, size=size, checksum=checksum)
+    if entry is None or not offset or prefix != entry.checksum:
+        return plan
+    plan.rows = entry.row_count
+    if offset == size:
+        plan.action = SKIP
+    elif last == b"\n":
+        plan.action = APPEND
+        plan.offset = offset
+    return plan
+
+
+@contextmanager
+def source_file(plan: ImportPlan):
+    """
+    Ruta a importar para `plan`: el CSV tal cual o, si solo se añadieron filas,
+    un temporal con el mismo nombre (las reglas de import_data miran el nombre)
+    con la cabecera y los bytes nuevos.
+    """
+    if plan.action != APPEND:
+        yield plan.csv_path
+        return
+    tmpdir = tempfile.mkdtemp(prefix="import_ledger_")
+    path = os.path.join(tmpdir, os.path.basename(plan.csv_path))
+    try:
+        with open(plan.csv_path, "rb") as src, open(path, "wb") as dst:
+            dst.write(src.readline())
+            src.seek(plan.offset)
+            for block in _blocks(src, plan.size - plan.offset):
+                dst.write(block)
+        yield path
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def record_import(plan: ImportPlan):
+    """Guarda en el registro lo importado (hasta plan.size) si plan.imported está fijado."""
+    from project_commands.models import ImportLedger
+
+    if plan.imported is None:
+        return
+    rows = plan.imported + (plan.rows if plan.action == APPEND else 0)
+    ImportLedger.objects.update_or_create(
+        csv_path=_ledger_key(plan.csv_path),
+        target=plan.target,
+        defaults={
+            "size": plan.size,
+            "checksum": plan.checksum,
+            "byte_offset": plan.size,
+            "row_count": rows,
+        },
+    )
+
+
+def clear_ledger() -> int:
+    """Vacía el registro (tras drop_data, para que import_data recargue todo)."""
+    from project_commands.models import ImportLedger
+
+    deleted, _ = ImportLedger.objects.all().delete()
+    return deleted
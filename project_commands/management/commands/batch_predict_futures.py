@@ -24,8 +24,14 @@ class Command(BaseCommand):
         self.stdout.write(f"[batch_predict] Temporada: {season or 'actual'} | Mercado: {market}")
 
         from core.models import Game
-        from predictions.inference import get_features_for_matchup, load_model, predict_proba
+        from predictions.inference import (
+            get_features_for_games,
+            get_features_for_matchup,
+            load_model,
+            predict_proba,
+        )
         from predictions.models import PredictionLog
+        from predictions.registry import MARKET_REGISTRY
 
         today = date.today()
         qs = Game.objects.filter(
@@ -47,9 +53,14 @@ class Command(BaseCommand):
         count = 0
         errors = 0
 
-        for game in qs.select_related("home_team", "away_team").iterator():
+        # Features precalculadas (compute_features) de todos los partidos en un solo acceso
+        games = list(qs.select_related("home_team", "away_team"))
+        feature_market = MARKET_REGISTRY.get(market, {}).get("feature_market", market)
+        stored = get_features_for_games([g.game_id for g in games], market=feature_market)
+
+        for game in games:
             try:
-                features = get_features_for_matchup(
+                features = stored.get(game.game_id) or get_features_for_matchup(
                     home_team_id=game.home_team.team_id,
                     away_team_id=game.away_team.team_id,
                     as_of_date=game.date or today,
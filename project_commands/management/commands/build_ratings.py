@@ -0,0 +1,34 @@
+"""
+Calcula/amplía los ratings de equipo por partido (TeamRating).
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Ratings Elo/Glicko-2/TrueSkill de equipo partido a partido (TeamRating), incremental por defecto"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recalcular desde el primer partido")
+        parser.add_argument(
+            "--system", type=str, default=None,
+            help="Sistema de rating (elo, glicko2, trueskill); por defecto todos",
+        )
+
+    def handle(self, *args, **options):
+        from features.engine.ratings import RATING_SYSTEMS, build_ratings
+
+        systems = [options["system"]] if options["system"] else list(RATING_SYSTEMS)
+        mode = "completo" if options["full"] else "incremental"
+        for system in systems:
+            self.stdout.write(f"[build_ratings] Sistema: {system} | Modo: {mode}")
+
+            result = build_ratings(system=system, full=options["full"])
+
+            if not result["games"]:
+                self.stdout.write(self.style.SUCCESS("✅ Ratings al día"))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Partidos procesados: {result['games']} (desde {result['since'] or 'el inicio'}), "
+                f"equipos: {len(result['teams'])}"
+            ))
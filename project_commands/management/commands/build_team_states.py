@@ -0,0 +1,34 @@
+"""
+Construye/amplía los estados diarios por equipo (TeamDailyState).
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Materializa el estado rolling pre-partido de cada equipo por fecha"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recalcular todas las fechas")
+        parser.add_argument(
+            "--since", type=str, default="",
+            help="Recalcular desde esta fecha (YYYY-MM-DD), p. ej. tras corregir partidos",
+        )
+        parser.add_argument("--team-id", type=str, default="", help="Solo un equipo (opcional)")
+
+    def handle(self, *args, **options):
+        from datetime import date
+
+        from features.engine.team_state import build_team_daily_states
+
+        since = date.fromisoformat(options["since"]) if options["since"] else None
+        team_ids = [options["team_id"]] if options["team_id"] else None
+        mode = "completo" if options["full"] else (f"desde {since}" if since else "incremental")
+        self.stdout.write(f"[build_team_states] Modo: {mode}")
+
+        result = build_team_daily_states(since=since, full=options["full"], team_ids=team_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Estados escritos: {result['written']}, sin cambios: {result['skipped']}, "
+            f"borrados: {result['deleted']}"
+        ))
@@ -4,6 +4,30 @@ Calcula features por partido/mercado NBA y las guarda en DB/Redis.
 
 from django.core.management.base import BaseCommand
 
+ENGINES = ("per-game", "vectorized")
+
+
+# Estado compartido con los procesos hijos (heredado por fork, sin serializar)
+_worker_state = {}
+
+
+def _init_worker(markets, plan, store, to_redis):
+    _worker_state.update(markets=markets, plan=plan, store=store, to_redis=to_redis)
+
+
+def _compute_partition(game_ids):
+    """
+    Tarea de un proceso del pool: calcula un tramo de partidos con su propia
+    conexión a DB y lo escribe en bloque. Devuelve un resumen serializable.
+    """
+    from django.db import connection
+    from features.engine.batch import compute_game_ids
+
+    try:
+        return compute_game_ids(game_ids, **_worker_state)
+    finally:
+        connection.close()
+
 
 class Command(BaseCommand):
     help = "Calcula features NBA por partido y mercado"
@@ -11,81 +35,223 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--season", type=str, default="", help="Temporada (ej. 2025)")
         parser.add_argument("--season-type", type=str, default="Regular Season", help="Tipo temporada")
-        parser.add_argument("--market", type=str, default="base", help="Mercado (moneyline, totals, spread, etc.)")
+        parser.add_argument(
+            "--market", type=str, default="base",
+            help="Mercado o lista separada por comas (moneyline,totals,spread,...)",
+        )
+        parser.add_argument(
+            "--all-markets", action="store_true",
+            help="Todos los feature markets de los mercados PRIMARY en una sola pasada",
+        )
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Solo partidos nuevos/cambiados y los que los incluyen en sus ventanas o H2H",
+        )
         parser.add_argument("--game-id", type=str, default="", help="Solo un partido (opcional)")
         parser.add_argument("--limit", type=int, default=0, help="Límite de partidos")
         parser.add_argument("--to-redis", action="store_true", help="Escribir también en Redis")
+        parser.add_argument(
+            "--no-store", action="store_true",
+            help="Rolling con consultas ORM en lugar del store columnar en memoria",
+        )
+        parser.add_argument(
+            "--engine", type=str, default="per-game", choices=ENGINES,
+            help="per-game (partido a partido) o vectorized (backfill masivo con pandas)",
+        )
+        parser.add_argument(
+            "--export-columnar", action="store_true",
+            help="Al terminar, regenerar el dataset columnar (.npy) de cada mercado si hubo escrituras",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Procesos en paralelo para el motor per-game (tramos por rango de fechas)",
+        )
 
     def handle(self, *args, **options):
         season = options["season"]
         season_type = options["season_type"]
-        market = options["market"]
+        if options["all_markets"]:
+            from predictions.registry import FEATURE_MARKETS
+            markets = list(FEATURE_MARKETS)
+        else:
+            markets = list(dict.fromkeys(
+                m.strip() for m in options["market"].split(",") if m.strip()
+            ))
         game_id = options["game_id"]
         limit = options["limit"]
         to_redis = options["to_redis"]
+        use_store = not options["no_store"]
+        engine = options["engine"]
+        incremental = options["incremental"]
+        workers = max(1, options["workers"])
 
-        self.stdout.write(f"[compute_features] Mercado: {market} | Temporada: {season or 'todas'}")
+        self.stdout.write(
+            f"[compute_features] Mercados: {', '.join(markets)} | Temporada: {season or 'todas'} | Motor: {engine}"
+        )
 
         from core.models import Game
-        from features.engine.matchup import compute_features_for_matchup
-        from features.engine.market import compute_market_features
-        from features.engine.base import save_game_features
+        from features.engine.base import GameFeatureWriter
+        from features.engine.batch import compute_games
+        from features.engine.store import get_team_store
 
         qs = Game.objects.exclude(home_team__isnull=True).exclude(away_team__isnull=True)
+        if season_type:
+            qs = qs.filter(season_type__icontains=season_type)
+
+        plan = None
+        pending = set()
+        if incremental:
+            from features.engine.incremental import IncrementalPlan
+
+            plan = IncrementalPlan(markets, season_type)
+            if not plan.is_full:
+                qs = qs.filter(game_id__in=plan.game_ids())
+            pending = set(qs.values_list("game_id", flat=True))
+            self.stdout.write(
+                f"  Incremental: {len(pending)} partidos a recalcular"
+                + (" (sin watermark previo: todos)" if plan.is_full else "")
+            )
+
         if game_id:
             qs = qs.filter(game_id=game_id)
         if season:
             qs = qs.filter(season=season)
-        if season_type:
-            qs = qs.filter(season_type__icontains=season_type)
         if limit:
             qs = qs[:limit]
 
-        count = 0
-        errors = 0
+        if engine == "vectorized":
+            done, written = self._handle_vectorized(qs, markets, to_redis, plan)
+            if plan is not None:
+                plan.save(pending=pending - done)
+            if options["export_columnar"]:
+                self._export_columnar(markets, season_type, written)
+            return
 
-        iterator = qs.select_related("home_team", "away_team").iterator(
-            chunk_size=500
-        )
-        for game in iterator:
-            try:
-                features = compute_features_for_matchup(
-                    home_team_id=game.home_team.team_id,
-                    away_team_id=game.away_team.team_id,
-                    as_of_date=game.date,
-                    market=market,
-                    season=game.season or None,
-                    season_type=game.season_type or "Regular Season",
-                )
+        store = get_team_store() if use_store else None
+        if store is not None and plan is not None and plan.changed:
+            # Partidos corregidos en sitio (mismo pk) que el refresco normal no ve
+            store.refresh(game_ids=plan.changed)
 
-                # Añadir features específicas del mercado
-                market_extras = compute_market_features(features, market)
-                features.update(market_extras)
-
-                # Añadir target si el partido tiene resultado
-                if game.home_score is not None and game.away_score is not None:
-                    features["home_win"] = 1 if game.home_score > game.away_score else 0
-                    features["total_pts"] = game.home_score + game.away_score
-                    features["home_pts"] = game.home_score
-                    features["away_pts"] = game.away_score
-
-                save_game_features(
-                    game_id=game.game_id,
-                    market=market,
-                    features=features,
-                    season=game.season,
-                    season_type=game.season_type,
-                    to_redis=to_redis,
+        if workers > 1:
+            done, written, skipped, errors = self._handle_parallel(
+                qs, markets, plan, store, to_redis, workers
+            )
+        else:
+            with GameFeatureWriter(to_redis=to_redis) as writer:
+                iterator = qs.select_related("home_team", "away_team").iterator(
+                    chunk_size=500
+                )
+                done, errors = compute_games(
+                    iterator, markets, plan, store, writer,
+                    stdout=self.stdout, stderr=self.stderr,
                 )
-                count += 1
+            written, skipped = writer.written, writer.skipped
+
+        if plan is not None:
+            plan.save(pending=pending - done)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Features calculadas: {len(done)} partidos × {len(markets)} mercados. "
+            f"Filas escritas: {written}, sin cambios: {skipped}. Errores: {len(errors)}"
+        ))
+        if options["export_columnar"]:
+            self._export_columnar(markets, season_type, written)
+
+    def _handle_parallel(self, qs, markets, plan, store, to_redis, workers):
+        """
+        Reparte los partidos entre `workers` procesos (fork: heredan el store ya
+        cargado y el plan incremental). Cada proceso abre su propia conexión a DB
+        y escribe su tramo en bloque. Devuelve (done, escritas, sin cambios, errores).
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
 
-                if count % 100 == 0:
-                    self.stdout.write(f"  {count} partidos procesados...")
+        from django.db import connections
+        from features.engine.batch import partition_game_ids
 
+        # Varios tramos por worker para equilibrar la carga
+        chunks = partition_game_ids(qs, workers * 4)
+        total = sum(len(c) for c in chunks)
+        self.stdout.write(
+            f"  {total} partidos en {len(chunks)} tramos por fecha, {workers} procesos"
+        )
+        # Que los hijos no hereden la conexión abierta del padre
+        connections.close_all()
+
+        done, errors = set(), []
+        written = skipped = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(markets, plan, store, to_redis),
+        ) as pool:
+            futures = {pool.submit(_compute_partition, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    errors.extend((gid, f"tramo fallido: {exc}") for gid in chunk)
+                    self.stderr.write(f"Error en tramo de {len(chunk)} partidos: {exc}")
+                    continue
+                done.update(result["done"])
+                errors.extend(result["errors"])
+                written += result["written"]
+                skipped += result["skipped"]
+                self.stdout.write(f"  {len(done)}/{total} partidos procesados...")
+
+        for gid, msg in errors:
+            self.stderr.write(f"Error en {gid}: {msg}")
+        return done, written, skipped, errors
+
+    def _export_columnar(self, markets, season_type, written):
+        """
+        Regenera el dataset columnar de cada mercado si hubo escrituras o si el
+        guardado falta o es anterior a las últimas features.
+        """
+        from features.engine.columnar import export_market, load_market
+
+        for market in markets:
+            if not written and load_market(market, season_type) is not None:
+                continue
+            try:
+                n = export_market(market, season_type)
+                self.stdout.write(f"  Dataset columnar {market}/{season_type}: {n} filas")
             except Exception as exc:
-                errors += 1
-                self.stderr.write(f"Error en {game.game_id}: {exc}")
+                self.stderr.write(f"Error exportando dataset columnar {market}: {exc}")
+
+    def _handle_vectorized(self, qs, markets, to_redis, plan=None):
+        """
+        Backfill masivo: todas las ventanas de todos los partidos a la vez y escritura
+        en bloque. Devuelve (game_id calculados, filas escritas).
+        """
+        from features.engine.base import GameFeatureWriter
+        from features.engine.batch import add_targets
+        from features.engine.market import compute_market_features
+        from features.engine.vectorized import compute_features_vectorized_markets
+
+        games = list(qs.select_related("home_team", "away_team"))
+        self.stdout.write(f"  {len(games)} partidos cargados, calculando ventanas...")
+
+        with GameFeatureWriter(to_redis=to_redis) as writer:
+            for game, by_market in compute_features_vectorized_markets(games, markets):
+                for market, features in by_market.items():
+                    if plan is not None and not plan.markets_for(game.game_id, [market]):
+                        continue
+                    features.update(compute_market_features(features, market))
+                    add_targets(features, game)
+                    writer.add(
+                        game_id=game.game_id,
+                        market=market,
+                        features=features,
+                        season=game.season,
+                        season_type=game.season_type,
+                    )
 
         self.stdout.write(self.style.SUCCESS(
-            f"✅ Features calculadas: {count} partidos. Errores: {errors}"
+            f"✅ Features calculadas (vectorizado): {len(games)} partidos × "
+            f"{len(markets)} mercados. Filas escritas: {writer.written}, "
+            f"sin cambios: {writer.skipped}. Errores: 0"
         ))
+        return {game.game_id for game in games}, writer.written
@@ -0,0 +1,44 @@
+"""
+Calcula en bloque las features rolling de los jugadores de un slate y las
+guarda en PlayerFeatureSet.
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Features rolling de jugadores del slate de una fecha → PlayerFeatureSet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=str, default="", help="Fecha del slate YYYY-MM-DD (por defecto hoy)")
+        parser.add_argument("--team-id", type=str, default="", help="Solo la rotación de un equipo (opcional)")
+        parser.add_argument("--player-id", type=str, default="", help="Solo un jugador (opcional)")
+        parser.add_argument(
+            "--min-minutes", type=float, default=10.0,
+            help="Descartar jugadores con menos minutos de media en la ventana más corta",
+        )
+        parser.add_argument("--season-type", type=str, default="Regular Season", help="Tipo de temporada")
+
+    def handle(self, *args, **options):
+        import time
+        from datetime import date
+
+        from features.engine.player_batch import build_player_feature_sets
+
+        as_of = date.fromisoformat(options["date"]) if options["date"] else date.today()
+        player_ids = [options["player_id"]] if options["player_id"] else None
+        team_ids = [options["team_id"]] if options["team_id"] else None
+        self.stdout.write(f"[compute_player_features] Slate: {as_of}")
+
+        t0 = time.time()
+        result = build_player_feature_sets(
+            as_of,
+            player_ids=player_ids,
+            team_ids=team_ids,
+            min_minutes=options["min_minutes"],
+            season_type=options["season_type"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Jugadores: {result['players']}, escritos: {result['written']}, "
+            f"descartados: {result['skipped']} ({time.time() - t0:.1f}s)"
+        ))
@@ -10,6 +10,7 @@ from game.models import (
 )
 from game_boxscore.models import GameBoxscoreAdvanced
 from roster.models import Teams, Players
+from project_commands import import_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,7 @@ class Command(BaseCommand):
         self.drop_game_boxscore_traditional()
         self.drop_players()
         self.drop_teams()
+        self.drop_import_ledger()
         
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.SUCCESS("Eliminación completada exitosamente"))
@@ -142,3 +144,14 @@ class Command(BaseCommand):
         else:
             self.stdout.write("  ⊘ No hay registros para eliminar")
 
+    def drop_import_ledger(self):
+        """Vacía el registro de importaciones para que import_data vuelva a leer todos los CSV"""
+        self.stdout.write(self.style.WARNING("\nVaciando registro de importaciones..."))
+        count = import_ledger.clear_ledger()
+        if count > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"  ✓ Eliminadas {count} entradas del registro")
+            )
+            logger.info(f"Eliminadas {count} entradas de ImportLedger")
+        else:
+            self.stdout.write("  ⊘ No hay registros para eliminar")
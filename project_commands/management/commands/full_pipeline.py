@@ -1,5 +1,5 @@
 """
-Pipeline completo NBA sin opciones:
+Pipeline completo NBA (con --incremental, features solo de partidos nuevos o cambiados):
 ETL → sync_normalized → compute_features (todos los feature markets)
 → train_models (todos los PRIMARY markets) para Regular Season y Playoffs.
 """
@@ -23,15 +23,8 @@ def _primary_markets():
 
 def _feature_markets():
     """Unique feature_market values across all PRIMARY markets."""
-    from predictions.registry import MARKET_REGISTRY, PRIMARY
-    seen, result = set(), []
-    for cfg in MARKET_REGISTRY.values():
-        if cfg.get("kind") == PRIMARY:
-            fm = cfg.get("feature_market")
-            if fm and fm not in seen:
-                seen.add(fm)
-                result.append(fm)
-    return result
+    from predictions.registry import FEATURE_MARKETS
+    return list(FEATURE_MARKETS)
 
 
 def _fmt(seconds):
@@ -68,6 +61,12 @@ class Command(BaseCommand):
             )
             return False
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="compute_features --incremental (solo partidos nuevos/cambiados según el watermark)",
+        )
+
     def handle(self, *args, **options):
         sep = "=" * 60
         t_total = time.time()
@@ -93,26 +92,24 @@ class Command(BaseCommand):
         )
         self._step("sync_normalized", "sync_normalized")
 
-        # 3. Compute features
+        # 3. Compute features (una pasada por tipo: base común + todos los mercados)
         fm_list = _feature_markets()
-        total_f = len(fm_list) * len(SEASON_TYPES)
+        total_f = len(SEASON_TYPES)
         self.stdout.write(
             f"\n[3/4] ── Compute features "
-            f"({len(fm_list)} markets × {len(SEASON_TYPES)} tipos"
-            f" = {total_f}) ──────"
+            f"({len(fm_list)} markets en una pasada × {len(SEASON_TYPES)} tipos) ──────"
         )
         done_f = 0
         ok_f = 0
         for stype in SEASON_TYPES:
-            for fm in fm_list:
-                done_f += 1
-                label = f"features {fm}/{stype} [{done_f}/{total_f}]"
-                ok = self._step(
-                    label, "compute_features",
-                    "--market", fm, "--season-type", stype,
-                )
-                if ok:
-                    ok_f += 1
+            done_f += 1
+            label = f"features {len(fm_list)} markets/{stype} [{done_f}/{total_f}]"
+            args = ["--all-markets", "--export-columnar", "--season-type", stype]
+            if options["incremental"]:
+                args.append("--incremental")
+            ok = self._step(label, "compute_features", *args)
+            if ok:
+                ok_f += 1
         self.stdout.write(
             self.style.SUCCESS(
                 f"  Features: {ok_f}/{total_f} completados"
@@ -1,10 +1,14 @@
+import io
 import logging
 import os
+import time
+from contextlib import contextmanager
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
 import csv
+import polars as pl
 from tqdm import tqdm
 from game.models import (
     GameBoxscoreTraditional,
@@ -19,9 +23,90 @@ from django.db import models as django_models
 
 from teams.models import TeamsGeneralTraditional, TeamsGeneralAdvanced
 from players.models import PlayersGeneralTraditional, PlayersGeneralAdvanced
+from project_commands import copy_loader, csv_reader, import_ledger
+from project_commands.copy_loader import BOOL, FLAG, FLOAT, INT, SEASON_TYPE, STR, TEXT
 
 logger = logging.getLogger(__name__)
 
+# Columnas posicionales de los CSV (campo, índice, tipo) para la carga con COPY
+# (copy_loader) y la lectura con Polars (csv_reader), con las conversiones de
+# safe_int/safe_float.
+GAME_BOXSCORE_TRADITIONAL_COLUMNS = [
+    ("game_id", 0, TEXT), ("season", 1, TEXT), ("season_type", 2, TEXT),
+    ("home_team_abb", 3, TEXT), ("away_team_abb", 4, TEXT), ("player_id", 5, INT),
+    ("player_name", 6, TEXT), ("player_name_abb", 7, TEXT), ("player_team_abb", 8, TEXT),
+    ("player_pos", 9, TEXT), ("player_dnp", 10, BOOL), ("period", 11, TEXT), ("min", 12, TEXT),
+    ("fgm", 13, INT), ("fga", 14, INT), ("fg_perc", 15, FLOAT),
+    ("threepm", 16, INT), ("threepa", 17, INT), ("threep_perc", 18, FLOAT),
+    ("ftm", 19, INT), ("fta", 20, INT), ("ft_perc", 21, FLOAT),
+    ("oreb", 22, INT), ("dreb", 23, INT), ("reb", 24, INT), ("ast", 25, INT), ("stl", 26, INT),
+    ("blk", 27, INT), ("to", 28, INT), ("pf", 29, INT), ("pts", 30, INT), ("plus_minus", 31, INT),
+]
+PLAYER_COLUMNS = [
+    ("season", 1, TEXT), ("player_id", 5, INT), ("player_name", 6, TEXT),
+    ("player_name_abb", 7, TEXT), ("player_team_abb", 8, STR),
+]
+GAME_PLAY_BY_PLAY_COLUMNS = [
+    ("season", 0, TEXT), ("season_type", 1, TEXT), ("game_id", 2, TEXT), ("team_abb", 3, TEXT),
+    ("period", 4, TEXT), ("min", 5, TEXT), ("score", 6, TEXT), ("player", 7, TEXT), ("action", 8, TEXT),
+]
+GAME_SUMMARY_COLUMNS = [
+    ("season", 0, TEXT), ("season_type", 1, TEXT), ("game_id", 2, TEXT), ("team_abb", 3, TEXT),
+] + [
+    (name, i, INT) for i, name in enumerate((
+        "q1", "q2", "q3", "q4", "ot1", "ot2", "ot3", "ot4", "final", "pitp", "fb_pts", "big_ld",
+        "bpts", "treb", "tov", "ttov", "pot", "lead_changes", "times_tied",
+    ), start=4)
+]
+TEAM_BOXSCORE_TRADITIONAL_COLUMNS = [
+    ("season", 0, TEXT), ("season_type", 1, TEXT), ("team_id", 2, INT), ("team_abb", 3, TEXT),
+    ("game_id", 4, TEXT), ("matchup", 5, TEXT), ("home_away", 6, TEXT), ("gdate", 7, TEXT),
+    ("wl", 8, TEXT), ("min", 9, INT), ("pts", 10, INT), ("fgm", 11, INT), ("fga", 12, INT),
+    ("fg_pct", 13, FLOAT), ("fg3m", 14, INT), ("fg3a", 15, INT), ("fg3_pct", 16, FLOAT),
+    ("ftm", 17, INT), ("fta", 18, INT), ("ft_pct", 19, FLOAT), ("oreb", 20, INT), ("dreb", 21, INT),
+    ("reb", 22, INT), ("ast", 23, INT), ("stl", 24, INT), ("blk", 25, INT), ("tov", 26, INT),
+    ("pf", 27, INT), ("plus_minus", 28, INT),
+]
+
+
+# Etapas de import_data como DAG: nombre → (método, etapas de las que depende).
+# Solo players depende de teams (FK a Teams); el resto son independientes.
+IMPORT_STAGES = {
+    "teams": ("import_teams", ()),
+    "players": ("import_players", ("teams",)),
+    "game_boxscore_traditional": ("import_game_boxscore_traditional", ()),
+    "game_boxscore_advanced": ("import_game_boxscore_advanced", ()),
+    "game_play_by_play": ("import_game_play_by_play", ()),
+    "game_summary": ("import_game_summary", ()),
+    "team_boxscore_traditional": ("import_team_boxscore_traditional", ()),
+    "teams_csvs": ("import_teams_csvs", ()),
+    "players_csvs": ("import_players_csvs", ()),
+}
+
+
+def _run_stage(name, force, position):
+    """
+    Tarea de un proceso del pool: ejecuta una etapa con su propia conexión a DB
+    y barra de progreso en la línea `position`. Devuelve su salida (para
+    imprimirla entera), el tiempo y el error si falló.
+    """
+    from django.db import connection
+
+    buffer = io.StringIO()
+    command = Command(stdout=buffer, stderr=buffer)
+    command.force = force
+    command.progress_position = position
+    t0 = time.time()
+    error = None
+    try:
+        getattr(command, IMPORT_STAGES[name][0])()
+    except Exception as exc:
+        logger.exception("Etapa %s de import_data falló", name)
+        error = str(exc)
+    finally:
+        connection.close()
+    return {"output": buffer.getvalue(), "elapsed": time.time() - t0, "error": error}
+
 
 def safe_int(value, default=0):
     """Convierte un valor a int de forma segura, manejando valores vacíos, '-' y errores."""
@@ -49,39 +134,106 @@ def safe_float(value, default=0.0):
         return default
 
 
-def count_csv_lines(filepath):
-    """Cuenta el número de líneas en un archivo CSV (sin incluir la cabecera)."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return max(0, sum(1 for _ in f) - 1)  # Restar 1 por la cabecera
-    except (FileNotFoundError, IOError):
-        return 0
-
-
 class Command(BaseCommand):
     help = "Import initial data from links directory"
 
-    def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS("Iniciando importación de datos..."))
-        self.stdout.write("=" * 60)
+    # Sin --force, los CSV sin cambios se saltan y de los ampliados solo se lee lo nuevo
+    force = False
+    # Línea de la barra de progreso (una por proceso en la importación en paralelo)
+    progress_position = None
 
-        self.import_teams()
-        self.import_players()
-        self.import_game_boxscore_traditional()
-        self.import_game_boxscore_advanced()
-        self.import_game_play_by_play()
-        self.import_game_summary()
-        self.import_team_boxscore_traditional()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Reimporta todos los CSV completos (ignora el registro de importaciones)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Procesos para las etapas independientes (default IMPORT_DATA_WORKERS; 1 = en secuencia)",
+        )
+
+    def handle(self, *args, **options):
+        from django.db import connection
 
+        self.force = options.get("force", False)
+        workers = options.get("workers") or getattr(settings, "IMPORT_DATA_WORKERS", 4)
+        # Más procesos que núcleos solo añade contención
+        workers = min(workers, len(IMPORT_STAGES), os.cpu_count() or 1)
+        self.stdout.write(self.style.SUCCESS("Iniciando importación de datos..."))
         self.stdout.write("=" * 60)
 
-        # Importar datos de CSVs por app
-        self.import_teams_csvs()
-        self.import_players_csvs()
+        # SQLite no admite escrituras concurrentes desde varios procesos
+        if workers > 1 and connection.vendor != "sqlite":
+            self._run_parallel(workers)
+        else:
+            for method, _ in IMPORT_STAGES.values():
+                getattr(self, method)()
 
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.SUCCESS("Importación completada exitosamente"))
 
+    def _run_parallel(self, workers):
+        """
+        Ejecuta IMPORT_STAGES en un pool de `workers` procesos: cada etapa se lanza
+        en cuanto terminan aquellas de las que depende. Los procesos se crean con
+        spawn (el pool de hilos de Polars no sobrevive a fork) y abren su propia
+        conexión; la salida de cada etapa se imprime entera al terminar.
+        """
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        import django
+        from django.db import connections
+
+        self.stdout.write(f"  {len(IMPORT_STAGES)} etapas, {workers} procesos")
+        connections.close_all()
+
+        pending = dict(IMPORT_STAGES)
+        running = {}  # future → (etapa, línea de progreso)
+        free = list(range(workers))
+        done, failed = set(), {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as pool:
+            while pending or running:
+                for name, (_, deps) in list(pending.items()):
+                    if any(dep in failed for dep in deps):
+                        del pending[name]
+                        failed[name] = f"depende de {', '.join(d for d in deps if d in failed)}"
+                        self.stderr.write(self.style.ERROR(f"  ✗ {name} omitida: {failed[name]}"))
+                    elif free and all(dep in done for dep in deps):
+                        del pending[name]
+                        position = free.pop(0)
+                        running[pool.submit(_run_stage, name, self.force, position)] = (name, position)
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, position = running.pop(future)
+                    free = sorted(free + [position])
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        result = {"output": "", "elapsed": 0.0, "error": str(exc)}
+                    self.stdout.write(result["output"], ending="")
+                    if result["error"]:
+                        failed[name] = result["error"]
+                        self.stderr.write(self.style.ERROR(f"  ✗ {name}: {result['error']}"))
+                    else:
+                        done.add(name)
+                        self.stdout.write(f"  ⏱ {name}: {result['elapsed']:.1f}s")
+
+        if failed:
+            raise CommandError(
+                "Etapas fallidas: " + ", ".join(f"{name} ({msg})" for name, msg in failed.items())
+            )
+
     def import_teams(self):
         # Importa equipos desde NBA_TEAMS_INFO definido en settings.py
         # Estructura: {"Nombre Equipo": [abreviatura, team_id, conferencia, división]}
@@ -131,18 +283,20 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING("\n[2/6] Importando jugadores..."))
 
         csv_path = "./csv/game_boxscore_traditional.csv"
-        total_lines = count_csv_lines(csv_path)
+        with self._incremental(csv_path, Players) as plan:
+            if plan is None:
+                return
+            plan.imported = self._import_players(plan.path)
 
+    def _import_players(self, csv_path):
+        """Crea los Players nuevos de `csv_path`; devuelve las filas leídas."""
         # Cargar todos los equipos en memoria una vez (optimización)
         teams_dict = {team.team_abb: team for team in Teams.objects.all()}
         self.stdout.write(f"  Cargados {len(teams_dict)} equipos en memoria")
         logger.info(f"Cargados {len(teams_dict)} equipos en memoria")
 
         # Cargar todos los jugadores existentes en memoria (optimización)
-        existing_players = {
-            (p.player_id, p.season, p.team_id)
-            for p in Players.objects.select_related("team").all()
-        }
+        existing_players = set(Players.objects.values_list("player_id", "season", "team_id"))
         self.stdout.write(
             f"  Cargados {len(existing_players)} jugadores existentes en memoria"
         )
@@ -151,63 +305,44 @@ class Command(BaseCommand):
         players_seen = set()  # Evita duplicados: (player_id, season, team_abb)
         players_to_create = []  # Lista para bulk_create
         skipped_count = 0
+        total_rows = 0
 
-        with open(csv_path, "r") as file:
-            reader = csv.reader(file)
-            next(reader)  # Saltar la cabecera
-
-            progress_bar = tqdm(
-                total=total_lines,
-                desc="  Procesando jugadores",
-                unit=" filas",
-                ncols=100,
-            )
-            try:
-                for row in reader:
-                    progress_bar.update(1)
-                    if len(row) < 9:
-                        continue
-
-                    player_id = row[5]  # PLAYER_ID
-                    player_name = row[6]  # PLAYER_NAME
-                    player_name_abb = row[7]  # PLAYER_NAME_ABB
-                    player_team_abb = (
-                        row[8].strip() if row[8] else ""
-                    )  # PLAYER_TEAM_ABB
-                    season = row[1]  # SEASON
-
-                    # Saltar si el equipo está vacío o no existe
-                    if not player_team_abb or player_team_abb not in teams_dict:
-                        skipped_count += 1
-                        continue
-
-                    team = teams_dict[player_team_abb]
-                    player_key = (player_id, season, team.id)
+        progress_bar = self._bytes_progress(csv_path, "  Procesando jugadores")
+        try:
+            for batch in csv_reader.read_batches(
+                csv_path, PLAYER_COLUMNS, progress=progress_bar, min_columns=9,
+            ):
+                total_rows += batch.height
+                # Saltar si el equipo está vacío o no existe
+                valid = batch.filter(pl.col("player_team_abb").is_in(list(teams_dict)))
+                skipped_count += batch.height - valid.height
+                valid = valid.unique(
+                    subset=["player_id", "season", "player_team_abb"], keep="first", maintain_order=True
+                )
 
-                    # Saltar si ya existe
-                    if player_key in existing_players:
+                for row in valid.iter_rows(named=True):
+                    team = teams_dict[row["player_team_abb"]]
+                    csv_key = (row["player_id"], row["season"], row["player_team_abb"])
+                    # Saltar si ya existe o ya se vio en un lote anterior
+                    if (row["player_id"], row["season"], team.id) in existing_players or csv_key in players_seen:
                         continue
-
-                    # Crear clave única para evitar duplicados en el CSV
-                    csv_key = (player_id, season, player_team_abb)
-                    if csv_key not in players_seen:
-                        players_seen.add(csv_key)
-                        players_to_create.append(
-                            Players(
-                                player_id=player_id,
-                                player_name=player_name,
-                                player_abb=player_name_abb,
-                                team=team,
-                                season=season,
-                            )
+                    players_seen.add(csv_key)
+                    players_to_create.append(
+                        Players(
+                            player_id=row["player_id"],
+                            player_name=row["player_name"],
+                            player_abb=row["player_name_abb"],
+                            team=team,
+                            season=row["season"],
                         )
-
-                    # Actualizar descripción de la barra
-                    progress_bar.set_postfix(
-                        {"únicos": len(players_seen), "omitidos": skipped_count}
                     )
-            finally:
-                progress_bar.close()
+
+                # Actualizar descripción de la barra
+                progress_bar.set_postfix(
+                    {"únicos": len(players_seen), "omitidos": skipped_count}
+                )
+        finally:
+            progress_bar.close()
 
         # Insertar todos los jugadores de una vez (más eficiente)
         if players_to_create:
@@ -219,7 +354,7 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"  Jugadores: {len(players_seen)} únicos importados, {skipped_count} omitidos (equipos no válidos), {total_lines} filas procesadas"
+                f"  Jugadores: {len(players_seen)} únicos importados, {skipped_count} omitidos (equipos no válidos), {total_rows} filas procesadas"
             )
         )
         logger.info(
@@ -227,127 +362,19 @@ class Command(BaseCommand):
             len(players_seen),
             skipped_count,
         )
+        return total_rows
 
     def import_game_boxscore_traditional(self):
-        # Lee el archivo CSV y crea registros para cada fila (optimizado para CSVs grandes)
+        # Clave única: game_id, season, season_type, home_team_abb, away_team_abb, player_id
         self.stdout.write(
             self.style.WARNING("\n[3/6] Importando Game Boxscore Traditional...")
         )
 
         csv_path = "./csv/game_boxscore_traditional.csv"
-        total_lines = count_csv_lines(csv_path)
-
-        # Cargar registros existentes en memoria (clave única: game_id, season, season_type, home_team_abb, away_team_abb, player_id)
-        existing_records = {
-            tuple(r)
-            for r in GameBoxscoreTraditional.objects.values_list(
-                "game_id",
-                "season",
-                "season_type",
-                "home_team_abb",
-                "away_team_abb",
-                "player_id",
-            )
-        }
-        self.stdout.write(
-            f"  Cargados {len(existing_records)} registros existentes en memoria"
-        )
-
-        batch_size = 5000
-        batch = []
-        created_count = 0
-        skipped_count = 0
-
-        with open(csv_path, "r") as file:
-            reader = csv.reader(file)
-            next(reader)  # Saltar la cabecera
-
-            progress_bar = tqdm(
-                total=total_lines,
-                desc="  Procesando boxscores",
-                unit=" filas",
-                ncols=100,
-            )
-            try:
-                for row in reader:
-                    progress_bar.update(1)
-                    if len(row) < 31:
-                        continue
-
-                    # Clave única para verificar si ya existe
-                    record_key = (row[0], row[1], row[2], row[3], row[4], row[5])
-
-                    if record_key in existing_records:
-                        skipped_count += 1
-                        continue
-
-                    # Crear objeto para bulk_create
-                    batch.append(
-                        GameBoxscoreTraditional(
-                            game_id=row[0],
-                            season=row[1],
-                            season_type=row[2],
-                            home_team_abb=row[3],
-                            away_team_abb=row[4],
-                            player_id=row[5],
-                            player_name=row[6],
-                            player_name_abb=row[7],
-                            player_team_abb=row[8],
-                            player_pos=row[9],
-                            player_dnp=row[10].lower() == "true",
-                            period=row[11],
-                            min=row[12],
-                            fgm=safe_int(row[13]),
-                            fga=safe_int(row[14]),
-                            fg_perc=safe_float(row[15]),
-                            threepm=safe_int(row[16]),
-                            threepa=safe_int(row[17]),
-                            threep_perc=safe_float(row[18]),
-                            ftm=safe_int(row[19]),
-                            fta=safe_int(row[20]),
-                            ft_perc=safe_float(row[21]),
-                            oreb=safe_int(row[22]),
-                            dreb=safe_int(row[23]),
-                            reb=safe_int(row[24]),
-                            ast=safe_int(row[25]),
-                            stl=safe_int(row[26]),
-                            blk=safe_int(row[27]),
-                            to=safe_int(row[28]),
-                            pf=safe_int(row[29]),
-                            pts=safe_int(row[30]),
-                            plus_minus=safe_int(row[31]) if len(row) > 31 else 0,
-                        )
-                    )
-
-                    # Insertar por lotes
-                    if len(batch) >= batch_size:
-                        GameBoxscoreTraditional.objects.bulk_create(
-                            batch, ignore_conflicts=True
-                        )
-                        created_count += len(batch)
-                        batch = []
-
-                    # Actualizar descripción de la barra
-                    progress_bar.set_postfix(
-                        {
-                            "nuevos": created_count + len(batch),
-                            "existentes": skipped_count,
-                        }
-                    )
-            finally:
-                progress_bar.close()
-
-            # Insertar el lote final
-            if batch:
-                GameBoxscoreTraditional.objects.bulk_create(
-                    batch, ignore_conflicts=True
-                )
-                created_count += len(batch)
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"  Game Boxscore Traditional: {created_count} nuevos, {skipped_count} existentes, {total_lines} filas procesadas"
-            )
+        key = ("game_id", "season", "season_type", "home_team_abb", "away_team_abb", "player_id")
+        self._import_positional(
+            csv_path, GameBoxscoreTraditional, GAME_BOXSCORE_TRADITIONAL_COLUMNS,
+            key=key, mode="missing", min_columns=31, label="Game Boxscore Traditional",
         )
 
     def import_game_boxscore_advanced(self):
@@ -384,286 +411,39 @@ class Command(BaseCommand):
             )
 
     def import_game_play_by_play(self):
-        """Importa play-by-play. El CSV tiene millones de filas: no contamos líneas ni
-        cargamos existentes en memoria; usamos unique_together + ignore_conflicts."""
+        """Importa play-by-play. El CSV tiene millones de filas: no cargamos existentes
+        en memoria; usamos unique_together + ignore_conflicts."""
         self.stdout.write(self.style.WARNING("\n[4/6] Importando Game Play By Play..."))
 
         csv_path = "./csv/game_play_by_play.csv"
-        if not os.path.exists(csv_path):
-            self.stdout.write(self.style.WARNING(f"  ⚠ Archivo no encontrado: {csv_path}"))
-            return
-
-        batch_size = 5000
-        batch = []
-        created_count = 0
-        total_rows = 0
-
-        with open(csv_path, "r", encoding="utf-8") as file:
-            reader = csv.reader(file)
-            next(reader)  # Saltar la cabecera
-
-            # Sin total para no bloquear leyendo todo el archivo (~5.6M líneas)
-            progress_bar = tqdm(
-                total=None,
-                desc="  Procesando play-by-play",
-                unit=" filas",
-                ncols=100,
-            )
-            try:
-                for row in reader:
-                    progress_bar.update(1)
-                    total_rows += 1
-                    if len(row) < 9:
-                        continue
-
-                    batch.append(
-                        GamePlayByPlay(
-                            season=row[0],
-                            season_type=row[1],
-                            game_id=row[2],
-                            team_abb=row[3],
-                            period=row[4],
-                            min=row[5],
-                            score=row[6],
-                            player=row[7],
-                            action=row[8],
-                        )
-                    )
-
-                    if len(batch) >= batch_size:
-                        GamePlayByPlay.objects.bulk_create(
-                            batch, ignore_conflicts=True
-                        )
-                        created_count += len(batch)
-                        batch = []
-                        progress_bar.set_postfix(insertados=created_count)
-            finally:
-                progress_bar.close()
-
-        if batch:
-            GamePlayByPlay.objects.bulk_create(batch, ignore_conflicts=True)
-            created_count += len(batch)
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"  Game Play By Play: {created_count} insertados (duplicados ignorados), "
-                f"{total_rows} filas procesadas"
-            )
+        key = list(GamePlayByPlay._meta.unique_together[0])
+        self._import_positional(
+            csv_path, GamePlayByPlay, GAME_PLAY_BY_PLAY_COLUMNS,
+            key=key, mode="nothing", min_columns=9, label="Game Play By Play",
         )
 
     def import_game_summary(self):
+        # Clave única: season, season_type, game_id, team_abb
         self.stdout.write(self.style.WARNING("\n[5/6] Importando Game Summary..."))
 
         csv_path = "./csv/game_summary.csv"
-        total_lines = count_csv_lines(csv_path)
-
-        # Cargar registros existentes en memoria (clave única: season, season_type, game_id, team_abb)
-        existing_records = {
-            tuple(r)
-            for r in GameSummary.objects.values_list(
-                "season", "season_type", "game_id", "team_abb"
-            )
-        }
-        self.stdout.write(
-            f"  Cargados {len(existing_records)} registros existentes en memoria"
-        )
-
-        batch_size = 5000
-        batch = []
-        created_count = 0
-        skipped_count = 0
-
-        with open(csv_path, "r") as file:
-            reader = csv.reader(file)
-            next(reader)  # Saltar la cabecera
-
-            progress_bar = tqdm(
-                total=total_lines,
-                desc="  Procesando summaries",
-                unit=" filas",
-                ncols=100,
-            )
-            try:
-                for row in reader:
-                    progress_bar.update(1)
-                    if len(row) < 23:
-                        continue
-
-                    # Clave única para verificar si ya existe
-                    record_key = (row[0], row[1], row[2], row[3])
-
-                    if record_key in existing_records:
-                        skipped_count += 1
-                        continue
-
-                    # Crear objeto para bulk_create
-                    batch.append(
-                        GameSummary(
-                            season=row[0],
-                            season_type=row[1],
-                            game_id=row[2],
-                            team_abb=row[3],
-                            q1=safe_int(row[4]),
-                            q2=safe_int(row[5]),
-                            q3=safe_int(row[6]),
-                            q4=safe_int(row[7]),
-                            ot1=safe_int(row[8]),
-                            ot2=safe_int(row[9]),
-                            ot3=safe_int(row[10]),
-                            ot4=safe_int(row[11]),
-                            final=safe_int(row[12]),
-                            pitp=safe_int(row[13]),
-                            fb_pts=safe_int(row[14]),
-                            big_ld=safe_int(row[15]),
-                            bpts=safe_int(row[16]),
-                            treb=safe_int(row[17]),
-                            tov=safe_int(row[18]),
-                            ttov=safe_int(row[19]),
-                            pot=safe_int(row[20]),
-                            lead_changes=safe_int(row[21]),
-                            times_tied=safe_int(row[22]),
-                        )
-                    )
-
-                    # Insertar por lotes
-                    if len(batch) >= batch_size:
-                        GameSummary.objects.bulk_create(batch, ignore_conflicts=True)
-                        created_count += len(batch)
-                        batch = []
-
-                    # Actualizar descripción de la barra
-                    progress_bar.set_postfix(
-                        {
-                            "nuevos": created_count + len(batch),
-                            "existentes": skipped_count,
-                        }
-                    )
-            finally:
-                progress_bar.close()
-
-            # Insertar el lote final
-            if batch:
-                GameSummary.objects.bulk_create(batch, ignore_conflicts=True)
-                created_count += len(batch)
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"  Game Summary: {created_count} nuevos, {skipped_count} existentes, {total_lines} filas procesadas"
-            )
+        key = ("season", "season_type", "game_id", "team_abb")
+        self._import_positional(
+            csv_path, GameSummary, GAME_SUMMARY_COLUMNS,
+            key=key, mode="missing", min_columns=23, label="Game Summary",
         )
 
     def import_team_boxscore_traditional(self):
+        # Clave única: season, season_type, team_id, team_abb, game_id
         self.stdout.write(
             self.style.WARNING("\n[6/6] Importando Team Boxscore Traditional...")
         )
 
         csv_path = "./csv/teams_box_scores.csv"
-        total_lines = count_csv_lines(csv_path)
-
-        # Cargar registros existentes en memoria (clave única: season, season_type, team_id, team_abb, game_id)
-        existing_records = {
-            tuple(r)
-            for r in TeamBoxscoreTraditional.objects.values_list(
-                "season", "season_type", "team_id", "team_abb", "game_id"
-            )
-        }
-        self.stdout.write(
-            f"  Cargados {len(existing_records)} registros existentes en memoria"
-        )
-
-        batch_size = 5000
-        batch = []
-        created_count = 0
-        skipped_count = 0
-
-        with open(csv_path, "r") as file:
-            reader = csv.reader(file)
-            next(reader)  # Saltar la cabecera
-
-            progress_bar = tqdm(
-                total=total_lines,
-                desc="  Procesando team boxscores",
-                unit=" filas",
-                ncols=100,
-            )
-            try:
-                for row in reader:
-                    progress_bar.update(1)
-                    if len(row) < 28:
-                        continue
-
-                    team_id = safe_int(row[2])
-                    # Clave única para verificar si ya existe
-                    record_key = (row[0], row[1], team_id, row[3], row[4])
-
-                    if record_key in existing_records:
-                        skipped_count += 1
-                        continue
-
-                    # Crear objeto para bulk_create
-                    batch.append(
-                        TeamBoxscoreTraditional(
-                            season=row[0],
-                            season_type=row[1],
-                            team_id=team_id,
-                            team_abb=row[3],
-                            game_id=row[4],
-                            matchup=row[5],
-                            home_away=row[6],
-                            gdate=row[7],
-                            wl=row[8],
-                            min=safe_int(row[9]),
-                            pts=safe_int(row[10]),
-                            fgm=safe_int(row[11]),
-                            fga=safe_int(row[12]),
-                            fg_pct=safe_float(row[13]),
-                            fg3m=safe_int(row[14]),
-                            fg3a=safe_int(row[15]),
-                            fg3_pct=safe_float(row[16]),
-                            ftm=safe_int(row[17]),
-                            fta=safe_int(row[18]),
-                            ft_pct=safe_float(row[19]),
-                            oreb=safe_int(row[20]),
-                            dreb=safe_int(row[21]),
-                            reb=safe_int(row[22]),
-                            ast=safe_int(row[23]),
-                            stl=safe_int(row[24]),
-                            blk=safe_int(row[25]),
-                            tov=safe_int(row[26]),
-                            pf=safe_int(row[27]),
-                            plus_minus=safe_int(row[28]) if len(row) > 28 else 0,
-                        )
-                    )
-
-                    # Insertar por lotes
-                    if len(batch) >= batch_size:
-                        TeamBoxscoreTraditional.objects.bulk_create(
-                            batch, ignore_conflicts=True
-                        )
-                        created_count += len(batch)
-                        batch = []
-
-                    # Actualizar descripción de la barra
-                    progress_bar.set_postfix(
-                        {
-                            "nuevos": created_count + len(batch),
-                            "existentes": skipped_count,
-                        }
-                    )
-            finally:
-                progress_bar.close()
-
-            # Insertar el lote final
-            if batch:
-                TeamBoxscoreTraditional.objects.bulk_create(
-                    batch, ignore_conflicts=True
-                )
-                created_count += len(batch)
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"  Team Boxscore Traditional: {created_count} nuevos, {skipped_count} existentes, {total_lines} filas procesadas"
-            )
+        key = ("season", "season_type", "team_id", "team_abb", "game_id")
+        self._import_positional(
+            csv_path, TeamBoxscoreTraditional, TEAM_BOXSCORE_TRADITIONAL_COLUMNS,
+            key=key, mode="missing", min_columns=28, label="Team Boxscore Traditional",
         )
 
     def import_csv_to_model(self, csv_path, model_class, csv_field_map=None):
@@ -671,15 +451,32 @@ class Command(BaseCommand):
         Función genérica para importar un CSV a un modelo Django.
         Usa la misma lógica que el código de importación en admin.py
         """
-        if not os.path.exists(csv_path):
-            self.stdout.write(
-                self.style.WARNING(f"  ⚠ Archivo no encontrado: {csv_path}")
+        with self._incremental(csv_path, model_class) as plan:
+            if plan is None:
+                return 0, 0, []
+            created, updated, errors, rows = self._import_csv(plan.path, model_class, csv_field_map)
+            if not errors:
+                plan.imported = rows
+        return created, updated, errors
+
+    def _import_csv(self, csv_path, model_class, csv_field_map=None):
+        """Cuerpo de import_csv_to_model: (creados, actualizados, errores, filas)."""
+        columns, key = self._csv_columns(csv_path, model_class, csv_field_map)
+        if columns:
+            result = self._copy_import(
+                csv_path, model_class, columns, key=key, mode="update",
+                label=model_class.__name__,
             )
-            return 0, 0, []
-
-        total_lines = count_csv_lines(csv_path)
-        if total_lines == 0:
-            return 0, 0, []
+            if result is None:
+                try:
+                    result = self._polars_import(
+                        csv_path, model_class, columns, key=key, mode="update",
+                        label=model_class.__name__,
+                    )
+                except Exception as exc:
+                    logger.warning("Importación con Polars de %s falló, fila a fila: %s", csv_path, exc)
+            if result is not None:
+                return result["created"], result["updated"], [], result["rows"]
 
         meta = model_class._meta
         field_names = [field.name for field in meta.fields]
@@ -689,6 +486,7 @@ class Command(BaseCommand):
 
         created_count = 0
         updated_count = 0
+        total_rows = 0
         errors = []
         error_rows = []  # Filas que fallan, para guardar en csv_errors/
 
@@ -715,14 +513,17 @@ class Command(BaseCommand):
             reader = csv.DictReader(file)
 
             progress_bar = tqdm(
-                total=total_lines,
+                total=None,
                 desc=f"    Procesando {model_class.__name__}",
                 unit=" filas",
                 ncols=100,
+                position=self.progress_position,
+                leave=self.progress_position is None,
             )
             try:
                 for row_num, row in enumerate(reader, start=2):
                     progress_bar.update(1)
+                    total_rows += 1
 
                     try:
                         # Evitar None en claves (CSV con cabecera vacía)
@@ -908,7 +709,230 @@ class Command(BaseCommand):
             except Exception as write_err:
                 logger.warning("No se pudo escribir csv_errors: %s", write_err)
 
-        return created_count, updated_count, errors
+        return created_count, updated_count, errors, total_rows
+
+    @contextmanager
+    def _incremental(self, csv_path, model_class):
+        """
+        Consulta el registro de importaciones (import_ledger) para `csv_path` →
+        `model_class`. Cede None si el CSV no existe o no cambió; si no, el plan,
+        con plan.path apuntando al CSV completo o a su cabecera + filas añadidas.
+        Quien importa deja en plan.imported las filas leídas y, al salir sin
+        error, se registra lo importado.
+        """
+        if not os.path.exists(csv_path):
+            self.stdout.write(self.style.WARNING(f"  ⚠ Archivo no encontrado: {csv_path}"))
+            yield None
+            return
+
+        name = os.path.basename(csv_path)
+        plan = import_ledger.plan_import(csv_path, model_class._meta.label, force=self.force)
+        if plan.action == import_ledger.SKIP:
+            self.stdout.write(
+                self.style.SUCCESS(f"  ⊘ {name} sin cambios desde la última importación ({plan.rows} filas)")
+            )
+            yield None
+            return
+        if plan.action == import_ledger.APPEND:
+            self.stdout.write(
+                f"  ↻ {name}: importando solo lo añadido ({plan.size - plan.offset} bytes desde el byte {plan.offset})"
+            )
+
+        with import_ledger.source_file(plan) as path:
+            plan.path = path
+            yield plan
+        import_ledger.record_import(plan)
+
+    def _import_positional(self, csv_path, model_class, columns, key, mode, label, min_columns=0):
+        """Importa un CSV de columnas posicionales: COPY si se puede, si no Polars."""
+        with self._incremental(csv_path, model_class) as plan:
+            if plan is None:
+                return
+            result = self._copy_import(
+                plan.path, model_class, columns, key=key, mode=mode,
+                min_columns=min_columns, label=label,
+            ) or self._polars_import(
+                plan.path, model_class, columns, key=key, mode=mode, label=label,
+                min_columns=min_columns,
+            )
+            plan.imported = result["rows"]
+
+    def _copy_import(self, csv_path, model_class, columns, key, mode, label, min_columns=0):
+        """
+        Carga `csv_path` con COPY + INSERT … SELECT (copy_loader) y devuelve el
+        resultado de load_csv. None (y se usa la ruta fila a fila) si la base de
+        datos no es PostgreSQL, el CSV no tiene las columnas mínimas o la carga falla.
+        """
+        if not copy_loader.copy_available() or not os.path.exists(csv_path):
+            return None
+        if len(copy_loader.csv_header(csv_path)) < min_columns:
+            return None
+
+        progress_bar = self._bytes_progress(csv_path, f"  COPY {os.path.basename(csv_path)}")
+        try:
+            result = copy_loader.load_csv(
+                csv_path, model_class, columns, key, mode=mode, progress=progress_bar,
+            )
+        except Exception as exc:
+            logger.warning("COPY de %s falló, importación fila a fila: %s", csv_path, exc)
+            self.stdout.write(self.style.WARNING(f"  ⚠ COPY falló ({exc}); importación fila a fila"))
+            return None
+        finally:
+            progress_bar.close()
+
+        self._write_result(label, result, " (COPY)")
+        return result
+
+    def _polars_import(self, csv_path, model_class, columns, key, mode, label, min_columns=0):
+        """
+        Importa `csv_path` sin COPY: lotes tipados de csv_reader (Polars) escritos
+        con bulk_create. mode como en copy_loader.load_csv: "missing" descarta las
+        claves ya existentes, "nothing" deja los duplicados a ignore_conflicts y
+        "update" hace upsert (la última fila del CSV gana). Las filas con menos de
+        `min_columns` campos se saltan. Devuelve
+        {"rows", "created", "updated"} o None si el archivo no existe; con
+        "nothing", "created" sale del recuento de la tabla antes y después.
+        """
+        if not os.path.exists(csv_path):
+            self.stdout.write(self.style.WARNING(f"  ⚠ Archivo no encontrado: {csv_path}"))
+            return None
+
+        key = list(key)
+        existing = None
+        if mode != "nothing":
+            # Cargar claves existentes en memoria
+            existing = list(model_class.objects.values_list(*key))
+            self.stdout.write(f"  Cargados {len(existing)} registros existentes en memoria")
+        else:
+            # ignore_conflicts no dice qué filas se insertaron
+            count_before = model_class.objects.count()
+        update_fields = [name for name, index, _ in columns if index is not None and name not in key]
+        update_fields += [
+            f.name for f in model_class._meta.concrete_fields if getattr(f, "auto_now", False)
+        ]
+
+        batch_size = 5000
+        known = None
+        result = {"rows": 0, "created": 0, "updated": 0}
+        progress_bar = self._bytes_progress(csv_path, f"  Procesando {os.path.basename(csv_path)}")
+        try:
+            for batch in csv_reader.read_batches(
+                csv_path, columns, model=model_class, progress=progress_bar, min_columns=min_columns,
+            ):
+                result["rows"] += batch.height
+                if existing is not None and known is None:
+                    known = pl.DataFrame(existing, schema=batch.select(key).schema, orient="row")
+                upsert = mode == "update" and update_fields
+                if mode == "update":
+                    # Una fila por clave (la última), como update_or_create fila a fila
+                    batch = batch.unique(subset=key, keep="last", maintain_order=True)
+                    new = batch.join(known, on=key, how="anti", maintain_order="left")
+                    known = pl.concat([known, new.select(key)])
+                    if not upsert:
+                        batch = new
+                elif mode == "missing":
+                    batch = new = batch.join(known, on=key, how="anti", maintain_order="left")
+                else:
+                    new = None
+
+                objs = [model_class(**row) for row in batch.iter_rows(named=True)]
+                if upsert:
+                    model_class.objects.bulk_create(
+                        objs, batch_size=batch_size, update_conflicts=True,
+                        unique_fields=key, update_fields=update_fields,
+                    )
+                else:
+                    model_class.objects.bulk_create(objs, batch_size=batch_size, ignore_conflicts=True)
+                if new is not None:
+                    result["created"] += new.height
+                    result["updated"] += batch.height - new.height
+
+                progress_bar.set_postfix(
+                    {"nuevos": result["created"], "actualizados": result["updated"]}
+                )
+        finally:
+            progress_bar.close()
+
+        if existing is None:
+            result["created"] = model_class.objects.count() - count_before
+        self._write_result(label, result)
+        return result
+
+    def _write_result(self, label, result, suffix=""):
+        existing = result["rows"] - result["created"] - result["updated"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  {label}: {result['created']} nuevos, {result['updated']} actualizados, "
+                f"{existing} existentes, {result['rows']} filas procesadas{suffix}"
+            )
+        )
+
+    def _bytes_progress(self, csv_path, desc):
+        """Barra de progreso por bytes del CSV (sin pasada previa para contar filas)."""
+        return tqdm(
+            total=os.path.getsize(csv_path),
+            desc=desc,
+            unit="B",
+            unit_scale=True,
+            ncols=100,
+            position=self.progress_position,
+            leave=self.progress_position is None,
+        )
+
+    def _csv_columns(self, csv_path, model_class, csv_field_map=None):
+        """
+        Columnas (COPY o Polars) para import_csv_to_model a partir de la cabecera, con la
+        misma normalización (minúsculas, *_RANK/ignorados fuera, w→win, l→lose,
+        csv_field_map, season_type de teams). Devuelve (columnas, clave) o
+        (None, None) si el CSV no encaja (campos sin soporte o sin clave única).
+        """
+        meta = model_class._meta
+        field_names = [field.name for field in meta.fields]
+        ignore_fields = {"GROUP_NAME", "TEAM_ABBREVIATION"}
+
+        indexes = {}
+        for i, name in enumerate(copy_loader.csv_header(csv_path)):
+            if name.upper().endswith("_RANK") or name.upper() in ignore_fields:
+                continue
+            indexes[name.lower()] = i
+
+        renames = dict(csv_field_map or {})
+        if "teams" in csv_path.lower():
+            renames = {"w": "win", "l": "lose", **renames}
+        elif "players" in csv_path.lower():
+            renames = {"l": "lose", **renames}
+        for csv_key, model_key in renames.items():
+            if csv_key in indexes and model_key in field_names:
+                indexes[model_key] = indexes.pop(csv_key)
+
+        unique_together = getattr(meta, "unique_together", [])
+        key = list(unique_together[0]) if unique_together else []
+        if not key or any(name not in indexes for name in key):
+            return None, None
+
+        columns = []
+        for field in meta.concrete_fields:
+            index = indexes.get(field.name)
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                continue
+            if field.primary_key:
+                if index is not None:
+                    return None, None
+                continue
+            if isinstance(field, django_models.BooleanField):
+                kind = FLAG
+            elif isinstance(field, django_models.IntegerField):
+                kind = INT
+            elif isinstance(field, django_models.FloatField):
+                kind = FLOAT
+            elif isinstance(field, django_models.CharField):
+                kind = SEASON_TYPE if field.name == "season_type" and "teams" in csv_path.lower() else STR
+            elif index is None:
+                kind = STR
+            else:
+                return None, None
+            columns.append((field.name, index, kind))
+        return columns, key
 
     def import_teams_csvs(self):
         """Importa CSVs de equipos: traditional y advanced."""
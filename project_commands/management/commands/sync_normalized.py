@@ -1,11 +1,22 @@
 """
 Sincroniza los modelos crudos NBA (game, game_boxscore, teams, players, roster)
-hacia los modelos normalizados de core (Game, Team, Player, GamePlayerLine, GameTeamLine).
+hacia los modelos normalizados de core (Game, Team, Player, GamePlayerLine, GameTeamLine,
+GamePeriodLine).
+
+Todo en bloque: equipos/jugadores/partidos/resúmenes resueltos con dicts (una
+consulta por tabla o por lote) y escritura con bulk upsert sobre la clave
+natural de cada modelo.
 """
 
 from django.core.management.base import BaseCommand
 from tqdm import tqdm
 
+# Totales de boxscore comunes a GameTeamLine y GamePlayerLine (mismo nombre en origen)
+BOX_STATS = (
+    "fgm", "fga", "fg_pct", "fg3m", "fg3a", "fg3_pct", "ftm", "fta", "ft_pct",
+    "oreb", "dreb", "reb", "ast", "stl", "blk", "tov", "pf", "pts",
+)
+
 
 class Command(BaseCommand):
     help = "Sincroniza datos crudos → modelos normalizados core"
@@ -26,9 +37,10 @@ class Command(BaseCommand):
             self.stdout.write("Vaciando modelos core...")
             from core.models import (
                 Game, Player, Team,
-                GamePlayerLine, GameTeamLine, WinProbabilitySnapshot,
+                GamePeriodLine, GamePlayerLine, GameTeamLine, WinProbabilitySnapshot,
             )
             WinProbabilitySnapshot.objects.all().delete()
+            GamePeriodLine.objects.all().delete()
             GameTeamLine.objects.all().delete()
             GamePlayerLine.objects.all().delete()
             Game.objects.all().delete()
@@ -41,6 +53,38 @@ class Command(BaseCommand):
         self._sync_games(season, season_type, batch_size)
         self._sync_player_lines(season, season_type, batch_size)
         self._sync_team_lines(season, season_type, batch_size)
+        self._sync_period_lines(season, season_type, batch_size)
+
+        # Si el store columnar ya está cargado en este proceso, traer las líneas nuevas
+        from features.engine.h2h import refresh_h2h_index
+        from features.engine.store import refresh_team_store
+        refresh_team_store()
+        refresh_h2h_index()
+
+        # Ampliar los estados diarios por equipo (desde el inicio de la temporada sincronizada)
+        try:
+            from features.engine.team_state import build_team_daily_states
+
+            since = None
+            if season and not clear:
+                from core.models import Game
+                from django.db.models import Min
+                since = Game.objects.filter(season=season).aggregate(d=Min("date"))["d"]
+            result = build_team_daily_states(since=since, full=clear)
+            self.stdout.write(
+                f"  Team daily states: {result['written']} escritos, {result['skipped']} sin cambios"
+            )
+        except Exception as exc:
+            self.stderr.write(f"Error actualizando team daily states: {exc}")
+
+        # Ratings (Elo, Glicko-2, TrueSkill): incremental desde el primer partido nuevo o corregido
+        try:
+            from features.engine.ratings import build_all_ratings
+
+            for system, result in build_all_ratings(full=clear).items():
+                self.stdout.write(f"  Ratings {system}: {result['games']} partidos recalculados")
+        except Exception as exc:
+            self.stderr.write(f"Error actualizando ratings: {exc}")
 
         self.stdout.write(self.style.SUCCESS("✅ Sincronización core completada."))
 
@@ -51,20 +95,25 @@ class Command(BaseCommand):
             from core.models import Team
 
             qs = list(RosterTeam.objects.all())
-            count = 0
+            objs = {}
             for rt in tqdm(qs, desc="  Equipos", unit=" eq", ncols=80, file=self.stdout):
                 team_id = str(rt.team_id) if hasattr(rt, "team_id") else str(rt.pk)
-                Team.objects.update_or_create(
+                objs[team_id] = Team(
                     team_id=team_id,
-                    defaults={
-                        "name": getattr(rt, "name", "") or "",
-                        "abbreviation": getattr(rt, "abb", "") or "",
-                        "conference": getattr(rt, "conference", "") or "",
-                        "division": getattr(rt, "division", "") or "",
-                    },
+                    name=getattr(rt, "name", "") or "",
+                    abbreviation=getattr(rt, "abb", "") or "",
+                    conference=getattr(rt, "conference", "") or "",
+                    division=getattr(rt, "division", "") or "",
+                )
+            if objs:
+                Team.objects.bulk_create(
+                    list(objs.values()),
+                    batch_size=1000,
+                    update_conflicts=True,
+                    unique_fields=["team_id"],
+                    update_fields=["name", "abbreviation", "conference", "division"],
                 )
-                count += 1
-            self.stdout.write(f"  Equipos sincronizados: {count}")
+            self.stdout.write(f"  Equipos sincronizados: {len(qs)}")
         except Exception as exc:
             self.stdout.write(self.style.WARNING(f"  Equipos: {exc}"))
 
@@ -74,26 +123,37 @@ class Command(BaseCommand):
             from roster.models import Players as RosterPlayer
             from core.models import Player, Team
 
+            team_ids = set(Team.objects.values_list("team_id", flat=True))
             qs = list(RosterPlayer.objects.select_related().all())
-            count = 0
+            objs = {}
             for rp in tqdm(qs, desc="  Jugadores", unit=" jug", ncols=80, file=self.stdout):
                 player_id = str(rp.player_id) if hasattr(rp, "player_id") else str(rp.pk)
-                team_obj = None
-                if hasattr(rp, "team_id") and rp.team_id:
-                    team_obj = Team.objects.filter(team_id=str(rp.team_id)).first()
-                Player.objects.update_or_create(
+                team_id = None
+                if hasattr(rp, "team_id") and rp.team_id and str(rp.team_id) in team_ids:
+                    team_id = str(rp.team_id)
+                objs[player_id] = Player(
                     player_id=player_id,
-                    defaults={
-                        "name": getattr(rp, "full_name", getattr(rp, "name", "")) or "",
-                        "team": team_obj,
-                    },
+                    name=getattr(rp, "full_name", getattr(rp, "name", "")) or "",
+                    team_id=team_id,
+                )
+            if objs:
+                Player.objects.bulk_create(
+                    list(objs.values()),
+                    batch_size=1000,
+                    update_conflicts=True,
+                    unique_fields=["player_id"],
+                    update_fields=["name", "team"],
                 )
-                count += 1
-            self.stdout.write(f"  Jugadores sincronizados: {count}")
+            self.stdout.write(f"  Jugadores sincronizados: {len(qs)}")
         except Exception as exc:
             self.stdout.write(self.style.WARNING(f"  Jugadores: {exc}"))
 
     def _sync_games(self, season, season_type, batch_size):
+        """
+        Una fila por partido (el boxscore trae una por jugador y período).
+        Equipos resueltos con un dict, marcadores de GameSummary con una
+        consulta por lote y bulk upsert por lote.
+        """
         self.stdout.write("Sincronizando partidos...")
         try:
             from game.models import GameBoxscoreTraditional, GameSummary
@@ -105,6 +165,7 @@ class Command(BaseCommand):
             if season_type:
                 qs = qs.filter(season_type__icontains=season_type)
 
+            teams = _teams_by_abbreviation(Team)
             total = qs.values("game_id").distinct().count()
             game_ids_seen = set()
             count = 0
@@ -113,53 +174,78 @@ class Command(BaseCommand):
                 total=total, desc="  Partidos", unit=" part",
                 ncols=80, file=self.stdout,
             )
+            chunk = []
             for row in qs.iterator(chunk_size=batch_size):
                 gid = str(getattr(row, "game_id", ""))
                 if not gid or gid in game_ids_seen:
                     continue
                 game_ids_seen.add(gid)
-                bar.update(1)
-
-                home_abb = str(getattr(row, "home_team_abb", "") or "")
-                away_abb = str(getattr(row, "away_team_abb", "") or "")
-                home_team = Team.objects.filter(abbreviation=home_abb).first() if home_abb else None
-                away_team = Team.objects.filter(abbreviation=away_abb).first() if away_abb else None
-
-                home_score = None
-                away_score = None
-                if home_abb and away_abb:
-                    hs = GameSummary.objects.filter(game_id=gid, team_abb=home_abb).first()
-                    as_ = GameSummary.objects.filter(game_id=gid, team_abb=away_abb).first()
-                    if hs:
-                        home_score = hs.final or None
-                    if as_:
-                        away_score = as_.final or None
-
-                Game.objects.update_or_create(
-                    game_id=gid,
-                    defaults={
-                        "league": "NBA",
-                        "season": str(getattr(row, "season", "") or ""),
-                        "season_type": str(getattr(row, "season_type", "") or ""),
-                        "date": getattr(row, "game_date", None),
-                        "home_team": home_team,
-                        "away_team": away_team,
-                        "home_score": home_score,
-                        "away_score": away_score,
-                        "n_result": (
-                            f"{home_score}-{away_score}"
-                            if home_score is not None and away_score is not None
-                            else ""
-                        ),
-                    },
-                )
-                count += 1
+                chunk.append((
+                    gid,
+                    str(getattr(row, "season", "") or ""),
+                    str(getattr(row, "season_type", "") or ""),
+                    getattr(row, "game_date", None),
+                    str(getattr(row, "home_team_abb", "") or ""),
+                    str(getattr(row, "away_team_abb", "") or ""),
+                ))
+                if len(chunk) >= batch_size:
+                    count += self._write_game_chunk(chunk, teams, Game, GameSummary, batch_size)
+                    bar.update(len(chunk))
+                    chunk = []
+            if chunk:
+                count += self._write_game_chunk(chunk, teams, Game, GameSummary, batch_size)
+                bar.update(len(chunk))
             bar.close()
             self.stdout.write(f"  Partidos sincronizados: {count}")
         except Exception as exc:
             self.stdout.write(self.style.WARNING(f"  Partidos: {exc}"))
 
+    @staticmethod
+    def _write_game_chunk(chunk, teams, Game, GameSummary, batch_size):
+        finals = {
+            key: values[0]
+            for key, values in _summaries_by_game(GameSummary, {r[0] for r in chunk}, ("final",)).items()
+        }
+        objs = []
+        for gid, game_season, game_season_type, game_date, home_abb, away_abb in chunk:
+            home_score = away_score = None
+            if home_abb and away_abb:
+                home_score = finals.get((gid, home_abb)) or None
+                away_score = finals.get((gid, away_abb)) or None
+            objs.append(Game(
+                game_id=gid,
+                league="NBA",
+                season=game_season,
+                season_type=game_season_type,
+                date=game_date,
+                home_team_id=teams.get(home_abb),
+                away_team_id=teams.get(away_abb),
+                home_score=home_score,
+                away_score=away_score,
+                n_result=(
+                    f"{home_score}-{away_score}"
+                    if home_score is not None and away_score is not None
+                    else ""
+                ),
+            ))
+        Game.objects.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["game_id"],
+            update_fields=[
+                "league", "season", "season_type", "date", "home_team", "away_team",
+                "home_score", "away_score", "n_result",
+            ],
+        )
+        return len(objs)
+
     def _sync_team_lines(self, season, season_type, batch_size):
+        """
+        Líneas ALL desde TeamBoxscoreTraditional y Q1–Q4 desde GameSummary, con
+        los partidos y resúmenes de cada lote resueltos en una consulta y bulk
+        upsert sobre (game, team, period).
+        """
         self.stdout.write("Sincronizando estadísticas de equipo...")
         try:
             from game.models import TeamBoxscoreTraditional, GameSummary
@@ -171,6 +257,7 @@ class Command(BaseCommand):
             if season_type:
                 qs = qs.filter(season_type__icontains=season_type)
 
+            teams = _teams_by_abbreviation(Team)
             total = qs.count()
             count_all = 0
             count_q = 0
@@ -179,63 +266,13 @@ class Command(BaseCommand):
                 total=total, desc="  Team lines", unit=" filas",
                 ncols=80, file=self.stdout,
             )
-            for row in qs.iterator(chunk_size=batch_size):
-                bar.update(1)
-                gid = str(getattr(row, "game_id", "") or "")
-                if not gid:
-                    continue
-
-                game = Game.objects.filter(game_id=gid).first()
-                if not game:
-                    continue
-
-                team_abb = str(getattr(row, "team_abb", "") or "")
-                team = Team.objects.filter(abbreviation=team_abb).first() if team_abb else None
-                home_away = str(getattr(row, "home_away", "") or "")
-
-                GameTeamLine.objects.update_or_create(
-                    game=game,
-                    team=team,
-                    period="ALL",
-                    defaults={
-                        "home_away": home_away,
-                        "fgm": _safe_int(getattr(row, "fgm", 0)),
-                        "fga": _safe_int(getattr(row, "fga", 0)),
-                        "fg_pct": _safe_float(getattr(row, "fg_pct", None)),
-                        "fg3m": _safe_int(getattr(row, "fg3m", 0)),
-                        "fg3a": _safe_int(getattr(row, "fg3a", 0)),
-                        "fg3_pct": _safe_float(getattr(row, "fg3_pct", None)),
-                        "ftm": _safe_int(getattr(row, "ftm", 0)),
-                        "fta": _safe_int(getattr(row, "fta", 0)),
-                        "ft_pct": _safe_float(getattr(row, "ft_pct", None)),
-                        "oreb": _safe_int(getattr(row, "oreb", 0)),
-                        "dreb": _safe_int(getattr(row, "dreb", 0)),
-                        "reb": _safe_int(getattr(row, "reb", 0)),
-                        "ast": _safe_int(getattr(row, "ast", 0)),
-                        "stl": _safe_int(getattr(row, "stl", 0)),
-                        "blk": _safe_int(getattr(row, "blk", 0)),
-                        "tov": _safe_int(getattr(row, "tov", 0)),
-                        "pf": _safe_int(getattr(row, "pf", 0)),
-                        "pts": _safe_int(getattr(row, "pts", 0)),
-                    },
+            for chunk in _chunks(qs.iterator(chunk_size=batch_size), batch_size):
+                n_all, n_q = self._write_team_line_chunk(
+                    chunk, teams, Game, GameSummary, GameTeamLine, batch_size
                 )
-                count_all += 1
-
-                summary = GameSummary.objects.filter(
-                    game_id=gid, team_abb=team_abb
-                ).first()
-                if summary and team:
-                    for qtr, field in (
-                        ("Q1", "q1"), ("Q2", "q2"), ("Q3", "q3"), ("Q4", "q4"),
-                    ):
-                        pts_q = getattr(summary, field, 0) or 0
-                        GameTeamLine.objects.update_or_create(
-                            game=game,
-                            team=team,
-                            period=qtr,
-                            defaults={"home_away": home_away, "pts": pts_q},
-                        )
-                        count_q += 1
+                count_all += n_all
+                count_q += n_q
+                bar.update(len(chunk))
             bar.close()
             self.stdout.write(
                 f"  Team lines ALL: {count_all} | Cuartos: {count_q}"
@@ -243,7 +280,137 @@ class Command(BaseCommand):
         except Exception as exc:
             self.stdout.write(self.style.WARNING(f"  Team lines: {exc}"))
 
+    @staticmethod
+    def _write_team_line_chunk(chunk, teams, Game, GameSummary, GameTeamLine, batch_size):
+        gids = {str(getattr(row, "game_id", "") or "") for row in chunk}
+        gids.discard("")
+        games = set(Game.objects.filter(game_id__in=gids).values_list("game_id", flat=True))
+        quarters = _summaries_by_game(GameSummary, games, ("q1", "q2", "q3", "q4"))
+
+        lines_all = {}
+        lines_q = {}
+        for row in chunk:
+            gid = str(getattr(row, "game_id", "") or "")
+            if gid not in games:
+                continue
+            team_abb = str(getattr(row, "team_abb", "") or "")
+            team_id = teams.get(team_abb)
+            if team_id is None:
+                continue
+            home_away = str(getattr(row, "home_away", "") or "")
+
+            lines_all[(gid, team_id)] = GameTeamLine(
+                game_id=gid, team_id=team_id, period="ALL", home_away=home_away,
+                **_box_stats(row),
+            )
+
+            summary = quarters.get((gid, team_abb))
+            if summary:
+                for qtr, pts_q in zip(("Q1", "Q2", "Q3", "Q4"), summary):
+                    lines_q[(gid, team_id, qtr)] = GameTeamLine(
+                        game_id=gid, team_id=team_id, period=qtr,
+                        home_away=home_away, pts=pts_q or 0,
+                    )
+
+        for lines, update_fields in (
+            (lines_all, ["home_away", *BOX_STATS]),
+            (lines_q, ["home_away", "pts"]),
+        ):
+            if lines:
+                GameTeamLine.objects.bulk_create(
+                    list(lines.values()),
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=["game", "team", "period"],
+                    update_fields=update_fields,
+                )
+        return len(lines_all), len(lines_q)
+
+    def _sync_period_lines(self, season, season_type, batch_size):
+        """
+        GameSummary → GamePeriodLine en bloque: una consulta por lote de
+        resúmenes para resolver los partidos y un bulk upsert por lote.
+        """
+        self.stdout.write("Sincronizando puntos por período...")
+        try:
+            from game.models import GameSummary
+            from core.models import Game, GamePeriodLine, Team
+
+            qs = GameSummary.objects.all()
+            if season:
+                qs = qs.filter(season=season)
+            if season_type:
+                qs = qs.filter(season_type__icontains=season_type)
+
+            teams = _teams_by_abbreviation(Team)
+
+            fields = ("q1", "q2", "q3", "q4", "ot1", "ot2", "ot3", "ot4", "final")
+            rows = qs.values_list("game_id", "team_abb", *fields)
+            count = 0
+
+            bar = tqdm(
+                total=qs.count(), desc="  Períodos", unit=" filas",
+                ncols=80, file=self.stdout,
+            )
+            chunk = []
+            for row in rows.iterator(chunk_size=batch_size):
+                chunk.append(row)
+                if len(chunk) >= batch_size:
+                    count += self._write_period_chunk(chunk, teams, fields, Game, GamePeriodLine, batch_size)
+                    bar.update(len(chunk))
+                    chunk = []
+            if chunk:
+                count += self._write_period_chunk(chunk, teams, fields, Game, GamePeriodLine, batch_size)
+                bar.update(len(chunk))
+            bar.close()
+            self.stdout.write(f"  Períodos sincronizados: {count}")
+        except Exception as exc:
+            self.stdout.write(self.style.WARNING(f"  Períodos: {exc}"))
+
+    @staticmethod
+    def _write_period_chunk(chunk, teams, fields, Game, GamePeriodLine, batch_size):
+        games = {
+            gid: (pk, game_date, home_id, away_id)
+            for gid, pk, game_date, home_id, away_id in Game.objects.filter(
+                game_id__in={str(r[0]) for r in chunk}
+            ).values_list("game_id", "pk", "date", "home_team_id", "away_team_id")
+        }
+        objs = {}
+        for gid, team_abb, *values in chunk:
+            game = games.get(str(gid))
+            team_id = teams.get(str(team_abb or ""))
+            if not game or not team_id:
+                continue
+            pk, game_date, home_id, away_id = game
+            pts = dict(zip(fields, (_safe_int(v) for v in values)))
+            objs[(pk, team_id)] = GamePeriodLine(
+                game_id=pk,
+                team_id=team_id,
+                date=game_date,
+                home_away="home" if team_id == home_id else "away" if team_id == away_id else "",
+                ot=pts["ot1"] + pts["ot2"] + pts["ot3"] + pts["ot4"],
+                h1=pts["q1"] + pts["q2"],
+                h2=pts["q3"] + pts["q4"],
+                **pts,
+            )
+        if objs:
+            GamePeriodLine.objects.bulk_create(
+                list(objs.values()),
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["game", "team"],
+                update_fields=[
+                    "date", "home_away", *fields, "ot", "h1", "h2",
+                ],
+            )
+        return len(objs)
+
     def _sync_player_lines(self, season, season_type, batch_size):
+        """
+        Boxscore por jugador → GamePlayerLine: partidos y jugadores de cada lote
+        resueltos en una consulta y bulk upsert sobre (game, player, team, period)
+        (en bases sin NULLS NOT DISTINCT, actualizar/crear casando esa clave).
+        """
         self.stdout.write("Sincronizando estadísticas de jugadores...")
         try:
             from game_boxscore.models import GameBoxscoreTraditional
@@ -255,6 +422,7 @@ class Command(BaseCommand):
             if season_type:
                 qs = qs.filter(season_type__icontains=season_type)
 
+            team_ids = set(Team.objects.values_list("team_id", flat=True))
             total = qs.count()
             count = 0
 
@@ -262,57 +430,123 @@ class Command(BaseCommand):
                 total=total, desc="  Player lines", unit=" filas",
                 ncols=80, file=self.stdout,
             )
-            for row in qs.iterator(chunk_size=batch_size):
-                bar.update(1)
-                gid = str(getattr(row, "game_id", ""))
-                pid = str(getattr(row, "player_id", "") or "")
-                if not gid or not pid:
-                    continue
-
-                game = Game.objects.filter(game_id=gid).first()
-                if not game:
-                    continue
-
-                player = Player.objects.filter(player_id=pid).first()
-                team_id = str(getattr(row, "team_id", "") or "")
-                team = Team.objects.filter(team_id=team_id).first() if team_id else None
-
-                GamePlayerLine.objects.update_or_create(
-                    game=game,
-                    player=player,
-                    team=team,
-                    period=str(getattr(row, "period", "ALL") or "ALL"),
-                    defaults={
-                        "home_away": str(getattr(row, "home_away", "") or ""),
-                        "position": str(getattr(row, "position", "") or ""),
-                        "min_played": _safe_float(getattr(row, "min", None)),
-                        "fgm": _safe_int(getattr(row, "fgm", 0)),
-                        "fga": _safe_int(getattr(row, "fga", 0)),
-                        "fg_pct": _safe_float(getattr(row, "fg_pct", None)),
-                        "fg3m": _safe_int(getattr(row, "fg3m", 0)),
-                        "fg3a": _safe_int(getattr(row, "fg3a", 0)),
-                        "fg3_pct": _safe_float(getattr(row, "fg3_pct", None)),
-                        "ftm": _safe_int(getattr(row, "ftm", 0)),
-                        "fta": _safe_int(getattr(row, "fta", 0)),
-                        "ft_pct": _safe_float(getattr(row, "ft_pct", None)),
-                        "oreb": _safe_int(getattr(row, "oreb", 0)),
-                        "dreb": _safe_int(getattr(row, "dreb", 0)),
-                        "reb": _safe_int(getattr(row, "reb", 0)),
-                        "ast": _safe_int(getattr(row, "ast", 0)),
-                        "stl": _safe_int(getattr(row, "stl", 0)),
-                        "blk": _safe_int(getattr(row, "blk", 0)),
-                        "tov": _safe_int(getattr(row, "tov", 0)),
-                        "pf": _safe_int(getattr(row, "pf", 0)),
-                        "pts": _safe_int(getattr(row, "pts", 0)),
-                        "plus_minus": _safe_int(getattr(row, "plus_minus", None)),
-                    },
+            for chunk in _chunks(qs.iterator(chunk_size=batch_size), batch_size):
+                count += self._write_player_line_chunk(
+                    chunk, team_ids, Game, Player, GamePlayerLine, batch_size
                 )
-                count += 1
+                bar.update(len(chunk))
             bar.close()
             self.stdout.write(f"  Estadísticas jugadores: {count}")
         except Exception as exc:
             self.stdout.write(self.style.WARNING(f"  Estadísticas jugadores: {exc}"))
 
+    @staticmethod
+    def _write_player_line_chunk(chunk, team_ids, Game, Player, GamePlayerLine, batch_size):
+        keys = [
+            (str(getattr(row, "game_id", "")), str(getattr(row, "player_id", "") or ""))
+            for row in chunk
+        ]
+        games = set(
+            Game.objects.filter(game_id__in={gid for gid, _ in keys if gid})
+            .values_list("game_id", flat=True)
+        )
+        players = set(
+            Player.objects.filter(player_id__in={pid for _, pid in keys if pid})
+            .values_list("player_id", flat=True)
+        )
+
+        objs = {}
+        for row, (gid, pid) in zip(chunk, keys):
+            if not gid or not pid or gid not in games:
+                continue
+            player_id = pid if pid in players else None
+            team_id = str(getattr(row, "team_id", "") or "")
+            team_id = team_id if team_id in team_ids else None
+            period = str(getattr(row, "period", "ALL") or "ALL")
+
+            objs[(gid, player_id, team_id, period)] = GamePlayerLine(
+                game_id=gid,
+                player_id=player_id,
+                team_id=team_id,
+                period=period,
+                home_away=str(getattr(row, "home_away", "") or ""),
+                position=str(getattr(row, "position", "") or ""),
+                min_played=_safe_float(getattr(row, "min", None)),
+                plus_minus=_safe_int(getattr(row, "plus_minus", None)),
+                **_box_stats(row),
+            )
+
+        if not objs:
+            return 0
+
+        from django.db import connection
+
+        update_fields = ["home_away", "position", "min_played", *BOX_STATS, "plus_minus"]
+        if connection.features.supports_nulls_distinct_unique_constraints:
+            GamePlayerLine.objects.bulk_create(
+                list(objs.values()),
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["game", "player", "team", "period"],
+                update_fields=update_fields,
+            )
+            return len(objs)
+
+        # Sin NULLS NOT DISTINCT (SQLite, PostgreSQL < 15) la restricción única no
+        # existe y no hay conflicto sobre el que hacer upsert: se casan las filas
+        # por clave natural con las ya guardadas de los partidos del lote.
+        existing = {
+            (gid, player_id, team_id, period): pk
+            for pk, gid, player_id, team_id, period in GamePlayerLine.objects.filter(
+                game_id__in={key[0] for key in objs},
+            ).values_list("pk", "game_id", "player_id", "team_id", "period")
+        }
+        to_update, to_create = [], []
+        for key, obj in objs.items():
+            obj.pk = existing.get(key)
+            (to_create if obj.pk is None else to_update).append(obj)
+        GamePlayerLine.objects.bulk_update(to_update, update_fields, batch_size=batch_size)
+        GamePlayerLine.objects.bulk_create(to_create, batch_size=batch_size)
+        return len(objs)
+
+
+def _box_stats(row) -> dict:
+    """Totales BOX_STATS de una fila de boxscore (porcentajes float/None, resto int)."""
+    return {
+        field: _safe_float(getattr(row, field, None)) if field.endswith("_pct")
+        else _safe_int(getattr(row, field, 0))
+        for field in BOX_STATS
+    }
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _teams_by_abbreviation(Team) -> dict:
+    """{abreviatura: team_id}, misma resolución que Team.objects.filter(abbreviation=…).first()."""
+    teams = {}
+    for abb, team_id in Team.objects.exclude(abbreviation="").values_list("abbreviation", "team_id"):
+        teams.setdefault(abb, team_id)
+    return teams
+
+
+def _summaries_by_game(GameSummary, game_ids, fields) -> dict:
+    """{(game_id, team_abb): valores de `fields`} de GameSummary para `game_ids` (la primera fila)."""
+    summaries = {}
+    for gid, team_abb, *values in GameSummary.objects.filter(
+        game_id__in=list(game_ids)
+    ).values_list("game_id", "team_abb", *fields):
+        summaries.setdefault((str(gid), str(team_abb or "")), values)
+    return summaries
+
 
 def _safe_int(v, default=0):
     try:
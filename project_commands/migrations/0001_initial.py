@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('csv_path', models.CharField(max_length=255, verbose_name='CSV')),
+                ('target', models.CharField(max_length=100, verbose_name='Modelo destino')),
+                ('size', models.BigIntegerField(default=0, verbose_name='Tamaño (bytes)')),
+                ('checksum', models.CharField(blank=True, max_length=64, verbose_name='SHA-256 de los bytes importados')),
+                ('byte_offset', models.BigIntegerField(default=0, verbose_name='Bytes importados')),
+                ('row_count', models.BigIntegerField(default=0, verbose_name='Filas importadas')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Import ledger',
+                'verbose_name_plural': 'Import ledger',
+                'ordering': ['csv_path', 'target'],
+                'unique_together': {('csv_path', 'target')},
+            },
+        ),
+    ]
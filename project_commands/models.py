@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class ImportLedger(models.Model):
+    """
+    Registro de import_data por (CSV, modelo destino): tamaño, checksum y bytes
+    ya importados del CSV, y filas cargadas. Con él un CSV sin cambios se salta
+    y uno al que solo se le añadieron filas se importa desde el offset
+    (project_commands.import_ledger). `import_data --force` reimporta todo.
+    """
+
+    csv_path = models.CharField("CSV", max_length=255)
+    target = models.CharField("Modelo destino", max_length=100)
+    size = models.BigIntegerField("Tamaño (bytes)", default=0)
+    checksum = models.CharField("SHA-256 de los bytes importados", max_length=64, blank=True)
+    byte_offset = models.BigIntegerField("Bytes importados", default=0)
+    row_count = models.BigIntegerField("Filas importadas", default=0)
+    updated_at = models.DateTimeField("Actualizado", auto_now=True)
+
+    class Meta:
+        verbose_name = "Import ledger"
+        verbose_name_plural = "Import ledger"
+        ordering = ["csv_path", "target"]
+        unique_together = [["csv_path", "target"]]
+
+    def __str__(self):
+        return f"{self.csv_path} → {self.target} @ {self.byte_offset}"
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+
+from project_commands import import_ledger
+from project_commands.models import ImportLedger
+
+TARGET = "game.GameSummary"
+
+
+class ImportLedgerTests(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        self.path = os.path.join(tmpdir, "game_summary.csv")
+        self.write(b"game_id,pts\n1,100\n2,98\n")
+
+    def write(self, data, mode="wb"):
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def record(self, rows):
+        plan = import_ledger.plan_import(self.path, TARGET)
+        plan.imported = rows
+        import_ledger.record_import(plan)
+        return plan
+
+    def test_without_ledger_entry_imports_everything(self):
+        plan = import_ledger.plan_import(self.path, TARGET)
+        self.assertEqual(plan.action, import_ledger.FULL)
+        with import_ledger.source_file(plan) as path:
+            self.assertEqual(path, self.path)
+
+    def test_unchanged_file_is_skipped(self):
+        self.record(2)
+        plan = import_ledger.plan_import(self.path, TARGET)
+        self.assertEqual(plan.action, import_ledger.SKIP)
+        self.assertEqual(plan.rows, 2)
+
+    def test_force_imports_everything(self):
+        self.record(2)
+        plan = import_ledger.plan_import(self.path, TARGET, force=True)
+        self.assertEqual(plan.action, import_ledger.FULL)
+
+    def test_appended_rows_import_only_the_tail_with_header(self):
+        first = self.record(2)
+        self.write(b"3,105\n4,87\n", mode="ab")
+
+        plan = import_ledger.plan_import(self.path, TARGET)
+        self.assertEqual(plan.action, import_ledger.APPEND)
+        self.assertEqual(plan.offset, first.size)
+        with import_ledger.source_file(plan) as path:
+            self.assertEqual(os.path.basename(path), "game_summary.csv")
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"game_id,pts\n3,105\n4,87\n")
+        self.assertFalse(os.path.exists(path))
+
+        plan.imported = 2
+        import_ledger.record_import(plan)
+        entry = ImportLedger.objects.get(target=TARGET)
+        self.assertEqual((entry.byte_offset, entry.row_count), (plan.size, 4))
+        self.assertEqual(import_ledger.plan_import(self.path, TARGET).action, import_ledger.SKIP)
+
+    def test_truncated_file_imports_everything(self):
+        self.record(2)
+        self.write(b"game_id,pts\n1,100\n")
+        self.assertEqual(import_ledger.plan_import(self.path, TARGET).action, import_ledger.FULL)
+
+    def test_rewritten_prefix_imports_everything(self):
+        self.record(2)
+        self.write(b"game_id,pts\n1,101\n2,98\n3,105\n")
+        self.assertEqual(import_ledger.plan_import(self.path, TARGET).action, import_ledger.FULL)
+
+    def test_rows_appended_to_an_unterminated_last_line_import_everything(self):
+        self.write(b"game_id,pts\n1,100\n2,98")
+        self.record(2)
+        self.write(b"5\n3,105\n", mode="ab")
+        self.assertEqual(import_ledger.plan_import(self.path, TARGET).action, import_ledger.FULL)
+
+    def test_failed_import_is_not_recorded(self):
+        plan = import_ledger.plan_import(self.path, TARGET)
+        import_ledger.record_import(plan)
+        self.assertFalse(ImportLedger.objects.exists())
@@ -167,6 +167,18 @@ MARKETS_ML = [
     ("winning_margin", "Margen de Victoria"),
     ("player_props", "Props de Jugador"),
 ]
+FEATURE_ENGINES = [
+    ("", "(default: per-game)"),
+    ("per-game", "Partido a partido"),
+    ("vectorized", "Vectorizado (backfill)"),
+]
+FEATURE_WORKERS = [
+    ("", "(default: 1)"),
+    ("2", "2"),
+    ("4", "4"),
+    ("8", "8"),
+    ("16", "16"),
+]
 LIMITS = [
     ("", "(default)"),
     ("50", "50"),
@@ -188,6 +200,13 @@ DAYS_OPTIONS = [
     ("30", "30"),
     ("60", "60"),
 ]
+IMPORT_WORKERS = [
+    ("", "(default: IMPORT_DATA_WORKERS)"),
+    ("1", "1 (en secuencia)"),
+    ("2", "2"),
+    ("4", "4"),
+    ("8", "8"),
+]
 ALERT_THRESHOLDS = [
     ("", "(default)"),
     ("0.50", "0.50"),
@@ -212,10 +231,15 @@ COMMAND_GROUPS = [
                 "help_detail": [
                     "Paso 1 — import_data: importa los datos a modelos crudos.",
                     "Paso 2 — sync_normalized: normaliza los datos al modelo core.",
-                    "Paso 3 — compute_features: features para todos los mercados × 2 tipos de temporada.",
+                    "Paso 3 — compute_features --all-markets --export-columnar: base común y todos los mercados en una pasada × 2 tipos de temporada, y datasets columnares para el entrenamiento.",
                     "Paso 4 — train_models: entrena todos los mercados × 2 tipos de temporada.",
+                    "Con --incremental, el paso 3 solo recalcula los partidos nuevos o cambiados "
+                    "(la huella cubre partido, GameTeamLine y ratings; no las tablas de temporada "
+                    "ni GamePlayerLine).",
+                ],
+                "args": [
+                    ("--incremental", "checkbox", "Features solo de partidos nuevos/cambiados"),
                 ],
-                "args": [],
             },
         ],
     },
@@ -228,6 +252,8 @@ COMMAND_GROUPS = [
                 "args": [
                     ("--clear", "checkbox", "Vaciar tablas antes"),
                     ("--batch-size", "choice", "Tamaño lote", BATCH_SIZES),
+                    ("--force", "checkbox", "Reimportar todos los CSV completos"),
+                    ("--workers", "choice", "Procesos", IMPORT_WORKERS),
                 ],
             },
             {
@@ -251,9 +277,40 @@ COMMAND_GROUPS = [
                 "args": [
                     ("--season", "choice", "Temporada", SEASONS),
                     ("--market", "choice", "Mercado", MARKETS_FEATURES),
+                    ("--all-markets", "checkbox", "Todos los mercados (una pasada)"),
+                    ("--incremental", "checkbox", "Solo partidos nuevos/cambiados"),
                     ("--game-id", "text", "Solo un juego (opcional)"),
                     ("--limit", "choice", "Límite juegos", LIMITS),
                     ("--to-redis", "checkbox", "Escribir también en Redis"),
+                    ("--engine", "choice", "Motor", FEATURE_ENGINES),
+                    ("--workers", "choice", "Procesos (per-game)", FEATURE_WORKERS),
+                    ("--export-columnar", "checkbox", "Regenerar dataset columnar (.npy)"),
+                ],
+            },
+            {
+                "name": "build_team_states",
+                "help": "Materializa el estado rolling pre-partido por equipo y fecha (TeamDailyState)",
+                "args": [
+                    ("--full", "checkbox", "Recalcular todas las fechas"),
+                    ("--since", "text", "Desde fecha YYYY-MM-DD (opcional)"),
+                    ("--team-id", "text", "Solo un equipo (opcional)"),
+                ],
+            },
+            {
+                "name": "build_ratings",
+                "help": "Ratings Elo/Glicko-2/TrueSkill de equipo partido a partido (TeamRating), incremental",
+                "args": [
+                    ("--full", "checkbox", "Recalcular desde el primer partido"),
+                ],
+            },
+            {
+                "name": "compute_player_features",
+                "help": "Features rolling de los jugadores del slate de una fecha (PlayerFeatureSet)",
+                "args": [
+                    ("--date", "text", "Fecha YYYY-MM-DD (por defecto hoy)"),
+                    ("--team-id", "text", "Solo un equipo (opcional)"),
+                    ("--player-id", "text", "Solo un jugador (opcional)"),
+                    ("--min-minutes", "text", "Minutos mínimos de media (por defecto 10)"),
                 ],
             },
         ],
@@ -372,20 +429,20 @@ VISUALIZATION_SEASONS = [("", "(actual)")] + [
 def _get_team_comparison_data(home_team_id, away_team_id, as_of_date=None):
     """
     Devuelve datos para gráficos comparativos: labels y valores home/away.
-    Usa compute_features_for_matchup con métricas NBA (PTS, REB, AST).
+    Usa get_features_for_matchup (cacheado) con métricas NBA (PTS, REB, AST).
     """
     from datetime import date
 
     from django.utils.dateparse import parse_date
 
-    from features.engine.matchup import compute_features_for_matchup
+    from predictions.inference import get_features_for_matchup
 
     if as_of_date is None:
         as_of_date = date.today()
     if isinstance(as_of_date, str):
         as_of_date = parse_date(as_of_date) or date.today()
 
-    feats = compute_features_for_matchup(
+    feats = get_features_for_matchup(
         home_team_id=home_team_id,
         away_team_id=away_team_id,
         as_of_date=as_of_date,
@@ -427,14 +484,14 @@ def _get_single_team_data(team_id, as_of_date=None):
 
     from django.utils.dateparse import parse_date
 
-    from features.engine.matchup import compute_features_for_matchup
+    from predictions.inference import get_features_for_matchup
 
     if as_of_date is None:
         as_of_date = date.today()
     if isinstance(as_of_date, str):
         as_of_date = parse_date(as_of_date) or date.today()
 
-    feats = compute_features_for_matchup(
+    feats = get_features_for_matchup(
         home_team_id=team_id,
         away_team_id=team_id,
         as_of_date=as_of_date,
@@ -473,7 +530,7 @@ def _get_global_stats(as_of_date=None):
     from django.utils.dateparse import parse_date
 
     from core.models import Team
-    from features.engine.matchup import compute_features_for_matchup
+    from predictions.inference import get_features_for_matchup
 
     if as_of_date is None:
         as_of_date = date.today()
@@ -496,7 +553,7 @@ def _get_global_stats(as_of_date=None):
     }
     teams = Team.objects.all()
     for t in teams:
-        feats = compute_features_for_matchup(
+        feats = get_features_for_matchup(
             home_team_id=t.team_id,
             away_team_id=t.team_id,
             as_of_date=as_of_date,